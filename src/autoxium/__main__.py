@@ -11,6 +11,10 @@ if str(src_path) not in sys.path:
 from autoxium.ui.main_window import run_app
 
 def main():
+    # Device wall decoders run in spawned processes (needed when frozen)
+    import multiprocessing
+
+    multiprocessing.freeze_support()
     run_app()
 
 if __name__ == "__main__":
@@ -0,0 +1,230 @@
+"""
+Native client for the ADB host protocol ("smart socket" protocol).
+
+Talks directly to the local adb server (default 127.0.0.1:5037) instead of
+forking the adb binary for every command.
+"""
+
+import select
+import socket
+import time
+from contextlib import contextmanager
+from typing import Optional
+from autoxium.utils.config import config
+
+
+class AdbProtocolError(Exception):
+    """Raised when the adb server rejects a request with FAIL."""
+
+
+class AdbRequestSentError(ConnectionError):
+    """Raised when the connection breaks after a device command was sent.
+
+    The device may have run the command, so it must not be sent again.
+    """
+
+
+@contextmanager
+def request_sent():
+    """Reports connection failures in the block as AdbRequestSentError."""
+    try:
+        yield
+    except (TimeoutError, AdbRequestSentError):
+        raise
+    except OSError as e:
+        raise AdbRequestSentError(f"Connection lost after the request: {e}") from e
+
+
+class AdbClient:
+    def __init__(self, host: str = None, port: int = None, timeout: float = 10.0):
+        self.host = host or config.adb_server_host
+        self.port = port or config.adb_server_port
+        self.timeout = timeout
+
+    # --- Wire helpers ---
+
+    def _connect(self) -> socket.socket:
+        sock = socket.create_connection((self.host, self.port), timeout=self.timeout)
+        sock.setsockopt(socket.IPPROTO_TCP, socket.TCP_NODELAY, 1)
+        return sock
+
+    @staticmethod
+    def _send_request(sock: socket.socket, request: str):
+        payload = request.encode("utf-8")
+        sock.sendall(b"%04x" % len(payload) + payload)
+
+    @staticmethod
+    def _read_exact(sock: socket.socket, size: int) -> bytes:
+        buf = bytearray()
+        while len(buf) < size:
+            chunk = sock.recv(size - len(buf))
+            if not chunk:
+                raise ConnectionError("adb server closed the connection")
+            buf.extend(chunk)
+        return bytes(buf)
+
+    @classmethod
+    def _read_length_prefixed(cls, sock: socket.socket) -> bytes:
+        size = int(cls._read_exact(sock, 4), 16)
+        return cls._read_exact(sock, size)
+
+    @classmethod
+    def _read_status(cls, sock: socket.socket):
+        status = cls._read_exact(sock, 4)
+        if status == b"OKAY":
+            return
+        if status == b"FAIL":
+            message = cls._read_length_prefixed(sock).decode("utf-8", "replace")
+            raise AdbProtocolError(message)
+        raise AdbProtocolError(f"Unexpected adb server status: {status!r}")
+
+    @staticmethod
+    def _read_all(sock: socket.socket, timeout: Optional[float] = None) -> bytes:
+        """Reads until the service closes the stream.
+
+        With a timeout, raises TimeoutError once that many seconds passed in
+        total, however steadily data is trickling in.
+        """
+        deadline = None if timeout is None else time.monotonic() + timeout
+        chunks = []
+        while True:
+            if deadline is not None:
+                remaining = deadline - time.monotonic()
+                if remaining <= 0:
+                    raise TimeoutError("adb service did not finish in time")
+                sock.settimeout(remaining)
+            chunk = sock.recv(65536)
+            if not chunk:
+                break
+            chunks.append(chunk)
+        return b"".join(chunks)
+
+    @staticmethod
+    def _decode_text(data: bytes) -> str:
+        # Older devices emit CRLF line endings through the shell service
+        return data.decode("utf-8", "replace").replace("\r\n", "\n").strip()
+
+    # --- Requests ---
+
+    def host_command(self, request: str) -> str:
+        """Sends a host: request and returns its length-prefixed reply."""
+        with self._connect() as sock:
+            self._send_request(sock, request)
+            self._read_status(sock)
+            return self._read_length_prefixed(sock).decode("utf-8", "replace")
+
+    def open_transport(
+        self, serial: str, service: str, timeout: Optional[float] = None
+    ) -> socket.socket:
+        """Switches a new connection to the device and starts a service on it.
+
+        The caller owns the returned socket and must close it. Connection
+        failures once the service request is on its way raise
+        AdbRequestSentError.
+        """
+        sock = self._connect()
+        try:
+            if timeout is not None:
+                sock.settimeout(min(timeout, self.timeout))
+            self._send_request(sock, f"host:transport:{serial}")
+            self._read_status(sock)
+            with request_sent():
+                self._send_request(sock, service)
+                self._read_status(sock)
+        except BaseException:
+            sock.close()
+            raise
+        return sock
+
+    def is_available(self) -> bool:
+        """Returns True if an adb server is listening."""
+        try:
+            self.host_command("host:version")
+            return True
+        except (OSError, AdbProtocolError):
+            return False
+
+    def track_devices(self) -> "DeviceTracker":
+        """Opens a host:track-devices-l stream.
+
+        The server sends the full `devices -l` listing once, then again every
+        time a device is added, removed or changes state.
+        """
+        sock = self._connect()
+        try:
+            self._send_request(sock, "host:track-devices-l")
+            self._read_status(sock)
+        except BaseException:
+            sock.close()
+            raise
+        return DeviceTracker(sock)
+
+    def devices(self) -> str:
+        """Returns the raw `devices -l` listing (without the header line)."""
+        return self.host_command("host:devices-l")
+
+    def shell(self, serial: str, command: str, timeout: Optional[float] = None) -> str:
+        with self.open_transport(serial, f"shell:{command}", timeout) as sock:
+            with request_sent():
+                return self._decode_text(self._read_all(sock, timeout))
+
+    def exec_out(
+        self, serial: str, command: str, timeout: Optional[float] = None
+    ) -> bytes:
+        """Runs a command without a PTY and returns its raw stdout."""
+        with self.open_transport(serial, f"exec:{command}", timeout) as sock:
+            with request_sent():
+                return self._read_all(sock, timeout)
+
+    def reboot(
+        self, serial: str, target: Optional[str] = "", timeout: Optional[float] = None
+    ):
+        with self.open_transport(serial, f"reboot:{target or ''}", timeout) as sock:
+            with request_sent():
+                self._read_all(sock, timeout)
+
+
+class DeviceTracker:
+    """Reader for a long-lived host:track-devices-l stream."""
+
+    def __init__(self, sock: socket.socket):
+        self._sock = sock
+        self._buffer = bytearray()
+
+    def _pop_message(self) -> Optional[str]:
+        if len(self._buffer) < 4:
+            return None
+        size = int(self._buffer[:4], 16)
+        if len(self._buffer) < 4 + size:
+            return None
+        message = bytes(self._buffer[4 : 4 + size])
+        del self._buffer[: 4 + size]
+        return message.decode("utf-8", "replace")
+
+    def poll(self, timeout: float) -> Optional[str]:
+        """Returns the next device listing, or None if none arrived in time.
+
+        Raises ConnectionError when the adb server goes away.
+        """
+        message = self._pop_message()
+        while message is None:
+            readable, _, _ = select.select([self._sock], [], [], timeout)
+            if not readable:
+                return None
+            chunk = self._sock.recv(65536)
+            if not chunk:
+                raise ConnectionError("adb server closed the tracking stream")
+            self._buffer.extend(chunk)
+            message = self._pop_message()
+        return message
+
+    def close(self):
+        try:
+            # Unblocks a reader waiting in another thread
+            self._sock.shutdown(socket.SHUT_RDWR)
+        except OSError:
+            pass
+        self._sock.close()
+
+
+adb_client = AdbClient()
@@ -1,14 +1,113 @@
 import subprocess
 import os
-from typing import List, Optional
+import posixpath
+import re
+import shlex
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor, wait
+from typing import Callable, Dict, List, Optional, Set, Tuple
+from autoxium.core.adb_client import (
+    AdbProtocolError,
+    AdbRequestSentError,
+    adb_client,
+    request_sent,
+)
+from autoxium.core.device_cache import DeviceInfo, DeviceInfoCache
+from autoxium.core.device_health import DeviceHealthTracker
+from autoxium.core.shell_session import shell_sessions
+from autoxium.core.sync_protocol import ProgressCallback, SyncConnection
 from autoxium.utils.config import config
 from autoxium.utils.logger import logger
 from autoxium.models.device import Device
 
+# Kernel boot id, changes on every boot
+BOOT_ID_COMMAND = "cat /proc/sys/kernel/random/boot_id"
+# Property dump, screen size and boot id in a single shell round trip
+PROPERTIES_COMMAND = f"getprop; wm size; {BOOT_ID_COMMAND}"
+# Pseudo property holding the "Physical size:" reported by `wm size`
+PHYSICAL_SIZE_PROP = "wm.physical_size"
+# Pseudo property holding the kernel boot id
+BOOT_ID_PROP = "kernel.boot_id"
+# `adb devices -l` fields and the properties they mirror
+LISTING_FIELD_PROPS = {
+    "model": "ro.product.model",
+    "product": "ro.product.name",
+    "device": "ro.product.device",
+}
+
+_GETPROP_LINE = re.compile(r"^\[(?P<key>[^\]]+)\]: \[(?P<value>.*)\]$")
+_BOOT_ID_LINE = re.compile(r"^[0-9a-f]{8}(-[0-9a-f]{4}){3}-[0-9a-f]{12}$")
+
+
+def parse_getprop_output(output: str) -> Dict[str, str]:
+    """Parses `getprop` output ("[key]: [value]" lines) into a dict."""
+    props = {}
+    for line in output.splitlines():
+        match = _GETPROP_LINE.match(line.strip())
+        if match:
+            props[match.group("key")] = match.group("value").strip()
+    return props
+
+
+def parse_device_listing(output: str) -> List[Tuple[str, str, Dict[str, str]]]:
+    """Parses `adb devices -l` output into (serial, state, fields) tuples."""
+    entries = []
+    for line in output.splitlines():
+        # Skip header "List of devices attached" and daemon notices
+        if not line.strip() or line.startswith(("List of devices", "*")):
+            continue
+        parts = line.split()
+        if len(parts) >= 2:
+            fields = dict(
+                part.split(":", 1) for part in parts[2:] if ":" in part
+            )
+            entries.append((parts[0], parts[1], fields))
+    return entries
+
+
+def _first_prop(props: Dict[str, str], *keys: str) -> str:
+    """Returns the first non-empty property among keys."""
+    for key in keys:
+        value = props.get(key, "").strip()
+        if value:
+            return value
+    return ""
+
+
+def _remove_partial(path: str):
+    """Deletes what an interrupted pull wrote to path."""
+    try:
+        os.remove(path)
+    except FileNotFoundError:
+        pass
+    except OSError as e:
+        logger.warning(f"Could not remove partial file {path}: {e}")
+
+
+def input_command(kind: str, args: tuple) -> str:
+    """Builds the `input` shell command for a "key", "tap" or "swipe" event."""
+    verb = {"key": "keyevent", "tap": "tap", "swipe": "swipe"}[kind]
+    return f"input {verb} " + " ".join(shlex.quote(str(arg)) for arg in args)
+
+
+# Called with (serial, kind, args) for every input event sent to a device
+InputListener = Callable[[str, str, tuple], None]
+
 
 class ADBWrapper:
     def __init__(self):
         self.adb_path = str(config.adb_path)
+        self.device_cache = DeviceInfoCache()
+        self.health = DeviceHealthTracker()
+        self._enrich_pool = ThreadPoolExecutor(
+            max_workers=config.enrich_workers, thread_name_prefix="adb-enrich"
+        )
+        self._enrichments: Dict[str, Future] = {}
+        # Serials whose enrichment in flight re-reads the device (refresh=True)
+        self._refreshing: Set[str] = set()
+        self._enrich_lock = threading.Lock()
+        self._input_listeners: List[InputListener] = []
         self._ensure_adb_exists()
 
     def _ensure_adb_exists(self):
@@ -17,14 +116,48 @@ class ADBWrapper:
                 f"ADB executable not found at {self.adb_path}. Please install functionality may be limited."
             )
 
-    def run_command(self, args: List[str]) -> str:
-        """Runs a synchronous ADB command and returns output."""
+    def run_command(self, args: List[str], timeout: Optional[float] = None) -> str:
+        """Runs a synchronous ADB command and returns output.
+
+        Every command carries a deadline (config.command_timeout by default).
+        Commands for a device whose circuit is open are skipped. The adb
+        binary only takes over when the server could not be reached, never
+        for a command that may already have run on the device.
+        """
+        timeout = timeout or config.command_timeout
+        serial = args[1] if len(args) >= 2 and args[0] == "-s" else None
+        if serial and not self.health.allow(serial):
+            logger.debug(f"Skipping '{' '.join(args[2:])}' on unresponsive {serial}")
+            return ""
+
+        try:
+            output = self._run_native(args, timeout)
+            if output is not None:
+                self._record_success(serial)
+                return output
+        except AdbProtocolError as e:
+            logger.error(f"ADB command failed: {' '.join(args)}: {e}")
+            return ""
+        except TimeoutError:
+            self._record_timeout(serial, args)
+            return ""
+        except AdbRequestSentError as e:
+            logger.error(f"ADB command interrupted: {' '.join(args)}: {e}")
+            return ""
+        except OSError as e:
+            # No adb server listening yet; the binary will start one
+            logger.debug(f"ADB server unreachable ({e}), using adb binary")
+
         full_cmd = [self.adb_path] + args
         try:
             result = subprocess.run(
-                full_cmd, capture_output=True, text=True, check=True
+                full_cmd, capture_output=True, text=True, check=True, timeout=timeout
             )
+            self._record_success(serial)
             return result.stdout.strip()
+        except subprocess.TimeoutExpired:
+            self._record_timeout(serial, args)
+            return ""
         except subprocess.CalledProcessError as e:
             logger.error(f"ADB command failed: {e}")
             return ""
@@ -32,159 +165,356 @@ class ADBWrapper:
             logger.error(f"ADB binary not found at {self.adb_path}")
             return ""
 
-    def get_devices(self) -> List[Device]:
+    def _record_success(self, serial: Optional[str]):
+        if serial:
+            self.health.record_success(serial)
+
+    def _record_timeout(self, serial: Optional[str], args: List[str]):
+        logger.error(f"ADB command timed out: {' '.join(args)}")
+        if serial and self.health.record_failure(serial):
+            logger.warning(f"Device {serial} stopped responding, backing off")
+
+    def _run_native(self, args: List[str], timeout: float) -> Optional[str]:
+        """Runs a command over the adb server socket.
+
+        Returns None for commands the native client does not handle, so the
+        caller can fall back to the adb binary (install, push, ...).
+        """
+        serial = None
+        if len(args) >= 3 and args[0] == "-s":
+            serial, args = args[1], args[2:]
+        if not args:
+            return None
+
+        command, rest = args[0], args[1:]
+        if serial is None:
+            if command == "devices" and rest == ["-l"]:
+                return adb_client.devices().strip()
+            return None
+
+        if command == "shell" and rest:
+            return adb_client.shell(serial, " ".join(rest), timeout)
+        if command == "reboot" and len(rest) <= 1:
+            adb_client.reboot(serial, rest[0] if rest else "", timeout)
+            return ""
+        return None
+
+    def get_devices(self, refresh: bool = False) -> List[Device]:
+        """Lists devices, enriching each online device at most once.
+
+        Enriched info is cached per serial and connection; pass refresh=True
+        to re-query every online device.
+        """
         output = self.run_command(["devices", "-l"])
+        return self.devices_from_listing(output, refresh)
+
+    def devices_from_listing(self, output: str, refresh: bool = False) -> List[Device]:
+        """Builds the device list from `adb devices -l` output."""
         devices = []
         if not output:
+            self.device_cache.retain([])
             return devices
 
-        lines = output.splitlines()
-        for line in lines[1:]:  # Skip header "List of devices attached"
-            if not line.strip():
-                continue
-            parts = line.split()
-            if len(parts) >= 2:
-                serial = parts[0]
-                raw_status = parts[1]
-                status = "Online" if raw_status == "device" else "Offline"
-
-                product_name = ""
-                model_name = ""
-                android_version = ""
-                resolution = ""
-
-                # Only fetch details if online to avoid hanging on offline devices
-                if status == "Online":
-                    # Get Product Name (marketing name like "Galaxy A72", "Pixel 7")
-                    product_name = self.get_product_name(serial)
-                    # Get Model Name (model number like "SM-A725F/DS", "SM-S918U/DS")
-                    model_name = self.get_model_name(serial)
-                    android_version = self.get_android_version(serial)
-                    resolution = self.get_screen_resolution(serial)
-
-                devices.append(
-                    Device(
-                        serial=serial,
-                        status=status,
-                        model=model_name,
-                        product=product_name,
-                        device_name="",  # Deprecated, keeping for compatibility
-                        android_version=android_version,
-                        resolution=resolution,
+        entries = parse_device_listing(output)
+        online = {
+            serial: fields
+            for serial, raw_status, fields in entries
+            if raw_status == "device"
+        }
+        self.device_cache.retain(online)
+        self.health.retain(online)
+        shell_sessions.retain(online)
+        with self._enrich_lock:
+            for serial in list(self._enrichments):
+                if serial not in online and self._enrichments[serial].done():
+                    del self._enrichments[serial]
+                    self._refreshing.discard(serial)
+
+        # Enrich all online devices concurrently; a slow device only delays
+        # the list up to the deadline instead of stalling everyone behind it.
+        # Devices with an open circuit are skipped until their next probe.
+        futures = {
+            serial: self._submit_enrichment(serial, fields, refresh)
+            for serial, fields in online.items()
+            if not self.health.is_open(serial)
+        }
+        if futures:
+            wait(futures.values(), timeout=config.enrich_timeout)
+
+        for serial, raw_status, fields in entries:
+            status = "Online" if raw_status == "device" else "Offline"
+            info = None
+            enriching = False
+
+            # Only fetch details if online to avoid hanging on offline devices
+            future = futures.get(serial)
+            if serial in online and future is None:
+                status = "Unresponsive"
+                identity = fields.get("transport_id", "")
+                info = self.device_cache.get(serial, identity)
+            elif future is not None:
+                if not future.done():
+                    # Still running; its result lands in the cache later
+                    enriching = True
+                elif future.exception() is not None:
+                    logger.error(
+                        f"Failed to read properties of {serial}: {future.exception()}"
                     )
+                else:
+                    info = future.result()
+            if info is None:
+                # What `adb devices -l` says until the device answers
+                info = self._listing_info(serial, fields)
+
+            devices.append(
+                Device(
+                    serial=serial,
+                    status=status,
+                    model=info.model,
+                    product=info.product,
+                    device_name="",  # Deprecated, keeping for compatibility
+                    android_version=info.android_version,
+                    resolution=info.resolution,
+                    enriching=enriching,
                 )
+            )
         return devices
 
-    def get_product_name(self, serial: str) -> str:
+    def _listing_info(self, serial: str, fields: Dict[str, str]) -> DeviceInfo:
+        """Model and product from the fields of `adb devices -l` alone."""
+        props = {
+            prop: fields[field]
+            for field, prop in LISTING_FIELD_PROPS.items()
+            if fields.get(field)
+        }
+        if not props:
+            return DeviceInfo()
+        return DeviceInfo(
+            product=self.get_product_name(serial, props),
+            model=self.get_model_name(serial, props),
+        )
+
+    def _submit_enrichment(
+        self, serial: str, listing_fields: Dict[str, str], refresh: bool
+    ) -> Future:
+        """Schedules get_device_info, reusing an enrichment still in flight.
+
+        A refresh requested while a plain enrichment is running is queued to
+        start when it ends, since that one may return cached info.
+        """
+        with self._enrich_lock:
+            future = self._enrichments.get(serial)
+            if future is None or future.done():
+                future = self._enrich_pool.submit(
+                    self.get_device_info, serial, listing_fields, refresh
+                )
+            elif refresh and serial not in self._refreshing:
+                future = self._enrich_pool.submit(
+                    self._refresh_after, future, serial, listing_fields
+                )
+            else:
+                return future
+            self._enrichments[serial] = future
+            if refresh:
+                self._refreshing.add(serial)
+            else:
+                self._refreshing.discard(serial)
+            return future
+
+    def _refresh_after(
+        self, previous: Future, serial: str, listing_fields: Dict[str, str]
+    ) -> DeviceInfo:
+        wait([previous])
+        return self.get_device_info(serial, listing_fields, refresh=True)
+
+    def is_enriching(self, serial: str) -> bool:
+        """Returns True while a background enrichment for serial is running."""
+        with self._enrich_lock:
+            future = self._enrichments.get(serial)
+            return future is not None and not future.done()
+
+    def get_device_info(
+        self,
+        serial: str,
+        listing_fields: Optional[Dict[str, str]] = None,
+        refresh: bool = False,
+    ) -> DeviceInfo:
+        """Returns enriched info for a device, served from the cache when valid."""
+        identity = (listing_fields or {}).get("transport_id", "")
+
+        if refresh:
+            self.device_cache.invalidate(serial)
+        else:
+            info = self.device_cache.get(serial, identity)
+            if info is not None:
+                if not self.device_cache.needs_verify(serial):
+                    return info
+                # Cheap check that the device has not rebooted meanwhile
+                boot_id = self.shell_command(serial, BOOT_ID_COMMAND)
+                if boot_id and boot_id == info.boot_id:
+                    self.device_cache.mark_verified(serial)
+                    return info
+                logger.info(f"Boot id of {serial} changed, re-reading properties")
+
+        # One shell round trip per device; every lookup reads the map
+        props = self.get_properties(serial, listing_fields)
+        info = DeviceInfo(
+            # Product Name (marketing name like "Galaxy A72", "Pixel 7")
+            product=self.get_product_name(serial, props),
+            # Model Name (model number like "SM-A725F/DS", "SM-S918U/DS")
+            model=self.get_model_name(serial, props),
+            android_version=self.get_android_version(serial, props),
+            resolution=self.get_screen_resolution(serial, props),
+            boot_id=props.get(BOOT_ID_PROP, ""),
+        )
+        if props:
+            self.device_cache.put(serial, identity, info)
+        return info
+
+    def get_properties(
+        self, serial: str, listing_fields: Optional[Dict[str, str]] = None
+    ) -> Dict[str, str]:
+        """Returns a snapshot of the device's system properties.
+
+        Runs `getprop`, `wm size` and reads the boot id in a single shell
+        round trip. The physical screen size and boot id are stored under the
+        pseudo properties `wm.physical_size` and `kernel.boot_id`.
+        `listing_fields` (the model:/product:/device: fields printed by
+        `adb devices -l`) fill in the matching properties if getprop failed.
+        """
+        output = self.shell_command(serial, PROPERTIES_COMMAND)
+        props = parse_getprop_output(output)
+
+        for line in output.splitlines():
+            line = line.strip()
+            if "Physical size:" in line:
+                props[PHYSICAL_SIZE_PROP] = line.split("Physical size:")[1].strip()
+            elif _BOOT_ID_LINE.match(line):
+                props[BOOT_ID_PROP] = line
+
+        for field, prop in LISTING_FIELD_PROPS.items():
+            if listing_fields and listing_fields.get(field):
+                props.setdefault(prop, listing_fields[field])
+        return props
+
+    def get_product_name(
+        self, serial: str, props: Optional[Dict[str, str]] = None
+    ) -> str:
         """Get the marketing/commercial product name (e.g., 'Galaxy A72', 'Pixel 7')"""
         from autoxium.utils.device_names import get_marketing_name
-        
+
+        if props is None:
+            props = self.get_properties(serial)
+
         # Get manufacturer to determine which properties to check
-        manufacturer = self.shell_command(serial, "getprop ro.product.manufacturer").lower()
-        
+        manufacturer = props.get("ro.product.manufacturer", "").lower()
+
         # Get model number
-        model_number = self.shell_command(serial, "getprop ro.product.model")
-        
+        model_number = props.get("ro.product.model", "")
+
         # Try manufacturer-specific properties first
-        marketing_name = ""
-        
         if manufacturer == "samsung":
             # Samsung uses ro.product.marketname or we use our database
-            marketing_name = self.shell_command(serial, "getprop ro.product.marketname")
-            if not marketing_name:
-                marketing_name = self.shell_command(serial, "getprop ro.product.vendor.marketname")
-        
+            marketing_name = _first_prop(
+                props, "ro.product.marketname", "ro.product.vendor.marketname"
+            )
+
         elif manufacturer == "google":
             # Google Pixel: ro.product.model already contains marketing name
             marketing_name = model_number
-        
+
         elif manufacturer in ["xiaomi", "redmi"]:
             # Xiaomi sometimes has marketname
-            marketing_name = self.shell_command(serial, "getprop ro.product.marketname")
-            if not marketing_name:
-                marketing_name = self.shell_command(serial, "getprop ro.product.mod_device")
-        
+            marketing_name = _first_prop(
+                props, "ro.product.marketname", "ro.product.mod_device"
+            )
+
         elif manufacturer == "huawei" or manufacturer == "honor":
             # Huawei/Honor
-            marketing_name = self.shell_command(serial, "getprop ro.config.marketing_name")
-            if not marketing_name:
-                marketing_name = self.shell_command(serial, "getprop ro.product.marketname")
-        
+            marketing_name = _first_prop(
+                props, "ro.config.marketing_name", "ro.product.marketname"
+            )
+
         elif manufacturer == "oneplus":
             # OnePlus
-            marketing_name = self.shell_command(serial, "getprop ro.display.series")
-            if not marketing_name:
-                marketing_name = self.shell_command(serial, "getprop ro.product.marketname")
-        
+            marketing_name = _first_prop(
+                props, "ro.display.series", "ro.product.marketname"
+            )
+
         else:
             # Generic fallback for other manufacturers
-            marketing_name = self.shell_command(serial, "getprop ro.product.marketname")
-            if not marketing_name:
-                marketing_name = self.shell_command(serial, "getprop ro.product.vendor.marketname")
-            if not marketing_name:
-                marketing_name = self.shell_command(serial, "getprop ro.config.marketing_name")
-        
+            marketing_name = _first_prop(
+                props,
+                "ro.product.marketname",
+                "ro.product.vendor.marketname",
+                "ro.config.marketing_name",
+            )
+
         # If we found a marketing name in properties and it's different from model number, use it
-        if marketing_name and marketing_name.strip() and marketing_name != model_number:
-            return marketing_name.strip()
-        
+        if marketing_name and marketing_name != model_number:
+            return marketing_name
+
         # Otherwise, use our mapping database
         product_name = get_marketing_name(model_number, manufacturer)
-        
+
         return product_name.strip()
 
-    def get_model_name(self, serial: str) -> str:
+    def get_model_name(
+        self, serial: str, props: Optional[Dict[str, str]] = None
+    ) -> str:
         """Get the model number (e.g., 'SM-A725F/DS', 'SM-S918U/DS', 'G-2PW4100')"""
+        if props is None:
+            props = self.get_properties(serial)
+
         # Get manufacturer to determine which properties to check
-        manufacturer = self.shell_command(serial, "getprop ro.product.manufacturer").lower()
-        
-        model_name = ""
-        
-        if manufacturer == "samsung":
-            # Samsung: ro.product.model contains the model number (SM-XXXXX)
-            model_name = self.shell_command(serial, "getprop ro.product.model")
-        
-        elif manufacturer == "google":
+        manufacturer = props.get("ro.product.manufacturer", "").lower()
+
+        if manufacturer == "google":
             # Google Pixel: Use device codename or build product
             # ro.product.model = "Pixel 7" (marketing name)
             # ro.product.name = "panther" (codename)
             # We'll use the codename as the "model"
-            model_name = self.shell_command(serial, "getprop ro.product.name")
-            
+            model_name = props.get("ro.product.name", "").strip()
+
             # Fallback to device if name is empty
             if not model_name or len(model_name) < 3:
-                model_name = self.shell_command(serial, "getprop ro.product.device")
-        
+                model_name = props.get("ro.product.device", "")
+
         elif manufacturer in ["xiaomi", "redmi"]:
             # Xiaomi: ro.product.model contains model code
-            model_name = self.shell_command(serial, "getprop ro.product.model")
-            if not model_name:
-                model_name = self.shell_command(serial, "getprop ro.product.vendor.model")
-        
-        elif manufacturer == "huawei" or manufacturer == "honor":
-            # Huawei/Honor
-            model_name = self.shell_command(serial, "getprop ro.product.model")
-        
-        elif manufacturer == "oneplus":
-            # OnePlus
-            model_name = self.shell_command(serial, "getprop ro.product.model")
-        
+            model_name = _first_prop(
+                props, "ro.product.model", "ro.product.vendor.model"
+            )
+
+        elif manufacturer in ["samsung", "huawei", "honor", "oneplus"]:
+            # Samsung (SM-XXXXX), Huawei/Honor and OnePlus keep the model
+            # number in ro.product.model
+            model_name = props.get("ro.product.model", "")
+
         else:
             # Generic: try ro.product.model first
-            model_name = self.shell_command(serial, "getprop ro.product.model")
-            
+            model_name = props.get("ro.product.model", "")
+
             # If it looks like a marketing name, try other properties
             if model_name and not any(c in model_name for c in ['-', '_']) and ' ' in model_name:
-                alt_model = self.shell_command(serial, "getprop ro.product.name")
+                alt_model = props.get("ro.product.name", "")
                 if alt_model:
                     model_name = alt_model
-        
+
         return model_name.strip()
 
-    def get_android_version(self, serial: str) -> str:
+    def get_android_version(
+        self, serial: str, props: Optional[Dict[str, str]] = None
+    ) -> str:
+        if props is not None:
+            return props.get("ro.build.version.release", "")
         return self.shell_command(serial, "getprop ro.build.version.release")
 
-    def get_screen_resolution(self, serial: str) -> str:
+    def get_screen_resolution(
+        self, serial: str, props: Optional[Dict[str, str]] = None
+    ) -> str:
+        if props is not None:
+            return props.get(PHYSICAL_SIZE_PROP, "")
         # Output format: "Physical size: 1080x2400"
         out = self.shell_command(serial, "wm size")
         if "Physical size:" in out:
@@ -195,36 +525,193 @@ class ADBWrapper:
         """Reboots the specified device."""
         self.run_command(["-s", serial, "reboot"])
 
+    def add_input_listener(self, listener: InputListener):
+        self._input_listeners.append(listener)
+
+    def remove_input_listener(self, listener: InputListener):
+        if listener in self._input_listeners:
+            self._input_listeners.remove(listener)
+
+    def send_input(self, serial: str, kind: str, args: tuple):
+        """Sends a "key", "tap" or "swipe" event (see input_command)."""
+        for listener in list(self._input_listeners):
+            listener(serial, kind, args)
+        self.shell_command(serial, input_command(kind, args))
+
     def input_keyevent(self, serial: str, keycode: int | str):
         """Sends a keyevent to the device."""
-        self.run_command(["-s", serial, "shell", "input", "keyevent", str(keycode)])
+        self.send_input(serial, "key", (keycode,))
+
+    def input_tap(self, serial: str, x: int, y: int):
+        """Taps the screen at (x, y) in device pixels."""
+        self.send_input(serial, "tap", (x, y))
+
+    def input_swipe(
+        self, serial: str, x1: int, y1: int, x2: int, y2: int, duration_ms: int = 300
+    ):
+        """Swipes from (x1, y1) to (x2, y2) over duration_ms."""
+        self.send_input(serial, "swipe", (x1, y1, x2, y2, duration_ms))
 
     def install_apk(self, serial: str, apk_path: str):
         """Installs an APK to the specified device."""
-        return self.run_command(["-s", serial, "install", apk_path])
+        return self.run_command(
+            ["-s", serial, "install", apk_path], config.transfer_timeout
+        )
 
     def take_screenshot(self, serial: str, save_path: str):
         """Takes a screenshot and saves it to the specified path."""
+        from autoxium.core.screen_capture import screen_capture
+
         # Use exec-out to get binary png directly
         cmd = [self.adb_path, "-s", serial, "exec-out", "screencap", "-p"]
         try:
+            try:
+                # Raw framebuffer, PNG-encoded on the host instead of the phone
+                data = screen_capture.capture(serial, raw=True)
+            except TimeoutError:
+                raise
+            except (OSError, AdbProtocolError, ValueError, RuntimeError) as e:
+                # RuntimeError: the frame could not be PNG-encoded on the host
+                logger.debug(f"Native screencap unavailable ({e}), using adb binary")
+            else:
+                with open(save_path, "wb") as f:
+                    f.write(data)
+                self.health.record_success(serial)
+                return True
+
             # We don't use self.run_command because we need raw bytes
             with open(save_path, "wb") as f:
-                subprocess.run(cmd, stdout=f, check=True)
+                subprocess.run(
+                    cmd, stdout=f, check=True, timeout=config.command_timeout
+                )
+            self.health.record_success(serial)
             return True
+        except (TimeoutError, subprocess.TimeoutExpired):
+            self._record_timeout(serial, cmd[1:])
+            return False
         except Exception as e:
             logger.error(f"Screenshot failed: {e}")
             return False
 
-    def push_file(self, serial: str, local_path: str, remote_path: str):
-        """Pushes a file to the specified device."""
-        return self.run_command(["-s", serial, "push", local_path, remote_path])
+    def push_file(
+        self,
+        serial: str,
+        local_path: str,
+        remote_path: str,
+        progress: Optional[ProgressCallback] = None,
+    ):
+        """Pushes a file to the specified device.
+
+        The adb binary only takes over if the sync service cannot be
+        started; an interrupted transfer is reported, not repeated.
+        """
+        if not self.health.allow(serial):
+            logger.debug(f"Skipping push to unresponsive {serial}")
+            return ""
+        if os.path.isfile(local_path):
+            try:
+                with SyncConnection(serial) as sync, request_sent():
+                    # Like adb push, a directory target receives the file by name
+                    if sync.stat(remote_path).is_dir:
+                        remote_path = posixpath.join(
+                            remote_path, os.path.basename(local_path)
+                        )
+                    size = os.path.getsize(local_path)
+                    started = time.monotonic()
+                    sync.push(
+                        local_path,
+                        remote_path,
+                        progress=progress,
+                        timeout=config.transfer_timeout,
+                    )
+                self.health.record_success(serial)
+                elapsed = max(time.monotonic() - started, 1e-6)
+                return (
+                    f"{local_path}: 1 file pushed. "
+                    f"{size / elapsed / 1024 / 1024:.1f} MB/s ({size} bytes in {elapsed:.3f}s)"
+                )
+            except TimeoutError:
+                self._record_timeout(
+                    serial, ["-s", serial, "push", local_path, remote_path]
+                )
+                return ""
+            except (AdbProtocolError, AdbRequestSentError) as e:
+                logger.error(f"Push to {serial} failed: {e}")
+                return ""
+            except OSError as e:
+                logger.debug(f"Native push unavailable ({e}), using adb binary")
+        return self.run_command(
+            ["-s", serial, "push", local_path, remote_path], config.transfer_timeout
+        )
+
+    def pull_file(
+        self,
+        serial: str,
+        remote_path: str,
+        local_path: str,
+        progress: Optional[ProgressCallback] = None,
+    ):
+        """Pulls a file from the specified device.
+
+        As with push_file(), only a sync service that cannot be started
+        falls back to the adb binary. A failed transfer leaves no partial
+        file behind.
+        """
+        if not self.health.allow(serial):
+            logger.debug(f"Skipping pull from unresponsive {serial}")
+            return ""
+        try:
+            with SyncConnection(serial) as sync, request_sent():
+                size = sync.pull_to_file(
+                    remote_path, local_path, progress, config.transfer_timeout
+                )
+            self.health.record_success(serial)
+            return f"{remote_path}: 1 file pulled. ({size} bytes)"
+        except TimeoutError:
+            self._record_timeout(
+                serial, ["-s", serial, "pull", remote_path, local_path]
+            )
+            _remove_partial(local_path)
+            return ""
+        except (AdbProtocolError, AdbRequestSentError) as e:
+            logger.error(f"Pull from {serial} failed: {e}")
+            _remove_partial(local_path)
+            return ""
+        except OSError as e:
+            logger.debug(f"Native pull unavailable ({e}), using adb binary")
+        return self.run_command(
+            ["-s", serial, "pull", remote_path, local_path], config.transfer_timeout
+        )
 
-    def shell_command(self, serial: str, command: str) -> str:
+    def shell_command(
+        self, serial: str, command: str, timeout: Optional[float] = None
+    ) -> str:
         """Runs a shell command on the device."""
+        timeout = timeout or config.command_timeout
+        if not self.health.allow(serial):
+            logger.debug(f"Skipping '{command}' on unresponsive {serial}")
+            return ""
+
+        # Prefer the device's persistent shell session
+        try:
+            exit_code, output = shell_sessions.run(serial, command, timeout)
+            self.health.record_success(serial)
+            if exit_code != 0:
+                logger.debug(f"Shell command exited with {exit_code}: {command}")
+            return output
+        except TimeoutError:
+            self._record_timeout(serial, ["-s", serial, "shell", command])
+            return ""
+        except AdbRequestSentError as e:
+            # The command may have run; sending it again is not safe
+            logger.error(f"Shell command interrupted on {serial}: {command}: {e}")
+            return ""
+        except (OSError, AdbProtocolError) as e:
+            logger.debug(f"Shell session unavailable for {serial} ({e})")
+
         # Split command string into list for subprocess
         cmd_args = ["-s", serial, "shell"] + command.split()
-        return self.run_command(cmd_args)
+        return self.run_command(cmd_args, timeout)
 
 
 adb = ADBWrapper()
@@ -0,0 +1,128 @@
+import re
+import shlex
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Callable, Dict, List, Optional
+from autoxium.core.adb_wrapper import ADBWrapper, adb
+from autoxium.utils.apk_manifest import ApkInfo, base_apk, read_apk_info
+from autoxium.utils.config import config
+from autoxium.utils.logger import logger
+
+_VERSION_CODE = re.compile(r"versionCode=(\d+)")
+# Section headers, package blocks and version lines of `dumpsys package`
+_DUMPSYS_FILTER = r"^[^ ]|Package \[|versionCode="
+
+
+def parse_installed_version(output: str, package: str) -> Optional[int]:
+    """Reads the versionCode from `dumpsys package <package>` output.
+
+    Only the package's block in the "Packages:" section counts; the same
+    package can also appear under "Hidden system packages:" with the
+    version of its factory copy.
+    """
+    section = ""
+    in_block = False
+    for line in output.splitlines():
+        stripped = line.strip()
+        if line and not line[0].isspace():
+            section = stripped
+            in_block = False
+        elif stripped.startswith("Package ["):
+            in_block = section == "Packages:" and stripped.startswith(
+                f"Package [{package}]"
+            )
+        elif in_block:
+            match = _VERSION_CODE.search(stripped)
+            if match:
+                return int(match.group(1))
+    return None
+
+
+@dataclass
+class InstallResult:
+    serial: str
+    status: str  # "installed", "skipped" or "failed"
+    message: str = ""
+
+
+class FleetInstaller:
+    """Installs one app (a single APK or a split set) on many devices.
+
+    The manifest is read once, every device's installed version is queried
+    in one parallel batch, devices already on that version (or a newer one)
+    are skipped and the rest install concurrently up to max_concurrency.
+    """
+
+    def __init__(self, wrapper: ADBWrapper = adb, max_concurrency: int = None):
+        self.adb = wrapper
+        self.max_concurrency = max_concurrency or config.install_concurrency
+
+    def installed_version(self, serial: str, package: str) -> Optional[int]:
+        """Returns the installed versionCode of package, or None if absent."""
+        output = self.adb.shell_command(
+            serial,
+            f"dumpsys package {shlex.quote(package)} | grep -E '{_DUMPSYS_FILTER}'",
+        )
+        return parse_installed_version(output, package)
+
+    def install(
+        self,
+        serials: List[str],
+        apk_paths: List[str],
+        on_result: Callable[[InstallResult], None] = None,
+        force: bool = False,
+    ) -> List[InstallResult]:
+        infos = [read_apk_info(path) for path in apk_paths]
+        app = base_apk(infos)
+        if app is None:
+            raise ValueError("No base APK among the selected files")
+        if any(info.package != app.package for info in infos):
+            raise ValueError("Selected APKs belong to different packages")
+        logger.info(
+            f"Installing {app.package} {app.version_name} ({app.version_code}) "
+            f"on {len(serials)} device(s)"
+        )
+
+        with ThreadPoolExecutor(
+            max_workers=max(1, min(self.max_concurrency, len(serials))),
+            thread_name_prefix="apk-install",
+        ) as pool:
+            installed: Dict[str, Optional[int]] = {}
+            if not force:
+                installed = dict(
+                    zip(serials, pool.map(lambda s: self.installed_version(s, app.package), serials))
+                )
+
+            def run(serial: str) -> InstallResult:
+                version = installed.get(serial)
+                if version is not None and version == app.version_code:
+                    result = InstallResult(serial, "skipped", "Already up to date")
+                elif version is not None and version > app.version_code:
+                    result = InstallResult(
+                        serial, "skipped", f"Newer version {version} installed"
+                    )
+                else:
+                    result = self._install_one(serial, infos)
+                if on_result:
+                    on_result(result)
+                return result
+
+            return list(pool.map(run, serials))
+
+    def _install_one(self, serial: str, infos: List[ApkInfo]) -> InstallResult:
+        paths = [info.path for info in infos]
+        if len(paths) == 1:
+            args = ["-s", serial, "install", "-r", paths[0]]
+        else:
+            args = ["-s", serial, "install-multiple", "-r"] + paths
+        output = self.adb.run_command(args, config.transfer_timeout)
+        if "Success" in output:
+            return InstallResult(serial, "installed", output)
+        if "INSTALL_FAILED_VERSION_DOWNGRADE" in output:
+            # Only reachable with force=True, which skips the version check
+            return InstallResult(serial, "skipped", "Newer version installed")
+        logger.error(f"Install on {serial} failed: {output}")
+        return InstallResult(serial, "failed", output or "adb install failed")
+
+
+fleet_installer = FleetInstaller()
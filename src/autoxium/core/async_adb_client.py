@@ -0,0 +1,283 @@
+"""
+Asyncio counterpart of the ADB host protocol client.
+
+Lets automation scripts drive many devices concurrently from one event loop.
+Every call is bounded by a global and a per-device concurrency limit and
+carries a timeout. All coroutines of one client must run on the same event
+loop; synchronous code can use `run_sync` to execute them on a shared
+background loop.
+"""
+
+import asyncio
+import os
+import posixpath
+import struct
+import threading
+import time
+from contextlib import asynccontextmanager
+from typing import Dict, List, Optional, Tuple
+from autoxium.core.adb_client import AdbProtocolError
+from autoxium.core.adb_wrapper import parse_device_listing
+from autoxium.core.sync_protocol import SYNC_DATA_MAX, SyncStat
+from autoxium.utils.config import config
+
+
+class AsyncAdbClient:
+    def __init__(
+        self,
+        host: str = None,
+        port: int = None,
+        timeout: float = 30.0,
+        max_concurrency: int = 64,
+        per_device_concurrency: int = 4,
+    ):
+        self.host = host or config.adb_server_host
+        self.port = port or config.adb_server_port
+        self.timeout = timeout
+        self.max_concurrency = max_concurrency
+        self.per_device_concurrency = per_device_concurrency
+        self._global_limit: Optional[asyncio.Semaphore] = None
+        self._device_limits: Dict[str, asyncio.Semaphore] = {}
+
+    # --- Concurrency ---
+
+    @asynccontextmanager
+    async def _slot(self, serial: Optional[str] = None):
+        """Holds a global slot and, for device calls, a per-device slot."""
+        if self._global_limit is None:
+            self._global_limit = asyncio.Semaphore(self.max_concurrency)
+        async with self._global_limit:
+            if serial is None:
+                yield
+                return
+            limit = self._device_limits.get(serial)
+            if limit is None:
+                limit = asyncio.Semaphore(self.per_device_concurrency)
+                self._device_limits[serial] = limit
+            async with limit:
+                yield
+
+    async def _run(self, serial: Optional[str], coro, timeout: Optional[float]):
+        """Awaits coro within the concurrency limits.
+
+        The timeout starts once the call has its slot.
+        """
+        try:
+            async with self._slot(serial):
+                return await asyncio.wait_for(coro, timeout or self.timeout)
+        finally:
+            # No-op if it ran; avoids "never awaited" if cancelled while queued
+            coro.close()
+
+    # --- Wire helpers ---
+
+    async def _connect(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        return await asyncio.open_connection(self.host, self.port)
+
+    @staticmethod
+    async def _send_request(writer: asyncio.StreamWriter, request: str):
+        payload = request.encode("utf-8")
+        writer.write(b"%04x" % len(payload) + payload)
+        await writer.drain()
+
+    @staticmethod
+    async def _read_status(reader: asyncio.StreamReader):
+        status = await reader.readexactly(4)
+        if status == b"OKAY":
+            return
+        if status == b"FAIL":
+            size = int(await reader.readexactly(4), 16)
+            message = (await reader.readexactly(size)).decode("utf-8", "replace")
+            raise AdbProtocolError(message)
+        raise AdbProtocolError(f"Unexpected adb server status: {status!r}")
+
+    @staticmethod
+    async def _close(writer: asyncio.StreamWriter):
+        writer.close()
+        try:
+            await writer.wait_closed()
+        except OSError:
+            pass
+
+    @asynccontextmanager
+    async def _transport(self, serial: str, service: str):
+        """Yields a (reader, writer) pair connected to a device service."""
+        reader, writer = await self._connect()
+        try:
+            await self._send_request(writer, f"host:transport:{serial}")
+            await self._read_status(reader)
+            await self._send_request(writer, service)
+            await self._read_status(reader)
+            yield reader, writer
+        finally:
+            await self._close(writer)
+
+    async def _host_command(self, request: str) -> str:
+        reader, writer = await self._connect()
+        try:
+            await self._send_request(writer, request)
+            await self._read_status(reader)
+            size = int(await reader.readexactly(4), 16)
+            return (await reader.readexactly(size)).decode("utf-8", "replace")
+        finally:
+            await self._close(writer)
+
+    async def _service_output(self, serial: str, service: str) -> bytes:
+        async with self._transport(serial, service) as (reader, _):
+            return await reader.read()
+
+    # --- Sync protocol (see sync_protocol for the blocking version) ---
+
+    @staticmethod
+    def _sync_request(request_id: bytes, data: bytes = b"") -> bytes:
+        return request_id + struct.pack("<I", len(data)) + data
+
+    @staticmethod
+    async def _sync_header(reader: asyncio.StreamReader) -> Tuple[bytes, int]:
+        header = await reader.readexactly(8)
+        response_id, length = header[:4], struct.unpack("<I", header[4:])[0]
+        if response_id == b"FAIL":
+            message = await reader.readexactly(length)
+            raise AdbProtocolError(message.decode("utf-8", "replace"))
+        return response_id, length
+
+    async def _push(self, serial: str, local_path: str, remote_path: str) -> str:
+        st = os.stat(local_path)
+        started = time.monotonic()
+        async with self._transport(serial, "sync:") as (reader, writer):
+            writer.write(self._sync_request(b"STAT", remote_path.encode("utf-8")))
+            response = await reader.readexactly(16)
+            if response[:4] != b"STAT":
+                raise AdbProtocolError(f"Unexpected sync response {response[:4]!r}")
+            # Like adb push, a directory target receives the file by name
+            if SyncStat(*struct.unpack("<III", response[4:])).is_dir:
+                remote_path = posixpath.join(remote_path, os.path.basename(local_path))
+
+            target = f"{remote_path},{st.st_mode}".encode("utf-8")
+            writer.write(self._sync_request(b"SEND", target))
+            with open(local_path, "rb") as f:
+                while chunk := f.read(SYNC_DATA_MAX):
+                    writer.write(self._sync_request(b"DATA", chunk))
+                    await writer.drain()
+            writer.write(b"DONE" + struct.pack("<I", int(st.st_mtime)))
+            await writer.drain()
+            response_id, _ = await self._sync_header(reader)
+            if response_id != b"OKAY":
+                raise AdbProtocolError(f"Unexpected sync response {response_id!r}")
+            writer.write(self._sync_request(b"QUIT"))
+        elapsed = max(time.monotonic() - started, 1e-6)
+        return (
+            f"{local_path}: 1 file pushed. {st.st_size / elapsed / 1024 / 1024:.1f} MB/s "
+            f"({st.st_size} bytes in {elapsed:.3f}s)"
+        )
+
+    async def _pull(self, serial: str, remote_path: str, local_path: str) -> str:
+        size = 0
+        async with self._transport(serial, "sync:") as (reader, writer):
+            writer.write(self._sync_request(b"RECV", remote_path.encode("utf-8")))
+            with open(local_path, "wb") as f:
+                while True:
+                    response_id, length = await self._sync_header(reader)
+                    if response_id == b"DONE":
+                        break
+                    if response_id != b"DATA":
+                        raise AdbProtocolError(
+                            f"Unexpected sync response {response_id!r}"
+                        )
+                    f.write(await reader.readexactly(length))
+                    size += length
+            writer.write(self._sync_request(b"QUIT"))
+        return f"{remote_path}: 1 file pulled. ({size} bytes)"
+
+    # --- API ---
+
+    async def devices(
+        self, timeout: Optional[float] = None
+    ) -> List[Tuple[str, str, Dict[str, str]]]:
+        """Returns (serial, state, fields) tuples from `devices -l`."""
+        listing = await self._run(None, self._host_command("host:devices-l"), timeout)
+        return parse_device_listing(listing)
+
+    async def shell(
+        self, serial: str, command: str, timeout: Optional[float] = None
+    ) -> str:
+        output = await self._run(
+            serial, self._service_output(serial, f"shell:{command}"), timeout
+        )
+        return output.decode("utf-8", "replace").replace("\r\n", "\n").strip()
+
+    async def exec_out(
+        self, serial: str, command: str, timeout: Optional[float] = None
+    ) -> bytes:
+        return await self._run(
+            serial, self._service_output(serial, f"exec:{command}"), timeout
+        )
+
+    async def reboot(self, serial: str, target: str = "", timeout: Optional[float] = None):
+        await self._run(serial, self._service_output(serial, f"reboot:{target}"), timeout)
+
+    async def push(
+        self, serial: str, local_path: str, remote_path: str, timeout: Optional[float] = None
+    ) -> str:
+        """Sends a local file over the sync protocol."""
+        return await self._run(serial, self._push(serial, local_path, remote_path), timeout)
+
+    async def pull(
+        self, serial: str, remote_path: str, local_path: str, timeout: Optional[float] = None
+    ) -> str:
+        """Receives a device file over the sync protocol."""
+        return await self._run(serial, self._pull(serial, remote_path, local_path), timeout)
+
+    async def install(
+        self, serial: str, apk_path: str, timeout: Optional[float] = None
+    ) -> str:
+        """Streams an APK to the package manager (`cmd package install -S`)."""
+        return await self._run(serial, self._install(serial, apk_path), timeout)
+
+    async def _install(self, serial: str, apk_path: str) -> str:
+        size = os.path.getsize(apk_path)
+        service = f"exec:cmd package install -S {size}"
+        async with self._transport(serial, service) as (reader, writer):
+            with open(apk_path, "rb") as f:
+                while chunk := f.read(65536):
+                    writer.write(chunk)
+                    await writer.drain()
+            output = (await reader.read()).decode("utf-8", "replace").strip()
+        if "Success" not in output:
+            raise AdbProtocolError(output or "Install failed")
+        return output
+
+
+class _LoopThread:
+    """A background thread running the event loop shared by sync callers."""
+
+    def __init__(self):
+        self._loop: Optional[asyncio.AbstractEventLoop] = None
+        self._lock = threading.Lock()
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None:
+                self._loop = asyncio.new_event_loop()
+                threading.Thread(
+                    target=self._loop.run_forever, name="adb-async-loop", daemon=True
+                ).start()
+            return self._loop
+
+    def run(self, coro, timeout: Optional[float] = None):
+        future = asyncio.run_coroutine_threadsafe(coro, self._ensure_loop())
+        return future.result(timeout)
+
+
+_loop_thread = _LoopThread()
+
+
+def run_sync(coro, timeout: Optional[float] = None):
+    """Runs a coroutine of `async_adb` on the shared loop and waits for it.
+
+    Example: run_sync(async_adb.shell(serial, "getprop ro.product.model"))
+    """
+    return _loop_thread.run(coro, timeout)
+
+
+async_adb = AsyncAdbClient()
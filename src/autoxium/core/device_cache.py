@@ -0,0 +1,82 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable, Optional
+
+
+@dataclass
+class DeviceInfo:
+    """Static facts about a device that only change across reboots."""
+
+    product: str = ""
+    model: str = ""
+    android_version: str = ""
+    resolution: str = ""
+    boot_id: str = ""
+
+
+@dataclass
+class _CacheEntry:
+    identity: str
+    info: DeviceInfo
+    verified_at: float
+
+
+class DeviceInfoCache:
+    """Caches enriched device info per serial.
+
+    An entry is tied to the device's connection identity (the adb transport
+    id, which changes on every reconnect). Entries are dropped when the
+    device disconnects, when the identity changes, or on explicit
+    invalidation. Entries older than `verify_interval` seconds should be
+    checked against the device's boot id before being trusted again.
+    """
+
+    def __init__(self, verify_interval: float = 60.0):
+        self.verify_interval = verify_interval
+        self._entries: Dict[str, _CacheEntry] = {}
+        self._lock = threading.Lock()
+
+    def get(self, serial: str, identity: str) -> Optional[DeviceInfo]:
+        with self._lock:
+            entry = self._entries.get(serial)
+            if entry is None:
+                return None
+            if entry.identity != identity:
+                # Device reconnected since it was enriched
+                del self._entries[serial]
+                return None
+            return entry.info
+
+    def put(self, serial: str, identity: str, info: DeviceInfo):
+        with self._lock:
+            self._entries[serial] = _CacheEntry(identity, info, time.monotonic())
+
+    def needs_verify(self, serial: str) -> bool:
+        with self._lock:
+            entry = self._entries.get(serial)
+            if entry is None:
+                return False
+            return time.monotonic() - entry.verified_at >= self.verify_interval
+
+    def mark_verified(self, serial: str):
+        with self._lock:
+            entry = self._entries.get(serial)
+            if entry is not None:
+                entry.verified_at = time.monotonic()
+
+    def retain(self, serials: Iterable[str]):
+        """Drops entries for every device not in serials (disconnected)."""
+        keep = set(serials)
+        with self._lock:
+            for serial in list(self._entries):
+                if serial not in keep:
+                    del self._entries[serial]
+
+    def invalidate(self, serial: Optional[str] = None):
+        """Forgets one device, or every device if serial is None."""
+        with self._lock:
+            if serial is None:
+                self._entries.clear()
+            else:
+                self._entries.pop(serial, None)
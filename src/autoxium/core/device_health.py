@@ -0,0 +1,100 @@
+import threading
+import time
+from dataclasses import dataclass
+from typing import Dict, Iterable
+
+
+@dataclass
+class _Health:
+    failures: int = 0
+    opened: int = 0  # Consecutive times the circuit has opened
+    retry_at: float = 0.0
+    probe_thread: int = 0  # Thread running the half-open probe, 0 if none
+    probe_until: float = 0.0  # When an unanswered probe is given up
+
+
+class DeviceHealthTracker:
+    """Per-serial circuit breaker for devices that stop answering.
+
+    After `failure_threshold` consecutive timeouts the circuit opens and the
+    device is skipped. Once the backoff has elapsed the circuit is half-open:
+    the first caller gets through as the probe and everyone else is still
+    turned away. A success closes the circuit, another timeout reopens it
+    with twice the backoff (capped at max_backoff). A probe that reports
+    neither within probe_timeout is given up so another caller can probe.
+    """
+
+    def __init__(
+        self,
+        failure_threshold: int = 2,
+        base_backoff: float = 10.0,
+        max_backoff: float = 300.0,
+        probe_timeout: float = 30.0,
+    ):
+        self.failure_threshold = failure_threshold
+        self.base_backoff = base_backoff
+        self.max_backoff = max_backoff
+        self.probe_timeout = probe_timeout
+        self._health: Dict[str, _Health] = {}
+        self._lock = threading.Lock()
+
+    def allow(self, serial: str) -> bool:
+        """Returns False while the device's circuit is open.
+
+        When the circuit is half-open this claims the probe for the calling
+        thread, which is let through again until it records the outcome.
+        """
+        with self._lock:
+            health = self._health.get(serial)
+            if health is None or not health.opened:
+                return True
+            now = time.monotonic()
+            if now < health.retry_at:
+                return False
+            thread = threading.get_ident()
+            if health.probe_thread not in (0, thread) and now < health.probe_until:
+                return False
+            health.probe_thread = thread
+            health.probe_until = now + self.probe_timeout
+            return True
+
+    def is_open(self, serial: str) -> bool:
+        """True while calls would be turned away; never claims the probe."""
+        with self._lock:
+            health = self._health.get(serial)
+            if health is None or not health.opened:
+                return False
+            now = time.monotonic()
+            if now < health.retry_at:
+                return True
+            return (
+                health.probe_thread not in (0, threading.get_ident())
+                and now < health.probe_until
+            )
+
+    def record_success(self, serial: str):
+        with self._lock:
+            self._health.pop(serial, None)
+
+    def record_failure(self, serial: str) -> bool:
+        """Counts a timeout; returns True if this opened the circuit."""
+        with self._lock:
+            health = self._health.setdefault(serial, _Health())
+            health.failures += 1
+            # A failed probe after a backoff reopens the circuit immediately
+            if health.opened == 0 and health.failures < self.failure_threshold:
+                return False
+            backoff = min(self.base_backoff * (2**health.opened), self.max_backoff)
+            health.opened += 1
+            health.failures = 0
+            health.retry_at = time.monotonic() + backoff
+            health.probe_thread = 0
+            return True
+
+    def retain(self, serials: Iterable[str]):
+        """Forgets devices that are no longer connected."""
+        keep = set(serials)
+        with self._lock:
+            for serial in list(self._health):
+                if serial not in keep:
+                    del self._health[serial]
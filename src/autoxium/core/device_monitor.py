@@ -1,34 +1,124 @@
 from PyQt6.QtCore import QThread, pyqtSignal
-import time
+import threading
+from typing import Dict, List
+from autoxium.core.adb_client import AdbProtocolError, adb_client
 from autoxium.core.adb_wrapper import adb
-from autoxium.models.device import Device
+from autoxium.models.device import Device, DeviceChangeSet
 from autoxium.utils.logger import logger
 
 
 class DeviceMonitorWorker(QThread):
-    devices_updated = pyqtSignal(list)  # Emits List[Device]
+    # Only emitted when something changed
+    devices_changed = pyqtSignal(object)  # Emits DeviceChangeSet
+    devices_updated = pyqtSignal(list)  # Emits List[Device] (full list)
+    device_added = pyqtSignal(object)  # Emits Device
+    device_removed = pyqtSignal(str)  # Emits serial
+    device_state_changed = pyqtSignal(object)  # Emits Device with its new status
+
+    # How often the tracking loop wakes up to check for stop requests
+    POLL_TIMEOUT = 0.5
 
     def __init__(self, interval=2.0):
         super().__init__()
+        # Retry delay while the adb server is unreachable
         self.interval = interval
         self.running = True
+        self._stop_event = threading.Event()
+        self._tracker = None
+        self._listing = ""
+        self._snapshot: Dict[str, Device] = {}
+        self._refresh_requested = threading.Event()
 
     def run(self):
         logger.info("Device Monitor started.")
         while self.running:
             try:
-                devices = adb.get_devices()
-                self.devices_updated.emit(devices)
+                self._track()
             except Exception as e:
-                logger.error(f"Error in device monitor loop: {e}")
+                if not self.running:
+                    break
+                if isinstance(e, (OSError, AdbProtocolError)):
+                    # adb server restarted or is not running yet
+                    logger.warning(f"Device tracking interrupted ({e}), reconnecting")
+                    self._poll_once()
+                else:
+                    logger.error(f"Error in device monitor loop: {e}")
+                self._stop_event.wait(self.interval)
+
+    def _track(self):
+        """Follows the adb server's track-devices stream until it breaks."""
+        self._tracker = adb_client.track_devices()
+        try:
+            while self.running:
+                listing = self._tracker.poll(self.POLL_TIMEOUT)
+                if listing is None:
+                    if self._take_refresh():
+                        self._publish(adb.devices_from_listing(self._listing, True))
+                    elif self._enrichment_settled():
+                        # Pick up devices that missed the enrichment deadline
+                        self._publish(adb.devices_from_listing(self._listing))
+                    continue
+                self._listing = listing
+                self._publish(adb.devices_from_listing(listing))
+        finally:
+            self._tracker.close()
+            self._tracker = None
+
+    def _enrichment_settled(self) -> bool:
+        """True if a device published as enriching has finished enriching."""
+        return any(
+            device.enriching and not adb.is_enriching(device.serial)
+            for device in self._snapshot.values()
+        )
+
+    def request_refresh(self):
+        """Re-reads every device's details and publishes what changed.
+
+        Runs on the monitor thread, so the device table and the monitor's
+        snapshot never disagree.
+        """
+        self._refresh_requested.set()
+
+    def _take_refresh(self) -> bool:
+        if not self._refresh_requested.is_set():
+            return False
+        self._refresh_requested.clear()
+        return True
+
+    def _poll_once(self):
+        """Lists devices through the adb binary, which restarts the server."""
+        try:
+            self._publish(adb.get_devices(refresh=self._take_refresh()))
+        except Exception as e:
+            logger.error(f"Error polling devices: {e}")
+
+    def _publish(self, devices: List[Device]):
+        current = {device.serial: device for device in devices}
+        changes = DeviceChangeSet.between(self._snapshot, current)
+        self._snapshot = current
+        if not changes:
+            return
+
+        for device in changes.added:
+            self.device_added.emit(device)
+        for change in changes.changed:
+            if "status" in change.fields:
+                self.device_state_changed.emit(change.device)
+        for serial in changes.removed:
+            self.device_removed.emit(serial)
 
-            time.sleep(self.interval)
+        self.devices_changed.emit(changes)
+        self.devices_updated.emit(devices)
 
     def stop(self):
         self.running = False
+        self._stop_event.set()
+        tracker = self._tracker
+        if tracker is not None:
+            tracker.close()
         self.wait()
 
     def set_interval(self, interval_ms):
-        """Set the polling interval in milliseconds"""
+        """Set the reconnect interval in milliseconds"""
         self.interval = interval_ms / 1000.0  # Convert to seconds
         logger.info(f"Monitor interval set to {self.interval} seconds")
@@ -0,0 +1,106 @@
+"""
+Picks scrcpy encoding settings (resolution, bitrate, fps) for a mirror from
+its on-screen size, the number of active mirrors and host CPU load.
+"""
+
+from typing import NamedTuple
+import psutil
+
+MIN_SIZE = 320
+MAX_SIZE = 1920
+DEFAULT_TILE_SIZE = 800  # Used before a window has been laid out
+MIN_BIT_RATE = 500_000
+MAX_BIT_RATE = 8_000_000
+MIN_FPS = 15
+# Bits per pixel per frame for H.264 screen content; phones are ~9:19.5,
+# so a frame is about half of max_size squared
+BITS_PER_PIXEL = 0.1
+FRAME_AREA_RATIO = 0.5
+
+
+class EncodingProfile(NamedTuple):
+    """Same field order as ScrcpySession.options."""
+
+    max_size: int
+    bit_rate: int
+    max_fps: int
+
+
+class EncodingPolicy:
+    """Maps (tile size, mirror count, CPU load) to an EncodingProfile.
+
+    - max_size follows the tile's longest side in device pixels, since
+      encoding more pixels than the window shows is wasted work.
+    - fps drops as more mirrors share the host: 60 up to 4, 30 up to 12,
+      20 beyond, and is cut further when the CPU is busy.
+    - bit_rate scales with pixels per second.
+
+    needs_renegotiation() only asks for a restart when a session is well
+    off its target, so windows being nudged around do not restart scrcpy.
+    """
+
+    def __init__(
+        self,
+        busy_cpu: float = 60.0,
+        overloaded_cpu: float = 85.0,
+        change_ratio: float = 1.3,
+        min_uptime: float = 20.0,
+    ):
+        self.busy_cpu = busy_cpu
+        self.overloaded_cpu = overloaded_cpu
+        self.change_ratio = change_ratio
+        self.min_uptime = min_uptime  # Seconds a session runs before a restart
+        self._cpu_percent = 0.0
+
+    def sample_cpu(self) -> float:
+        """Measures system CPU load since the previous sample.
+
+        psutil keeps one baseline per process, so only one timer should
+        call this; everyone else reads the result through cpu_percent().
+        """
+        self._cpu_percent = psutil.cpu_percent(None)
+        return self._cpu_percent
+
+    def cpu_percent(self) -> float:
+        """System CPU load as of the last sample_cpu()."""
+        return self._cpu_percent
+
+    def choose(
+        self, tile_size: int, mirror_count: int, cpu_percent: float = 0.0
+    ) -> EncodingProfile:
+        size = tile_size if tile_size > 0 else DEFAULT_TILE_SIZE
+        # Encoders want dimensions divisible by 8
+        size = min(max(-(-size // 8) * 8, MIN_SIZE), MAX_SIZE)
+
+        if mirror_count <= 4:
+            fps = 60
+        elif mirror_count <= 12:
+            fps = 30
+        else:
+            fps = 20
+        if cpu_percent >= self.overloaded_cpu:
+            fps //= 2
+        elif cpu_percent >= self.busy_cpu:
+            fps = fps * 3 // 4
+        fps = max(fps, MIN_FPS)
+
+        bit_rate = int(size * size * FRAME_AREA_RATIO * fps * BITS_PER_PIXEL)
+        bit_rate = min(max(bit_rate, MIN_BIT_RATE), MAX_BIT_RATE)
+        return EncodingProfile(size, bit_rate, fps)
+
+    def needs_renegotiation(
+        self, current: EncodingProfile, target: EncodingProfile, uptime: float = None
+    ) -> bool:
+        """True if current is far enough from target to restart the stream."""
+        if uptime is not None and uptime < self.min_uptime:
+            return False
+        return any(
+            max(a, b) / max(min(a, b), 1) >= self.change_ratio
+            for a, b in (
+                (current.max_size, target.max_size),
+                (current.max_fps, target.max_fps),
+            )
+        )
+
+
+encoding_policy = EncodingPolicy()
@@ -0,0 +1,99 @@
+"""
+Broadcast input: a key or gesture sent to one device is sent to a group of
+devices at the same time.
+
+Each device is driven over its persistent shell session, and all sends for
+one event are submitted to a thread pool together, so the skew between the
+first and last device is one shell round trip rather than the sum of N adb
+process spawns. Sends to one device run one at a time, in the order they
+were made, so a tap followed by a swipe never arrives swapped.
+"""
+
+import threading
+from collections import deque
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Deque, Dict, Iterable, List, Set, Tuple
+from autoxium.core.adb_wrapper import ADBWrapper, adb
+from autoxium.utils.logger import logger
+
+
+class InputBroadcaster:
+    def __init__(self, wrapper: ADBWrapper = adb, max_workers: int = 32):
+        self.adb = wrapper
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="input-broadcast"
+        )
+        self._groups: Dict[str, Set[str]] = {}
+        # serial -> sends waiting for that device, the first one running
+        self._queues: Dict[str, Deque[Tuple[Future, Callable, tuple]]] = {}
+        self._lock = threading.Lock()
+
+    def set_targets(self, source: str, serials: Iterable[str]):
+        """Mirrors input sent to source onto serials (source itself excluded)."""
+        targets = set(serials) - {source}
+        with self._lock:
+            if targets:
+                self._groups[source] = targets
+            else:
+                self._groups.pop(source, None)
+        if not targets:
+            logger.info(f"Stopped broadcasting input from {source}")
+            return
+        logger.info(f"Broadcasting input from {source} to {len(targets)} device(s)")
+        # Open the shell sessions now so the first event is not slowed down
+        for serial in targets:
+            self._submit(serial, self.adb.shell_command, serial, "true")
+
+    def targets(self, source: str) -> Set[str]:
+        with self._lock:
+            return set(self._groups.get(source, ()))
+
+    def is_broadcasting(self, source: str) -> bool:
+        with self._lock:
+            return source in self._groups
+
+    def clear(self, source: str):
+        self.set_targets(source, ())
+
+    def send(self, source: str, kind: str, args: tuple) -> List[Future]:
+        """Sends an input event to source and its broadcast group in parallel.
+
+        Returns immediately; the futures complete when each device has run
+        the command.
+        """
+        serials = [source] + sorted(self.targets(source))
+        return [
+            self._submit(serial, self.adb.send_input, serial, kind, args)
+            for serial in serials
+        ]
+
+    def _submit(self, serial: str, fn: Callable, *args) -> Future:
+        """Queues fn(*args) behind the earlier sends to serial."""
+        future = Future()
+        with self._lock:
+            queue = self._queues.setdefault(serial, deque())
+            queue.append((future, fn, args))
+            idle = len(queue) == 1
+        if idle:
+            self._pool.submit(self._drain, serial)
+        return future
+
+    def _drain(self, serial: str):
+        """Runs the queued sends of one device until its queue is empty."""
+        while True:
+            with self._lock:
+                future, fn, args = self._queues[serial][0]
+            if future.set_running_or_notify_cancel():
+                try:
+                    future.set_result(fn(*args))
+                except Exception as e:
+                    future.set_exception(e)
+            with self._lock:
+                queue = self._queues[serial]
+                queue.popleft()
+                if not queue:
+                    del self._queues[serial]
+                    return
+
+
+input_broadcaster = InputBroadcaster()
@@ -0,0 +1,590 @@
+"""
+Continuous logcat capture for every online device.
+
+Each device has one long-lived `logcat -B` stream (binary entries) on an
+`exec:` transport, so nothing is mangled by a pty. A few reader threads
+multiplex all the sockets and split the byte stream into entries as it
+arrives. Entries go to a per-device ring buffer in memory and, as the raw
+binary records, to zlib-compressed blocks in segment files on disk.
+
+When a device comes back after a disconnect its stream restarts with
+`-T <last timestamp>`, so the gap is filled from the device's own buffer
+instead of being lost.
+"""
+
+import atexit
+import os
+import re
+import selectors
+import socket
+import struct
+import threading
+import time
+import zlib
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from pathlib import Path
+from typing import Deque, Dict, Iterator, List, NamedTuple, Optional, Tuple
+from autoxium.core.adb_client import AdbClient, adb_client
+from autoxium.core.logcat_index import SegmentIndexWriter, index_path
+from autoxium.models.device import DeviceChangeSet
+from autoxium.utils.config import config
+from autoxium.utils.logger import logger
+
+# struct logger_entry: payload length, header size (0 in v1), pid, tid, sec, nsec
+ENTRY_PREFIX = struct.Struct("<HHiIII")
+V1_HEADER_SIZE = 20
+PRIORITIES = "??VDIWEFS"  # Indexed by android_LogPriority
+
+# Segment files are a sequence of blocks, each this header followed by
+# zlib-compressed raw entries; see logcat_index for their sidecar index
+BLOCK_MAGIC = b"LCB1"
+BLOCK_HEADER = struct.Struct("<4sIIIqq")  # magic, compressed, raw, count, min, max ns
+BLOCK_BYTES = 64 * 1024  # Raw bytes per block
+FLUSH_INTERVAL = 5.0  # Seconds before a partial block is written anyway
+SEGMENT_BYTES = 8 * 1024 * 1024
+
+RESTART_DELAY = 1.0
+MAX_RESTART_DELAY = 30.0
+
+
+class LogcatEntry(NamedTuple):
+    time_ns: int  # Device wall clock
+    pid: int
+    tid: int
+    priority: int  # 2 (verbose) .. 7 (fatal)
+    tag: str
+    message: str
+
+    @property
+    def timestamp(self) -> float:
+        return self.time_ns / 1e9
+
+    @property
+    def level(self) -> str:
+        return PRIORITIES[self.priority] if self.priority < len(PRIORITIES) else "?"
+
+
+def decode_entry(raw: bytes) -> LogcatEntry:
+    """Decodes one binary logger_entry (any header version)."""
+    length, header_size, pid, tid, sec, nsec = ENTRY_PREFIX.unpack_from(raw)
+    payload = raw[header_size or V1_HEADER_SIZE :]
+    priority = payload[0] if payload else 0
+    tag_end = payload.find(b"\0", 1)
+    if tag_end == -1:
+        tag_end = len(payload)
+    return LogcatEntry(
+        sec * 1_000_000_000 + nsec,
+        pid,
+        tid,
+        priority,
+        payload[1:tag_end].decode("utf-8", "replace"),
+        payload[tag_end + 1 :].rstrip(b"\0").decode("utf-8", "replace"),
+    )
+
+
+class LogcatParser:
+    """Splits a `logcat -B` byte stream into raw entries as it arrives."""
+
+    def __init__(self):
+        self._buffer = bytearray()
+
+    def feed(self, data: bytes) -> List[bytes]:
+        buffer = self._buffer
+        buffer += data
+        entries = []
+        offset = 0
+        while len(buffer) - offset >= ENTRY_PREFIX.size:
+            length, header_size = struct.unpack_from("<HH", buffer, offset)
+            end = offset + (header_size or V1_HEADER_SIZE) + length
+            if end > len(buffer):
+                break
+            entries.append(bytes(buffer[offset:end]))
+            offset = end
+        del buffer[:offset]
+        return entries
+
+
+def read_blocks(
+    path: Path, with_data: bool = True, start: int = 0
+) -> Iterator[Tuple[tuple, bytes]]:
+    """Yields (header fields, raw entry bytes) per block of a segment file.
+
+    Reading begins at offset start, which must be a block boundary. With
+    with_data=False the data is skipped (b"" is yielded), which makes
+    scanning headers cheap. A block cut short by a crash ends the file.
+    """
+    with open(path, "rb") as f:
+        f.seek(start)
+        while True:
+            header = f.read(BLOCK_HEADER.size)
+            if len(header) < BLOCK_HEADER.size:
+                return
+            fields = BLOCK_HEADER.unpack(header)
+            if fields[0] != BLOCK_MAGIC:
+                logger.warning(f"Corrupt logcat block in {path}")
+                return
+            if not with_data:
+                f.seek(fields[1], os.SEEK_CUR)
+                yield fields, b""
+                continue
+            data = f.read(fields[1])
+            if len(data) < fields[1]:
+                return
+            yield fields, zlib.decompress(data)
+
+
+def read_segment(path: Path) -> Iterator[LogcatEntry]:
+    for _, raw in read_blocks(path):
+        for entry in LogcatParser().feed(raw):
+            yield decode_entry(entry)
+
+
+class LogcatSpool:
+    """Writes one device's raw entries to compressed segment files.
+
+    Each segment gets a sidecar index, updated block by block. Keeps at
+    most max_bytes of segments, deleting the oldest first. The device's
+    serial is saved in the directory as "serial".
+    """
+
+    def __init__(self, directory: Path, max_bytes: int, serial: str = ""):
+        self.directory = Path(directory)
+        self.max_bytes = max_bytes
+        self.serial = serial
+        self._pending = bytearray()
+        self._count = 0
+        self._min_ns = self._max_ns = 0
+        self._priorities = 0
+        self._tags = set()
+        self._since = time.monotonic()
+        self._file = None
+        self._index: Optional[SegmentIndexWriter] = None
+        self._lock = threading.Lock()
+
+    def segments(self) -> List[Path]:
+        """Segment files, oldest first."""
+        if not self.directory.is_dir():
+            return []
+        return sorted(self.directory.glob("segment-*.lcz"))
+
+    def last_time_ns(self) -> int:
+        """Timestamp of the newest entry on disk, 0 if there is none."""
+        for path in reversed(self.segments()):
+            last = 0
+            for fields, _ in read_blocks(path, with_data=False):
+                last = fields[5]
+            if last:
+                return last
+        return 0
+
+    def write(self, raw: bytes, entry: LogcatEntry):
+        with self._lock:
+            time_ns = entry.time_ns
+            if not self._count:
+                self._min_ns = self._max_ns = time_ns
+                self._since = time.monotonic()
+            elif time_ns < self._min_ns:
+                self._min_ns = time_ns
+            elif time_ns > self._max_ns:
+                self._max_ns = time_ns
+            self._pending += raw
+            self._count += 1
+            self._priorities |= 1 << (entry.priority & 0xF)
+            self._tags.add(entry.tag)
+            if len(self._pending) >= BLOCK_BYTES:
+                self._write_block()
+
+    def flush(self, stale_only: bool = False):
+        """Writes the partial block; with stale_only, only if it is old."""
+        with self._lock:
+            if not self._count:
+                return
+            if stale_only and time.monotonic() - self._since < FLUSH_INTERVAL:
+                return
+            self._write_block()
+            if self._file is not None:
+                self._file.flush()
+
+    def close(self):
+        self.flush()
+        with self._lock:
+            if self._file is not None:
+                self._file.close()
+                self._index.close()
+                self._file = self._index = None
+
+    def _write_block(self):
+        data = zlib.compress(bytes(self._pending), 6)
+        header = BLOCK_HEADER.pack(
+            BLOCK_MAGIC,
+            len(data),
+            len(self._pending),
+            self._count,
+            self._min_ns,
+            self._max_ns,
+        )
+        try:
+            if self._file is None or self._file.tell() >= SEGMENT_BYTES:
+                self._rotate()
+            offset = self._file.tell()
+            self._file.write(header + data)
+            # The block must be on disk before the index points at it
+            self._file.flush()
+            self._index.add_block(
+                offset,
+                len(data),
+                self._count,
+                self._min_ns,
+                self._max_ns,
+                self._priorities,
+                sorted(self._tags),
+            )
+        except OSError as e:
+            logger.error(f"Failed to write logcat segment in {self.directory}: {e}")
+        self._pending.clear()
+        self._count = 0
+        self._priorities = 0
+        self._tags.clear()
+
+    def _rotate(self):
+        if self._file is not None:
+            self._file.close()
+            self._index.close()
+        self.directory.mkdir(parents=True, exist_ok=True)
+        if self.serial:
+            (self.directory / "serial").write_text(self.serial, encoding="utf-8")
+        segments = self.segments()
+        number = int(segments[-1].stem.split("-")[1]) + 1 if segments else 0
+        path = self.directory / f"segment-{number:06d}.lcz"
+        self._file = open(path, "ab")
+        self._index = SegmentIndexWriter(index_path(path))
+
+        # Leave room for the new segment
+        sizes = [(path, path.stat().st_size) for path in segments]
+        total = sum(size for _, size in sizes) + SEGMENT_BYTES
+        for path, size in sizes:
+            if total <= self.max_bytes:
+                break
+            try:
+                path.unlink()
+                index_path(path).unlink(missing_ok=True)
+            except OSError as e:  # e.g. open in a search on Windows
+                logger.warning(f"Could not delete logcat segment {path}: {e}")
+            total -= size
+
+
+def safe_name(serial: str) -> str:
+    """Serial as a directory name ("192.168.1.5:5555" -> "192.168.1.5_5555")."""
+    return re.sub(r"[^A-Za-z0-9._-]", "_", serial)
+
+
+class _DeviceLog:
+    """Everything kept for one device, across its reconnects."""
+
+    def __init__(self, serial: str, directory: Path, ring_size: int, max_bytes: int):
+        self.serial = serial
+        self.ring: Deque[LogcatEntry] = deque(maxlen=ring_size)
+        self.spool = LogcatSpool(directory / safe_name(serial), max_bytes, serial)
+        # Time of the last entry received; read from disk on first connect
+        self.last_time_ns: Optional[int] = None
+        self.wanted = False  # Whether the device is online
+        self.delay = RESTART_DELAY
+        # Pending reconnect, cancelled when the device goes or comes back
+        self.retry: Optional[threading.Timer] = None
+
+
+class _Stream:
+    """One connection's `logcat -B` socket."""
+
+    __slots__ = ("log", "sock", "parser", "entries", "resume_ns")
+
+    def __init__(self, log: _DeviceLog, sock: socket.socket, resume_ns: int = 0):
+        self.log = log
+        self.sock = sock
+        self.parser = LogcatParser()
+        self.entries = 0
+        # The -T timestamp; entries up to it were stored by the last stream
+        self.resume_ns = resume_ns
+
+
+class _Reader(threading.Thread):
+    """Reads the streams of several devices with one selector."""
+
+    def __init__(self, collector: "LogcatCollector", name: str):
+        super().__init__(name=name, daemon=True)
+        self.collector = collector
+        self.selector = selectors.DefaultSelector()
+        self.streams: Dict[str, _Stream] = {}
+        self._changes: List[Tuple[bool, _Stream]] = []
+        self._lock = threading.Lock()
+        self.running = True
+
+    def add(self, stream: _Stream):
+        with self._lock:
+            self._changes.append((True, stream))
+
+    def remove(self, stream: _Stream):
+        with self._lock:
+            self._changes.append((False, stream))
+
+    def load(self) -> int:
+        with self._lock:
+            pending = sum(1 if add else -1 for add, _ in self._changes)
+        return len(self.streams) + pending
+
+    def run(self):
+        while self.running:
+            self._apply_changes()
+            if not self.streams:
+                time.sleep(0.2)
+                continue
+            for key, _ in self.selector.select(0.2):
+                self._read(key.data)
+            for stream in list(self.streams.values()):
+                stream.log.spool.flush(stale_only=True)
+        self._apply_changes()
+        for stream in list(self.streams.values()):
+            self._drop(stream)
+
+    def _apply_changes(self):
+        with self._lock:
+            changes, self._changes = self._changes, []
+        for add, stream in changes:
+            if add:
+                previous = self.streams.get(stream.log.serial)
+                if previous is not None:
+                    # Never read two streams of one device into its spool
+                    logger.warning(f"Replacing logcat stream for {stream.log.serial}")
+                    self._drop(previous)
+                stream.sock.setblocking(False)
+                self.selector.register(stream.sock, selectors.EVENT_READ, stream)
+                self.streams[stream.log.serial] = stream
+            elif self.streams.get(stream.log.serial) is stream:
+                self._drop(stream)
+
+    def _drop(self, stream: _Stream):
+        if self.streams.get(stream.log.serial) is stream:
+            del self.streams[stream.log.serial]
+        self.selector.unregister(stream.sock)
+        stream.sock.close()
+        stream.log.spool.flush()
+
+    def _read(self, stream: _Stream):
+        try:
+            data = stream.sock.recv(65536)
+        except (BlockingIOError, InterruptedError):
+            return
+        except OSError as e:
+            logger.warning(f"Logcat stream for {stream.log.serial} failed: {e}")
+            data = b""
+        if not data:
+            self._drop(stream)
+            self.collector._stream_ended(stream)
+            return
+
+        log = stream.log
+        for raw in stream.parser.feed(data):
+            entry = decode_entry(raw)
+            if stream.resume_ns:
+                # -T starts at the resume timestamp itself, so the leading
+                # entries repeat what is already stored. Past the first
+                # newer one everything is kept: buffers interleave slightly
+                # out of order and device clocks can step back.
+                if entry.time_ns <= stream.resume_ns:
+                    continue
+                stream.resume_ns = 0
+            log.last_time_ns = entry.time_ns
+            log.ring.append(entry)
+            log.spool.write(raw, entry)
+            stream.entries += 1
+
+
+class LogcatCollector:
+    """Keeps a logcat stream open for every online device.
+
+    Devices are followed through apply_changes() with the device
+    monitor's change sets. Connecting happens on a small thread pool;
+    reading is spread over config.logcat_readers threads.
+    """
+
+    def __init__(
+        self,
+        client: AdbClient = adb_client,
+        directory: Path = None,
+        readers: int = None,
+        ring_size: int = None,
+        max_bytes: int = None,
+    ):
+        self.client = client
+        self.directory = Path(directory or config.logcat_dir)
+        self.reader_count = readers or config.logcat_readers
+        self.ring_size = ring_size or config.logcat_ring_entries
+        self.max_bytes = max_bytes or config.logcat_max_bytes
+        self._logs: Dict[str, _DeviceLog] = {}
+        self._readers: List[_Reader] = []
+        self._streams: Dict[str, Tuple[_Reader, _Stream]] = {}
+        self._connector = ThreadPoolExecutor(
+            max_workers=4, thread_name_prefix="logcat-connect"
+        )
+        self._lock = threading.RLock()
+        atexit.register(self.stop_all)
+
+    def apply_changes(self, changes: DeviceChangeSet):
+        for device in changes.added:
+            if device.status == "Online":
+                self.start(device.serial)
+        for change in changes.changed:
+            if "status" not in change.fields:
+                continue
+            if change.device.status == "Online":
+                self.start(change.device.serial)
+            else:
+                self.stop(change.device.serial)
+        for serial in changes.removed:
+            self.stop(serial)
+
+    def start(self, serial: str):
+        with self._lock:
+            log = self._logs.get(serial)
+            if log is None:
+                log = self._logs[serial] = _DeviceLog(
+                    serial, self.directory, self.ring_size, self.max_bytes
+                )
+            if log.wanted:
+                return
+            log.wanted = True
+            log.delay = RESTART_DELAY
+            self._cancel_retry(log)
+        self._connector.submit(self._connect, log)
+
+    def stop(self, serial: str):
+        """Closes the stream; the ring and resume point are kept."""
+        with self._lock:
+            log = self._logs.get(serial)
+            if log is None or not log.wanted:
+                return
+            log.wanted = False
+            self._cancel_retry(log)
+            reader, stream = self._streams.pop(serial, (None, None))
+        if reader is not None:
+            reader.remove(stream)
+
+    def stop_all(self):
+        for serial in list(self._logs):
+            self.stop(serial)
+        with self._lock:
+            readers, self._readers = self._readers, []
+        for reader in readers:
+            reader.running = False
+            reader.join(2.0)
+        for log in self._logs.values():
+            log.spool.close()
+
+    def streaming(self) -> List[str]:
+        with self._lock:
+            return list(self._streams)
+
+    def recent(self, serial: str, count: int = None) -> List[LogcatEntry]:
+        """The newest entries held in memory for a device, oldest first."""
+        log = self._logs.get(serial)
+        if log is None:
+            return []
+        entries = list(log.ring)
+        return entries if count is None else entries[-count:]
+
+    def segments(self, serial: str) -> List[Path]:
+        log = self._logs.get(serial)
+        if log is None:
+            return LogcatSpool(self.directory / safe_name(serial), 0).segments()
+        log.spool.flush()
+        return log.spool.segments()
+
+    def _command(self, log: _DeviceLog) -> str:
+        if not log.last_time_ns:
+            return "exec:logcat -B"
+        sec, nsec = divmod(log.last_time_ns, 1_000_000_000)
+        return f"exec:logcat -B -T {sec}.{nsec:09d}"
+
+    def _connect(self, log: _DeviceLog):
+        with self._lock:
+            # A retry can race a fresh start(); one stream per device
+            if not log.wanted or log.serial in self._streams:
+                return
+        if log.last_time_ns is None:
+            log.last_time_ns = log.spool.last_time_ns()
+        resume_ns = log.last_time_ns
+        command = self._command(log)
+        try:
+            sock = self.client.open_transport(
+                log.serial, command, timeout=config.command_timeout
+            )
+        except Exception as e:
+            logger.warning(f"Could not start logcat on {log.serial}: {e}")
+            self._retry(log)
+            return
+
+        with self._lock:
+            if not log.wanted or log.serial in self._streams:
+                sock.close()
+                return
+            stream = _Stream(log, sock, resume_ns)
+            reader = self._least_loaded_reader()
+            self._streams[log.serial] = (reader, stream)
+            reader.add(stream)
+        logger.info(f"Capturing logcat from {log.serial} ({command[5:]})")
+
+    def _least_loaded_reader(self) -> _Reader:
+        if len(self._readers) < self.reader_count:
+            reader = _Reader(self, f"logcat-reader-{len(self._readers)}")
+            reader.start()
+            self._readers.append(reader)
+            return reader
+        return min(self._readers, key=_Reader.load)
+
+    def _stream_ended(self, stream: _Stream):
+        """Called on a reader thread when logcat's output ends."""
+        log = stream.log
+        with self._lock:
+            if self._streams.get(log.serial, (None, None))[1] is not stream:
+                return  # Already stopped or replaced
+            del self._streams[log.serial]
+            if not log.wanted:
+                return
+        if stream.entries:
+            log.delay = RESTART_DELAY
+        logger.info(f"Logcat stream for {log.serial} ended, resuming")
+        self._retry(log)
+
+    def _retry(self, log: _DeviceLog):
+        with self._lock:
+            if not log.wanted:
+                return
+            self._cancel_retry(log)
+            delay = log.delay
+            log.delay = min(log.delay * 2, MAX_RESTART_DELAY)
+            timer = log.retry = threading.Timer(
+                delay, lambda: self._reconnect(log, timer)
+            )
+            timer.daemon = True
+            timer.start()
+
+    @staticmethod
+    def _cancel_retry(log: _DeviceLog):
+        if log.retry is not None:
+            log.retry.cancel()
+            log.retry = None
+
+    def _reconnect(self, log: _DeviceLog, timer: threading.Timer):
+        with self._lock:
+            # Cancelled too late to stop the timer thread
+            if log.retry is not timer or not log.wanted:
+                return
+            log.retry = None
+        try:
+            self._connector.submit(self._connect, log)
+        except RuntimeError:  # Shutting down
+            pass
+
+
+logcat_collector = LogcatCollector()
@@ -0,0 +1,147 @@
+"""
+Sidecar index for logcat segment files.
+
+Next to every `segment-N.lcz` the spool writes `segment-N.lci`, an
+append-only file with one record per compressed block: where the block
+is, its time range, a bitmap of the priorities in it and the ids of its
+tags. Tag names are stored once per segment, the first time they appear.
+Queries read only the index to decide which blocks to decompress.
+
+    file    := MAGIC record*
+    record  := "T" <u16 length> <utf-8 tag>           (next tag id)
+             | "B" BLOCK <u32 tag id> * tag count
+"""
+
+import mmap
+import struct
+from pathlib import Path
+from typing import Dict, FrozenSet, Iterable, List, NamedTuple
+from autoxium.utils.logger import logger
+
+INDEX_SUFFIX = ".lci"
+MAGIC = b"LCI1"
+TAG_LENGTH = struct.Struct("<H")
+# Offset, compressed size, entry count, min ns, max ns, priority bitmap, tag count
+BLOCK = struct.Struct("<QIIqqHI")
+TAG_ID = struct.Struct("<I")
+
+
+class BlockInfo(NamedTuple):
+    offset: int  # Of the block header in the segment file
+    compressed: int
+    count: int
+    min_ns: int
+    max_ns: int
+    priorities: int  # Bit p set if an entry of priority p is in the block
+    tag_ids: FrozenSet[int]
+
+    def overlaps(self, start_ns: int, end_ns: int) -> bool:
+        return self.min_ns <= end_ns and self.max_ns >= start_ns
+
+
+class SegmentIndex(NamedTuple):
+    tags: List[str]  # Tag id -> name
+    blocks: List[BlockInfo]
+
+    def tag_ids(self, names: Iterable[str]) -> FrozenSet[int]:
+        wanted = set(names)
+        return frozenset(i for i, tag in enumerate(self.tags) if tag in wanted)
+
+
+def index_path(segment: Path) -> Path:
+    return Path(segment).with_suffix(INDEX_SUFFIX)
+
+
+def priority_mask(min_priority: int) -> int:
+    """Bitmap of every priority at or above min_priority."""
+    return 0xFFFF & ~((1 << min_priority) - 1)
+
+
+def read_index(path: Path) -> SegmentIndex:
+    """Reads an index file; a record cut short by a crash ends it."""
+    tags: List[str] = []
+    blocks: List[BlockInfo] = []
+    with open(path, "rb") as f:
+        if f.seek(0, 2) <= len(MAGIC):
+            return SegmentIndex(tags, blocks)
+        with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as data:
+            if data[: len(MAGIC)] != MAGIC:
+                logger.warning(f"Not a logcat index: {path}")
+                return SegmentIndex(tags, blocks)
+            size = len(data)
+            position = len(MAGIC)
+            while position < size:
+                kind = data[position : position + 1]
+                position += 1
+                if kind == b"T":
+                    if position + TAG_LENGTH.size > size:
+                        break
+                    (length,) = TAG_LENGTH.unpack_from(data, position)
+                    position += TAG_LENGTH.size
+                    if position + length > size:
+                        break
+                    tag = data[position : position + length]
+                    tags.append(tag.decode("utf-8", "replace"))
+                    position += length
+                elif kind == b"B":
+                    if position + BLOCK.size > size:
+                        break
+                    fields = BLOCK.unpack_from(data, position)
+                    position += BLOCK.size
+                    end = position + fields[-1] * TAG_ID.size
+                    if end > size:
+                        break
+                    ids = frozenset(
+                        TAG_ID.unpack_from(data, p)[0]
+                        for p in range(position, end, TAG_ID.size)
+                    )
+                    position = end
+                    blocks.append(BlockInfo(*fields[:-1], ids))
+                else:
+                    logger.warning(f"Corrupt logcat index {path} at {position - 1}")
+                    break
+    return SegmentIndex(tags, blocks)
+
+
+class SegmentIndexWriter:
+    """Appends block records to a segment's index as blocks are written."""
+
+    def __init__(self, path: Path):
+        self.path = Path(path)
+        self._tag_ids: Dict[str, int] = {}
+        if self.path.exists():
+            for i, tag in enumerate(read_index(self.path).tags):
+                self._tag_ids[tag] = i
+        self._file = open(self.path, "ab")
+        if self._file.tell() == 0:
+            self._file.write(MAGIC)
+
+    def add_block(
+        self,
+        offset: int,
+        compressed: int,
+        count: int,
+        min_ns: int,
+        max_ns: int,
+        priorities: int,
+        tags: Iterable[str],
+    ):
+        records = bytearray()
+        ids = []
+        for tag in tags:
+            tag_id = self._tag_ids.get(tag)
+            if tag_id is None:
+                tag_id = self._tag_ids[tag] = len(self._tag_ids)
+                encoded = tag.encode("utf-8")[:0xFFFF]
+                records += b"T" + TAG_LENGTH.pack(len(encoded)) + encoded
+            ids.append(tag_id)
+        records += b"B" + BLOCK.pack(
+            offset, compressed, count, min_ns, max_ns, priorities, len(ids)
+        )
+        for tag_id in ids:
+            records += TAG_ID.pack(tag_id)
+        self._file.write(records)
+        self._file.flush()
+
+    def close(self):
+        self._file.close()
@@ -0,0 +1,245 @@
+"""
+Searches captured logcat segments by device, time, tag and priority.
+
+Each segment's sidecar index (see logcat_index) says which blocks can
+hold a match: blocks outside the time window, without the wanted tags or
+without a high enough priority are never read. The remaining blocks are
+sliced straight out of a memory-mapped segment and decompressed, and
+entries are checked on their raw header and tag bytes before anything is
+decoded.
+"""
+
+import heapq
+import mmap
+import struct
+import threading
+import zlib
+from pathlib import Path
+from typing import Dict, Iterator, List, NamedTuple, Tuple
+from autoxium.core.logcat import (
+    BLOCK_HEADER,
+    LogcatEntry,
+    LogcatParser,
+    V1_HEADER_SIZE,
+    decode_entry,
+    read_blocks,
+    safe_name,
+)
+from autoxium.core.logcat_index import (
+    BlockInfo,
+    SegmentIndex,
+    SegmentIndexWriter,
+    index_path,
+    priority_mask,
+    read_index,
+)
+from autoxium.utils.config import config
+from autoxium.utils.logger import logger
+
+ENTRY_TIME = struct.Struct("<II")  # sec, nsec at offset 12 of every entry
+MAX_TIME_NS = 2**63 - 1
+
+
+class LogcatMatch(NamedTuple):
+    serial: str
+    entry: LogcatEntry
+
+
+class LogcatQuery(NamedTuple):
+    serials: Tuple[str, ...] = ()  # Empty for every device
+    start_ns: int = 0
+    end_ns: int = MAX_TIME_NS
+    tags: Tuple[str, ...] = ()  # Empty for every tag
+    min_priority: int = 0
+    text: str = ""  # Case-sensitive substring of the message
+
+
+def _scan_blocks(segment: Path, index: SegmentIndex, offset: int) -> SegmentIndex:
+    """Indexes the blocks from offset on by reading them."""
+    tag_ids = {tag: i for i, tag in enumerate(index.tags)}
+    tags = list(index.tags)
+    blocks = list(index.blocks)
+    position = offset
+    for fields, raw in read_blocks(segment, start=offset):
+        priorities = 0
+        ids = set()
+        for entry in LogcatParser().feed(raw):
+            entry = decode_entry(entry)
+            priorities |= 1 << (entry.priority & 0xF)
+            tag_id = tag_ids.get(entry.tag)
+            if tag_id is None:
+                tag_id = tag_ids[entry.tag] = len(tags)
+                tags.append(entry.tag)
+            ids.add(tag_id)
+        compressed, count, min_ns, max_ns = fields[1], fields[3], fields[4], fields[5]
+        blocks.append(
+            BlockInfo(
+                position, compressed, count, min_ns, max_ns, priorities, frozenset(ids)
+            )
+        )
+        position += BLOCK_HEADER.size + fields[1]
+    return SegmentIndex(tags, blocks)
+
+
+def build_index(segment: Path):
+    """Writes the sidecar index of a segment that has none."""
+    full = _scan_blocks(segment, SegmentIndex([], []), 0)
+    writer = SegmentIndexWriter(index_path(segment))
+    try:
+        for block in full.blocks:
+            writer.add_block(
+                *block[:6], (full.tags[i] for i in sorted(block.tag_ids))
+            )
+    finally:
+        writer.close()
+
+
+class LogcatSearch:
+    """Runs LogcatQuery over the segments under a logcat directory.
+
+    Indexes are cached until their files change.
+    """
+
+    def __init__(self, directory: Path = None):
+        self.directory = Path(directory or config.logcat_dir)
+        # segment -> (index size, segment size, index)
+        self._indexes: Dict[Path, Tuple[int, int, SegmentIndex]] = {}
+        self._lock = threading.Lock()
+
+    def devices(self) -> Dict[str, Path]:
+        """Serial -> directory of every device with captured logs."""
+        found = {}
+        if not self.directory.is_dir():
+            return found
+        for path in sorted(self.directory.iterdir()):
+            if not path.is_dir():
+                continue
+            serial_file = path / "serial"
+            serial = (
+                serial_file.read_text(encoding="utf-8").strip()
+                if serial_file.exists()
+                else path.name
+            )
+            found[serial] = path
+        return found
+
+    def index(self, segment: Path) -> SegmentIndex:
+        """The segment's index, including blocks the sidecar doesn't have yet."""
+        sidecar = index_path(segment)
+        if not sidecar.exists():
+            newest = max(segment.parent.glob("segment-*.lcz"), default=segment)
+            if segment != newest:
+                # Finished segment from before indexes existed
+                logger.info(f"Indexing logcat segment {segment}")
+                build_index(segment)
+        index_size = sidecar.stat().st_size if sidecar.exists() else 0
+        segment_size = segment.stat().st_size
+        with self._lock:
+            cached = self._indexes.get(segment)
+        if cached is not None and cached[:2] == (index_size, segment_size):
+            return cached[2]
+
+        index = read_index(sidecar) if index_size else SegmentIndex([], [])
+        covered = (
+            index.blocks[-1].offset + BLOCK_HEADER.size + index.blocks[-1].compressed
+            if index.blocks
+            else 0
+        )
+        if covered < segment_size:
+            # Blocks written since the index was flushed (or after a crash)
+            index = _scan_blocks(segment, index, covered)
+        with self._lock:
+            self._indexes[segment] = (index_size, segment_size, index)
+        return index
+
+    def search(self, query: LogcatQuery, limit: int = None) -> Iterator[LogcatMatch]:
+        """Matches from all devices, merged in time order."""
+        devices = self.devices()
+        if query.serials:
+            wanted = set(query.serials) | {safe_name(s) for s in query.serials}
+            devices = {
+                s: p for s, p in devices.items() if s in wanted or p.name in wanted
+            }
+        streams = [
+            self._search_device(serial, path, query) for serial, path in devices.items()
+        ]
+        merged = heapq.merge(*streams, key=lambda match: match.entry.time_ns)
+        for count, match in enumerate(merged):
+            if limit is not None and count >= limit:
+                return
+            yield match
+
+    def _search_device(
+        self, serial: str, directory: Path, query: LogcatQuery
+    ) -> Iterator[LogcatMatch]:
+        for segment in sorted(directory.glob("segment-*.lcz")):
+            try:
+                for entry in self._search_segment(segment, query):
+                    yield LogcatMatch(serial, entry)
+            except (OSError, ValueError, zlib.error) as e:
+                # Deleted by the spool's size cap mid-query, or damaged
+                logger.warning(f"Skipped logcat segment {segment}: {e}")
+
+    def _search_segment(self, segment: Path, query: LogcatQuery) -> Iterator[LogcatEntry]:
+        index = self.index(segment)
+        mask = priority_mask(query.min_priority)
+        tag_ids = index.tag_ids(query.tags) if query.tags else None
+        if tag_ids is not None and not tag_ids:
+            return
+        blocks = [
+            block
+            for block in index.blocks
+            if block.overlaps(query.start_ns, query.end_ns)
+            and block.priorities & mask
+            and (tag_ids is None or block.tag_ids & tag_ids)
+        ]
+        if not blocks:
+            return
+
+        tags = {tag.encode("utf-8") for tag in query.tags}
+        text = query.text.encode("utf-8")
+        with open(segment, "rb") as f, mmap.mmap(
+            f.fileno(), 0, access=mmap.ACCESS_READ
+        ) as data:
+            for block in blocks:
+                start = block.offset + BLOCK_HEADER.size
+                raw = zlib.decompress(data[start : start + block.compressed])
+                if text and text not in raw:
+                    continue
+                yield from _filter_block(raw, query, tags, text)
+
+
+def _filter_block(
+    raw: bytes, query: LogcatQuery, tags: set, text: bytes
+) -> List[LogcatEntry]:
+    """Decodes only the entries of a block that match, in time order."""
+    matches: List[LogcatEntry] = []
+    size = len(raw)
+    position = 0
+    while position + V1_HEADER_SIZE <= size:
+        length, header_size = struct.unpack_from("<HH", raw, position)
+        payload = position + (header_size or V1_HEADER_SIZE)
+        end = payload + length
+        if end > size:
+            break
+        entry_start, position = position, end
+        if not length or raw[payload] < query.min_priority:
+            continue
+        sec, nsec = ENTRY_TIME.unpack_from(raw, entry_start + 12)
+        time_ns = sec * 1_000_000_000 + nsec
+        if not query.start_ns <= time_ns <= query.end_ns:
+            continue
+        tag_end = raw.find(b"\0", payload + 1, end)
+        if tag_end == -1:
+            tag_end = end
+        if tags and raw[payload + 1 : tag_end] not in tags:
+            continue
+        if text and raw.find(text, tag_end, end) == -1:
+            continue
+        matches.append(decode_entry(raw[entry_start:end]))
+    # Entries from different log buffers can be slightly out of order
+    matches.sort(key=lambda entry: entry.time_ns)
+    return matches
+
+
+logcat_search = LogcatSearch()
@@ -0,0 +1,264 @@
+"""
+Input macros: record the keyevents, taps and swipes Autoxium sends to a
+device, save them, and replay them on one or many devices.
+
+Replay groups events that are close together into a single shell command
+(`input keyevent 4 3`, or several `input` calls joined with `;`) and runs
+it over the device's persistent shell session, so a macro costs one round
+trip per batch rather than one adb process per event.
+"""
+
+import json
+import re
+import threading
+import time
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass, field
+from typing import Dict, List, Optional
+from autoxium.core.adb_wrapper import ADBWrapper, adb, input_command
+from autoxium.utils.logger import logger
+
+MACRO_FORMAT_VERSION = 1
+EVENT_KINDS = ("key", "tap", "swipe")
+# Symbolic keycodes such as KEYCODE_HOME; anything else must be a number
+_KEYCODE_TOKEN = re.compile(r"^[A-Z0-9_]+$")
+
+
+def _checked_event(entry) -> "InputEvent":
+    """Builds an event from a saved entry, rejecting anything unsafe to run.
+
+    Events end up in a device shell command, so a macro file may only hold
+    the kinds Autoxium records, with integer arguments (or keycode names).
+    """
+    if not isinstance(entry, list) or len(entry) < 2:
+        raise ValueError(f"Malformed macro event: {entry!r}")
+    milliseconds, kind, *args = entry
+    if isinstance(milliseconds, bool) or not isinstance(milliseconds, (int, float)):
+        raise ValueError(f"Bad macro event time: {milliseconds!r}")
+    if kind not in EVENT_KINDS:
+        raise ValueError(f"Unknown macro event kind: {kind!r}")
+    if not args:
+        raise ValueError(f"Macro {kind} event without arguments")
+    for arg in args:
+        if isinstance(arg, int) and not isinstance(arg, bool):
+            continue
+        if kind == "key" and isinstance(arg, str) and _KEYCODE_TOKEN.match(arg):
+            continue
+        raise ValueError(f"Bad argument for macro {kind} event: {arg!r}")
+    return InputEvent(milliseconds / 1000.0, kind, tuple(args))
+
+
+@dataclass
+class InputEvent:
+    time: float  # Seconds since the first event
+    kind: str  # "key", "tap" or "swipe"
+    args: tuple
+
+    def command(self) -> str:
+        return input_command(self.kind, self.args)
+
+
+@dataclass
+class Macro:
+    events: List[InputEvent] = field(default_factory=list)
+    name: str = ""
+
+    @property
+    def duration(self) -> float:
+        return self.events[-1].time if self.events else 0.0
+
+    def to_json(self) -> str:
+        """Compact form: each event is [milliseconds, kind, *args]."""
+        return json.dumps(
+            {
+                "version": MACRO_FORMAT_VERSION,
+                "name": self.name,
+                "events": [
+                    [round(event.time * 1000), event.kind, *event.args]
+                    for event in self.events
+                ],
+            },
+            separators=(",", ":"),
+        )
+
+    @classmethod
+    def from_json(cls, data: str) -> "Macro":
+        document = json.loads(data)
+        if not isinstance(document, dict):
+            raise ValueError("Not an Autoxium macro")
+        if document.get("version") != MACRO_FORMAT_VERSION:
+            raise ValueError(f"Unsupported macro version {document.get('version')}")
+        events = [_checked_event(entry) for entry in document.get("events", [])]
+        return cls(events, str(document.get("name", "")))
+
+    def save(self, path: str):
+        with open(path, "w", encoding="utf-8") as f:
+            f.write(self.to_json())
+
+    @classmethod
+    def load(cls, path: str) -> "Macro":
+        with open(path, "r", encoding="utf-8") as f:
+            return cls.from_json(f.read())
+
+
+@dataclass
+class MacroBatch:
+    time: float  # When to start, seconds from the start of replay
+    command: str
+    size: int  # Number of events
+
+
+def compile_macro(macro: Macro, batch_window: float = 0.3) -> List[MacroBatch]:
+    """Groups events that follow each other within batch_window seconds.
+
+    Consecutive keyevents in a batch collapse into one `input keyevent`;
+    other events are chained with `;`. Events inside a batch run back to
+    back, so timing is exact at batch boundaries and off by at most
+    batch_window inside one. Each `input` call already takes a few hundred
+    milliseconds on the device, so a smaller window buys little.
+    """
+    groups: List[List[InputEvent]] = []
+    for event in macro.events:
+        if groups and event.time - groups[-1][-1].time <= batch_window:
+            groups[-1].append(event)
+        else:
+            groups.append([event])
+
+    batches = []
+    for group in groups:
+        commands = []
+        keys: List[str] = []
+        for event in group:
+            if event.kind == "key":
+                keys.extend(str(arg) for arg in event.args)
+                continue
+            if keys:
+                commands.append(input_command("key", tuple(keys)))
+                keys = []
+            commands.append(event.command())
+        if keys:
+            commands.append(input_command("key", tuple(keys)))
+        batches.append(MacroBatch(group[0].time, "; ".join(commands), len(group)))
+    return batches
+
+
+class MacroRecorder:
+    """Records the input events sent through ADBWrapper."""
+
+    def __init__(self, wrapper: ADBWrapper = adb):
+        self.adb = wrapper
+        self._serial: Optional[str] = None
+        self._events: List[InputEvent] = []
+        self._started_at: Optional[float] = None
+        self._lock = threading.Lock()
+        self.recording = False
+
+    def start(self, serial: Optional[str] = None):
+        """Starts recording events for serial, or for every device if None."""
+        if self.recording:
+            self.stop()
+        self._serial = serial
+        self._events = []
+        self._started_at = None
+        self.recording = True
+        self.adb.add_input_listener(self._on_input)
+        logger.info(f"Recording macro on {serial or 'all devices'}")
+
+    def stop(self, name: str = "") -> Macro:
+        self.adb.remove_input_listener(self._on_input)
+        self.recording = False
+        with self._lock:
+            macro = Macro(list(self._events), name)
+        logger.info(f"Recorded {len(macro.events)} events ({macro.duration:.1f}s)")
+        return macro
+
+    def _on_input(self, serial: str, kind: str, args: tuple):
+        if self._serial is not None and serial != self._serial:
+            return
+        now = time.monotonic()
+        with self._lock:
+            if self._started_at is None:
+                self._started_at = now
+            self._events.append(InputEvent(now - self._started_at, kind, args))
+
+
+class MacroPlayer:
+    """Replays macros on many devices in parallel with a shared timeline."""
+
+    def __init__(
+        self,
+        wrapper: ADBWrapper = adb,
+        batch_window: float = 0.3,
+        max_workers: int = 32,
+    ):
+        self.adb = wrapper
+        self.batch_window = batch_window
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="macro-replay"
+        )
+        # play_async() runs play() here so it never waits on its own pool
+        self._runner = ThreadPoolExecutor(
+            max_workers=1, thread_name_prefix="macro-runner"
+        )
+        self._stop_event = threading.Event()
+
+    def play(
+        self, macro: Macro, serials: List[str], speed: float = 1.0
+    ) -> Dict[str, bool]:
+        """Replays macro on every device; returns serial -> ran to completion.
+
+        Batches are scheduled against one start time shared by all devices,
+        and a batch that runs late does not delay the ones after it.
+        """
+        self._stop_event.clear()
+        batches = compile_macro(macro, self.batch_window)
+        logger.info(
+            f"Replaying {len(macro.events)} events as {len(batches)} commands "
+            f"on {len(serials)} device(s)"
+        )
+        # Leave time for every worker to pick up its device
+        start = time.monotonic() + 0.1
+        futures = {
+            serial: self._pool.submit(self._play_one, serial, batches, start, speed)
+            for serial in serials
+        }
+        return {serial: future.result() for serial, future in futures.items()}
+
+    def play_async(
+        self, macro: Macro, serials: List[str], speed: float = 1.0
+    ) -> Future:
+        """Runs play() in the background; failures are logged when it ends."""
+        future = self._runner.submit(self.play, macro, serials, speed)
+        future.add_done_callback(self._report)
+        return future
+
+    @staticmethod
+    def _report(future: Future):
+        if future.cancelled():
+            return
+        error = future.exception()
+        if error is not None:
+            logger.error(f"Macro replay failed: {error}")
+            return
+        stopped = [serial for serial, done in future.result().items() if not done]
+        if stopped:
+            logger.warning(f"Macro replay stopped early on {', '.join(stopped)}")
+
+    def stop(self):
+        """Stops running replays after their current batch."""
+        self._stop_event.set()
+
+    def _play_one(
+        self, serial: str, batches: List[MacroBatch], start: float, speed: float
+    ) -> bool:
+        for batch in batches:
+            delay = start + batch.time / speed - time.monotonic()
+            if delay > 0 and self._stop_event.wait(delay):
+                return False
+            if self._stop_event.is_set():
+                return False
+            self.adb.shell_command(serial, batch.command)
+        return True
+
+
+macro_player = MacroPlayer()
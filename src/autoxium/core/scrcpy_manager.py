@@ -1,13 +1,77 @@
+import atexit
 import subprocess
 import os
+import threading
+import time
+from collections import deque
+from dataclasses import dataclass, field
+from typing import Deque, Dict, List, Optional
+import psutil
+from PyQt6.QtCore import QObject, pyqtSignal
 from autoxium.utils.config import config
 from autoxium.utils.logger import logger
 
 
-class ScrcpyManager:
+@dataclass
+class ScrcpySession:
+    serial: str
+    process: subprocess.Popen
+    window_title: Optional[str]
+    options: tuple  # (max_size, bit_rate, max_fps) the process was started with
+    started_at: float = field(default_factory=time.monotonic)
+    # Set by the output reader
+    ready_at: Optional[float] = None  # When the first frame was shown
+    error: str = ""  # Last ERROR line printed by scrcpy
+    output: Deque[str] = field(default_factory=lambda: deque(maxlen=50))
+    stopping: bool = False
+    # Last sample() results
+    cpu_percent: float = 0.0
+    rss: int = 0  # Bytes
+    _ps: Optional[psutil.Process] = None
+
+    @property
+    def pid(self) -> int:
+        return self.process.pid
+
+    @property
+    def uptime(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def time_to_first_frame(self) -> Optional[float]:
+        return None if self.ready_at is None else self.ready_at - self.started_at
+
+    def is_running(self) -> bool:
+        return self.process.poll() is None
+
+
+# scrcpy logs the texture size once the first frame is on screen
+READY_MARKER = "Texture:"
+
+
+class ScrcpyManager(QObject):
+    """Starts scrcpy processes and keeps track of them, one per device.
+
+    Sessions are reused while they run with the same options, restarted
+    otherwise, stopped when their mirror window closes and at exit, and
+    capped at config.scrcpy_max_sessions.
+
+    Each process's output is read on a background thread: session_ready
+    is emitted when the first frame is displayed, session_failed when the
+    process exits on its own.
+    """
+
+    session_ready = pyqtSignal(object)  # Emits ScrcpySession
+    session_failed = pyqtSignal(object, str)  # Emits ScrcpySession, error message
+
     def __init__(self):
+        super().__init__()
         self.scrcpy_path = str(config.scrcpy_path)
+        self.max_sessions = config.scrcpy_max_sessions
+        self._sessions: Dict[str, ScrcpySession] = {}
+        self._lock = threading.RLock()
         self._ensure_scrcpy_exists()
+        atexit.register(self.stop_all)
 
     def _ensure_scrcpy_exists(self):
         if not os.path.exists(self.scrcpy_path):
@@ -31,9 +95,46 @@ class ScrcpyManager:
         window_title: str = None,
         max_size: int = 800,  # Balanced for stability
         bit_rate: int = 4000000,  # 4Mbps
-    ):
-        """Starts scrcpy for a specific device in a non-blocking subprocess."""
+        max_fps: int = 90,
+        restart: bool = False,
+    ) -> Optional[ScrcpySession]:
+        """Starts scrcpy for a specific device in a non-blocking subprocess.
+
+        Returns the running session for serial as is if it was started with
+        the same options (and restart is False); a session with different
+        options is stopped first. Returns None if the process could not be
+        started or max_sessions are already running.
+        """
+        options = (max_size, bit_rate, max_fps)
+        with self._lock:
+            self._prune()
+            session = self._sessions.get(serial)
+            if session is not None:
+                if session.options == options and not restart:
+                    logger.info(f"Reusing scrcpy for {serial} (pid {session.pid})")
+                    return session
+                self.stop_scrcpy(serial)
+
+            if len(self._sessions) >= self.max_sessions:
+                logger.error(
+                    f"Not starting scrcpy for {serial}: "
+                    f"{len(self._sessions)}/{self.max_sessions} sessions running"
+                )
+                return None
+
+            session = self._launch(serial, window_title, *options)
+            if session is not None:
+                self._sessions[serial] = session
+            return session
 
+    def _launch(
+        self,
+        serial: str,
+        window_title: Optional[str],
+        max_size: int,
+        bit_rate: int,
+        max_fps: int,
+    ) -> Optional[ScrcpySession]:
         # Don't kill all scrcpy - allow multiple devices simultaneously
         # self._kill_existing_scrcpy(serial)
 
@@ -46,7 +147,7 @@ class ScrcpyManager:
             "--video-bit-rate",
             str(bit_rate),
             "--video-codec=h264",  # Force H264 for compatibility
-            "--max-fps=90",  # Limit FPS
+            f"--max-fps={max_fps}",  # Limit FPS
             "--no-audio",  # Disable audio to reduce load
         ]
 
@@ -55,14 +156,115 @@ class ScrcpyManager:
 
         try:
             # Popen ensures it runs in background/separate process
-            subprocess.Popen(cmd)
+            process = subprocess.Popen(
+                cmd,
+                stdout=subprocess.PIPE,
+                stderr=subprocess.STDOUT,
+                text=True,
+                errors="replace",
+                bufsize=1,
+            )
             logger.info(
-                f"Scrcpy started for device {serial} (max_size={max_size}, bitrate={bit_rate}, h264, no-audio)"
+                f"Scrcpy started for device {serial} (pid {process.pid}, max_size={max_size}, bitrate={bit_rate}, fps={max_fps}, h264, no-audio)"
+            )
+            session = ScrcpySession(
+                serial, process, window_title, (max_size, bit_rate, max_fps)
             )
+            threading.Thread(
+                target=self._read_output,
+                args=(session,),
+                name=f"scrcpy-{serial}",
+                daemon=True,
+            ).start()
+            return session
         except FileNotFoundError:
             logger.error(f"Scrcpy binary not found at {self.scrcpy_path}")
         except Exception as e:
             logger.error(f"Failed to start scrcpy: {e}")
+        return None
+
+    def _read_output(self, session: ScrcpySession):
+        """Follows the process output until it exits."""
+        for line in session.process.stdout:
+            line = line.rstrip()
+            if not line:
+                continue
+            session.output.append(line)
+            logger.debug(f"scrcpy[{session.serial}]: {line}")
+            if "ERROR" in line:
+                session.error = line
+            if session.ready_at is None and READY_MARKER in line:
+                session.ready_at = time.monotonic()
+                logger.info(
+                    f"Scrcpy for {session.serial} showed its first frame "
+                    f"after {session.time_to_first_frame:.2f}s"
+                )
+                self.session_ready.emit(session)
+
+        code = session.process.wait()
+        if session.stopping:
+            return
+        message = session.error or f"scrcpy exited with code {code}"
+        logger.error(f"Scrcpy for {session.serial} failed: {message}")
+        self.session_failed.emit(session, message)
+
+    def stop_scrcpy(self, serial: str, timeout: float = 3.0):
+        """Terminates the scrcpy process of serial, killing it if it hangs."""
+        with self._lock:
+            session = self._sessions.pop(serial, None)
+        if session is None:
+            return
+        session.stopping = True
+        if not session.is_running():
+            return
+        session.process.terminate()
+        try:
+            session.process.wait(timeout)
+        except subprocess.TimeoutExpired:
+            session.process.kill()
+            session.process.wait()
+        logger.info(f"Scrcpy stopped for device {serial} (pid {session.pid})")
+
+    def stop_all(self):
+        with self._lock:
+            serials = list(self._sessions)
+        for serial in serials:
+            self.stop_scrcpy(serial)
+
+    def get_session(self, serial: str) -> Optional[ScrcpySession]:
+        with self._lock:
+            self._prune()
+            return self._sessions.get(serial)
+
+    def sessions(self) -> List[ScrcpySession]:
+        with self._lock:
+            self._prune()
+            return list(self._sessions.values())
+
+    def sample(self) -> List[ScrcpySession]:
+        """Updates cpu_percent and rss of every running session.
+
+        CPU is measured since the previous sample, so the first one is 0.
+        """
+        sessions = self.sessions()
+        for session in sessions:
+            try:
+                if session._ps is None:
+                    session._ps = psutil.Process(session.pid)
+                session.cpu_percent = session._ps.cpu_percent(None)
+                session.rss = session._ps.memory_info().rss
+            except psutil.Error:
+                session.cpu_percent, session.rss = 0.0, 0
+        return sessions
+
+    def _prune(self):
+        """Drops sessions whose process has exited (e.g. window closed)."""
+        for serial, session in list(self._sessions.items()):
+            if not session.is_running():
+                logger.info(
+                    f"Scrcpy for {serial} exited with code {session.process.returncode}"
+                )
+                del self._sessions[serial]
 
 
 scrcpy = ScrcpyManager()
@@ -0,0 +1,169 @@
+"""
+In-memory screenshots via `exec:screencap`.
+
+In raw mode the device dumps its framebuffer without PNG-encoding it, and
+decoding/encoding happens on the host in a worker pool.
+"""
+
+import struct
+from concurrent.futures import Future, ThreadPoolExecutor
+from dataclasses import dataclass
+from typing import Optional
+from PyQt6.QtCore import QBuffer, QByteArray, QIODevice
+from PyQt6.QtGui import QImage
+from autoxium.core.adb_client import AdbClient, adb_client
+from autoxium.utils.config import config
+
+try:
+    import numpy as np
+except ImportError:  # NumPy output is optional
+    np = None
+
+# screencap pixel formats (android.graphics.PixelFormat) -> (bytes/pixel, QImage format)
+PIXEL_FORMATS = {
+    1: (4, QImage.Format.Format_RGBA8888),  # RGBA_8888
+    2: (4, QImage.Format.Format_RGBX8888),  # RGBX_8888
+    3: (3, QImage.Format.Format_RGB888),  # RGB_888
+    4: (2, QImage.Format.Format_RGB16),  # RGB_565
+    # BGRA_8888: B, G, R, A bytes are a little-endian ARGB32 word
+    5: (4, QImage.Format.Format_ARGB32),
+}
+
+ENCODINGS = {"png": "PNG", "jpeg": "JPEG", "jpg": "JPEG", "webp": "WEBP"}
+
+
+@dataclass
+class RawFrame:
+    width: int
+    height: int
+    pixel_format: int
+    pixels: memoryview
+
+    @property
+    def bytes_per_pixel(self) -> int:
+        return PIXEL_FORMATS[self.pixel_format][0]
+
+
+def parse_raw_screencap(data: bytes) -> RawFrame:
+    """Parses `screencap` output without -p.
+
+    The header is width, height, format (12 bytes), followed by a color space
+    word on Android 9+ (16 bytes).
+    """
+    if len(data) < 12:
+        raise ValueError("Screencap output too short")
+    width, height, pixel_format = struct.unpack_from("<III", data)
+    if pixel_format not in PIXEL_FORMATS:
+        raise ValueError(f"Unsupported screencap pixel format {pixel_format}")
+    size = width * height * PIXEL_FORMATS[pixel_format][0]
+    header = len(data) - size
+    if header not in (12, 16):
+        raise ValueError(f"Unexpected screencap size {len(data)} for {width}x{height}")
+    return RawFrame(width, height, pixel_format, memoryview(data)[header:])
+
+
+def frame_to_qimage(frame: RawFrame) -> QImage:
+    bpp, image_format = PIXEL_FORMATS[frame.pixel_format]
+    image = QImage(
+        frame.pixels.tobytes(), frame.width, frame.height, frame.width * bpp, image_format
+    )
+    # Detach from the Python buffer
+    return image.copy()
+
+
+def frame_to_numpy(frame: RawFrame):
+    """Returns an (height, width, channels) uint8 array.
+
+    RGB_565 is unpacked to RGB and BGRA_8888 reordered to RGBA.
+    """
+    if np is None:
+        raise RuntimeError("NumPy is not installed")
+    if frame.pixel_format == 4:
+        image = frame_to_qimage(frame).convertToFormat(QImage.Format.Format_RGB888)
+        return qimage_to_numpy(image)
+    if frame.pixel_format == 5:
+        image = frame_to_qimage(frame).convertToFormat(QImage.Format.Format_RGBA8888)
+        return qimage_to_numpy(image)
+    return np.frombuffer(frame.pixels, dtype=np.uint8).reshape(
+        frame.height, frame.width, frame.bytes_per_pixel
+    )
+
+
+def qimage_to_numpy(image: QImage):
+    if np is None:
+        raise RuntimeError("NumPy is not installed")
+    if image.format() not in (QImage.Format.Format_RGB888, QImage.Format.Format_RGBA8888):
+        image = image.convertToFormat(QImage.Format.Format_RGBA8888)
+    channels = 3 if image.format() == QImage.Format.Format_RGB888 else 4
+    array = np.frombuffer(image.constBits().asstring(image.sizeInBytes()), np.uint8)
+    # Rows may be padded to 4 bytes
+    array = array.reshape(image.height(), image.bytesPerLine())
+    return array[:, : image.width() * channels].reshape(
+        image.height(), image.width(), channels
+    ).copy()
+
+
+def encode_image(image: QImage, encoding: str = "png", quality: int = -1) -> bytes:
+    """Encodes a QImage to PNG, JPEG or WebP bytes."""
+    image_format = ENCODINGS.get(encoding.lower())
+    if image_format is None:
+        raise ValueError(f"Unsupported encoding: {encoding}")
+    data = QByteArray()
+    buffer = QBuffer(data)
+    buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+    if not image.save(buffer, image_format, quality):
+        raise RuntimeError(f"Failed to encode screenshot as {image_format}")
+    buffer.close()
+    return bytes(data)
+
+
+class ScreenCapture:
+    def __init__(self, client: AdbClient = adb_client, max_workers: int = 4):
+        self.client = client
+        self._pool = ThreadPoolExecutor(
+            max_workers=max_workers, thread_name_prefix="screen-capture"
+        )
+
+    def capture(
+        self,
+        serial: str,
+        output: str = "bytes",
+        raw: bool = True,
+        encoding: str = "png",
+        quality: int = -1,
+        timeout: Optional[float] = None,
+    ):
+        """Captures the screen of a device into memory.
+
+        output: "bytes" (encoded image), "qimage" or "numpy".
+        raw: fetch the raw framebuffer and decode/encode on the host instead
+        of having the device PNG-encode it.
+        encoding/quality: image format of "bytes" output (png, jpeg, webp).
+        timeout: deadline for the transfer (config.command_timeout by default).
+        """
+        timeout = timeout or config.command_timeout
+        if not raw:
+            data = self.client.exec_out(serial, "screencap -p", timeout)
+            if output == "bytes" and encoding.lower() == "png":
+                return data
+            image = QImage.fromData(data, "PNG")
+            if image.isNull():
+                raise RuntimeError(f"Invalid screenshot data from {serial}")
+        else:
+            frame = parse_raw_screencap(self.client.exec_out(serial, "screencap", timeout))
+            if output == "numpy":
+                return frame_to_numpy(frame)
+            image = frame_to_qimage(frame)
+
+        if output == "qimage":
+            return image
+        if output == "numpy":
+            return qimage_to_numpy(image)
+        return encode_image(image, encoding, quality)
+
+    def capture_async(self, serial: str, **kwargs) -> Future:
+        """Runs capture() in the worker pool and returns its Future."""
+        return self._pool.submit(self.capture, serial, **kwargs)
+
+
+screen_capture = ScreenCapture()
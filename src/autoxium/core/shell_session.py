@@ -0,0 +1,190 @@
+"""
+Persistent shell sessions over the ADB host protocol.
+
+A session keeps one `sh` process running on the device (through the `exec:`
+service, so there is no PTY echo) and frames each command with a unique
+sentinel line carrying its exit code. Sessions are pooled per serial and
+closed after sitting idle.
+"""
+
+import re
+import select
+import threading
+import time
+import uuid
+from typing import Dict, Iterable, List, Optional, Tuple
+from autoxium.core.adb_client import (
+    AdbClient,
+    AdbRequestSentError,
+    adb_client,
+    request_sent,
+)
+from autoxium.utils.logger import logger
+
+
+class ShellSession:
+    def __init__(self, serial: str, client: AdbClient = adb_client):
+        self.serial = serial
+        try:
+            self._sock = client.open_transport(serial, "exec:sh")
+        except AdbRequestSentError as e:
+            # Only the shell itself was being started, no command ran
+            raise ConnectionError(str(e)) from e
+        self._token = uuid.uuid4().hex[:12]
+        self._counter = 0
+        self._buffer = bytearray()
+        self.last_used = time.monotonic()
+        self.closed = False
+
+    def run(self, command: str, timeout: Optional[float] = 10.0) -> Tuple[int, str]:
+        """Runs a command and returns (exit_code, combined stdout/stderr)."""
+        if self.closed:
+            raise ConnectionError("Shell session is closed")
+        self._counter += 1
+        marker = f"__AXM_{self._token}_{self._counter}__".encode()
+        # Group the command so redirects apply to all of it, and keep it from
+        # swallowing the following framed commands through stdin
+        script = f"{{ {command}\n}} </dev/null 2>&1; printf '\\n%s %d\\n' {marker.decode()} $?\n"
+
+        deadline = None if timeout is None else time.monotonic() + timeout
+        try:
+            self._sock.settimeout(timeout)
+            with request_sent():
+                self._sock.sendall(script.encode("utf-8"))
+                pattern = re.compile(b"\n" + re.escape(marker) + rb" (\d+)\n")
+                while True:
+                    match = pattern.search(self._buffer)
+                    if match:
+                        break
+                    if deadline is not None:
+                        remaining = deadline - time.monotonic()
+                        if remaining <= 0:
+                            raise TimeoutError(f"Shell command timed out: {command}")
+                        self._sock.settimeout(remaining)
+                    chunk = self._sock.recv(65536)
+                    if not chunk:
+                        raise ConnectionError("Device closed the shell session")
+                    self._buffer.extend(chunk)
+        except OSError:  # Includes timeouts
+            # The stream is out of sync now; the session cannot be reused
+            self.close()
+            raise
+
+        output = bytes(self._buffer[: match.start()])
+        exit_code = int(match.group(1))
+        del self._buffer[: match.end()]
+        self.last_used = time.monotonic()
+        text = output.decode("utf-8", "replace").replace("\r\n", "\n").strip()
+        return exit_code, text
+
+    def is_alive(self) -> bool:
+        """False once the session is closed or the device hung up on it.
+
+        An idle session has nothing to read, so a readable socket means the
+        other end is gone.
+        """
+        if not self.closed:
+            readable, _, _ = select.select([self._sock], [], [], 0)
+            if readable:
+                self.close()
+        return not self.closed
+
+    def close(self):
+        if not self.closed:
+            self.closed = True
+            try:
+                self._sock.close()
+            except OSError:
+                pass
+
+
+class ShellSessionPool:
+    """Reuses shell sessions per serial; idle sessions expire."""
+
+    def __init__(self, idle_timeout: float = 60.0, client: AdbClient = adb_client):
+        self.idle_timeout = idle_timeout
+        self.client = client
+        self._idle: Dict[str, List[ShellSession]] = {}
+        self._lock = threading.Lock()
+        self._reaper: Optional[threading.Thread] = None
+
+    def run(
+        self, serial: str, command: str, timeout: Optional[float] = 10.0
+    ) -> Tuple[int, str]:
+        session = self._acquire(serial)
+        result = session.run(command, timeout)
+        self._release(session)
+        return result
+
+    def _acquire(self, serial: str) -> ShellSession:
+        with self._lock:
+            sessions = self._idle.get(serial)
+            while sessions:
+                session = sessions.pop()
+                # Catch hangups before a command is written to the session
+                if session.is_alive():
+                    return session
+        session = ShellSession(serial, self.client)
+        self._start_reaper()
+        return session
+
+    def _release(self, session: ShellSession):
+        with self._lock:
+            self._idle.setdefault(session.serial, []).append(session)
+
+    def _start_reaper(self):
+        with self._lock:
+            if self._reaper is None:
+                self._reaper = threading.Thread(
+                    target=self._reap_loop, name="shell-session-reaper", daemon=True
+                )
+                self._reaper.start()
+
+    def _reap_loop(self):
+        while True:
+            time.sleep(max(1.0, self.idle_timeout / 2))
+            self.expire_idle()
+
+    def expire_idle(self):
+        """Closes sessions that have been idle longer than idle_timeout."""
+        now = time.monotonic()
+        expired = []
+        with self._lock:
+            for serial, sessions in list(self._idle.items()):
+                keep = []
+                for session in sessions:
+                    if now - session.last_used > self.idle_timeout:
+                        expired.append(session)
+                    else:
+                        keep.append(session)
+                if keep:
+                    self._idle[serial] = keep
+                else:
+                    del self._idle[serial]
+        for session in expired:
+            session.close()
+        if expired:
+            logger.debug(f"Closed {len(expired)} idle shell session(s)")
+
+    def retain(self, serials: Iterable[str]):
+        """Closes sessions of devices not in serials (disconnected)."""
+        keep = set(serials)
+        with self._lock:
+            gone = [serial for serial in self._idle if serial not in keep]
+            sessions = [s for serial in gone for s in self._idle.pop(serial)]
+        for session in sessions:
+            session.close()
+
+    def close(self, serial: Optional[str] = None):
+        """Closes idle sessions of one device, or of every device."""
+        with self._lock:
+            if serial is None:
+                sessions = [s for group in self._idle.values() for s in group]
+                self._idle.clear()
+            else:
+                sessions = self._idle.pop(serial, [])
+        for session in sessions:
+            session.close()
+
+
+shell_sessions = ShellSessionPool()
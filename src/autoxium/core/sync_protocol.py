@@ -0,0 +1,264 @@
+"""
+Native implementation of the ADB file sync protocol (the `sync:` service).
+
+Pushes stream from a memory-mapped file or any Python buffer in 64 KiB DATA
+chunks, pulls yield chunks as they arrive, so memory use stays constant
+regardless of file size.
+"""
+
+import mmap
+import os
+import stat as stat_module
+import struct
+import time
+from dataclasses import dataclass, field
+from typing import Callable, Iterator, List, Optional, Union
+from autoxium.core.adb_client import (
+    AdbClient,
+    AdbProtocolError,
+    AdbRequestSentError,
+    adb_client,
+)
+
+SYNC_DATA_MAX = 64 * 1024
+DEFAULT_FILE_MODE = stat_module.S_IFREG | 0o644
+
+
+@dataclass
+class SyncStat:
+    mode: int
+    size: int
+    mtime: int
+
+    @property
+    def exists(self) -> bool:
+        return self.mode != 0
+
+    @property
+    def is_dir(self) -> bool:
+        return stat_module.S_ISDIR(self.mode)
+
+
+@dataclass
+class DirEntry:
+    name: str
+    mode: int
+    size: int
+    mtime: int
+
+
+@dataclass
+class TransferProgress:
+    serial: str
+    path: str
+    transferred: int
+    total: int  # -1 when unknown
+    started_at: float = field(default_factory=time.monotonic)
+
+    @property
+    def elapsed(self) -> float:
+        return time.monotonic() - self.started_at
+
+    @property
+    def throughput(self) -> float:
+        """Bytes per second since the transfer started."""
+        elapsed = self.elapsed
+        return self.transferred / elapsed if elapsed > 0 else 0.0
+
+
+ProgressCallback = Callable[[TransferProgress], None]
+
+
+class SyncConnection:
+    """A `sync:` session with one device. Use as a context manager."""
+
+    def __init__(self, serial: str, client: AdbClient = adb_client):
+        self.serial = serial
+        self._client = client
+        try:
+            self._sock = client.open_transport(serial, "sync:")
+        except AdbRequestSentError as e:
+            # Starting the sync service transfers nothing yet
+            raise ConnectionError(str(e)) from e
+        # End of the current transfer, see _start_deadline()
+        self._deadline: Optional[float] = None
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        self.close()
+
+    def close(self):
+        if self._sock is None:
+            return
+        try:
+            self._sock.sendall(b"QUIT" + struct.pack("<I", 0))
+        except OSError:
+            pass
+        self._sock.close()
+        self._sock = None
+
+    # --- Wire helpers ---
+
+    def _start_deadline(self, timeout: Optional[float]):
+        self._deadline = None if timeout is None else time.monotonic() + timeout
+
+    def _arm(self):
+        """Bounds the next socket operation by the transfer's deadline.
+
+        Raises TimeoutError once the deadline passed, however steadily data
+        is trickling in.
+        """
+        if self._deadline is None:
+            return
+        remaining = self._deadline - time.monotonic()
+        if remaining <= 0:
+            raise TimeoutError(f"Transfer with {self.serial} did not finish in time")
+        self._sock.settimeout(min(remaining, self._client.timeout))
+
+    def _send(self, request_id: bytes, data: bytes = b""):
+        self._arm()
+        self._sock.sendall(request_id + struct.pack("<I", len(data)) + data)
+
+    def _read_exact(self, size: int) -> bytes:
+        self._arm()
+        return self._client._read_exact(self._sock, size)
+
+    def _read_header(self):
+        header = self._read_exact(8)
+        return header[:4], struct.unpack("<I", header[4:])[0]
+
+    def _raise_fail(self, length: int):
+        message = self._read_exact(length).decode("utf-8", "replace")
+        raise AdbProtocolError(message)
+
+    # --- Requests ---
+
+    def stat(self, path: str) -> SyncStat:
+        self._send(b"STAT", path.encode("utf-8"))
+        response = self._read_exact(16)
+        if response[:4] != b"STAT":
+            raise AdbProtocolError(f"Unexpected sync response {response[:4]!r}")
+        return SyncStat(*struct.unpack("<III", response[4:]))
+
+    def list(self, path: str) -> List[DirEntry]:
+        self._send(b"LIST", path.encode("utf-8"))
+        entries = []
+        while True:
+            response = self._read_exact(20)
+            if response[:4] == b"DONE":
+                return entries
+            if response[:4] != b"DENT":
+                raise AdbProtocolError(f"Unexpected sync response {response[:4]!r}")
+            mode, size, mtime, name_length = struct.unpack("<IIII", response[4:])
+            name = self._read_exact(name_length).decode("utf-8", "replace")
+            if name not in (".", ".."):
+                entries.append(DirEntry(name, mode, size, mtime))
+
+    def push(
+        self,
+        source: Union[str, bytes, bytearray, memoryview],
+        remote_path: str,
+        mode: int = None,
+        mtime: int = None,
+        progress: Optional[ProgressCallback] = None,
+        timeout: Optional[float] = None,
+    ):
+        """Sends a local file path or an in-memory buffer to remote_path.
+
+        timeout: limit for the whole transfer, in seconds.
+        """
+        self._start_deadline(timeout)
+        try:
+            self._push(source, remote_path, mode, mtime, progress)
+        finally:
+            self._deadline = None
+
+    def _push(self, source, remote_path, mode, mtime, progress):
+        if isinstance(source, str):
+            st = os.stat(source)
+            mode = mode or st.st_mode
+            mtime = mtime or int(st.st_mtime)
+            with open(source, "rb") as f:
+                if st.st_size == 0:  # Empty files cannot be memory-mapped
+                    self._send_buffer(memoryview(b""), remote_path, mode, mtime, progress)
+                    return
+                with mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+                    view = memoryview(mapped)
+                    try:
+                        self._send_buffer(view, remote_path, mode, mtime, progress)
+                    finally:
+                        view.release()
+        else:
+            self._send_buffer(memoryview(source).cast("B"), remote_path, mode, mtime, progress)
+
+    def _send_buffer(self, view, remote_path, mode, mtime, progress):
+        mode = mode or DEFAULT_FILE_MODE
+        mtime = int(time.time()) if mtime is None else mtime
+        self._send(b"SEND", f"{remote_path},{mode}".encode("utf-8"))
+
+        state = TransferProgress(self.serial, remote_path, 0, len(view))
+        for offset in range(0, len(view), SYNC_DATA_MAX):
+            chunk = view[offset : offset + SYNC_DATA_MAX]
+            self._arm()
+            self._sock.sendall(b"DATA" + struct.pack("<I", len(chunk)))
+            self._sock.sendall(chunk)
+            state.transferred += len(chunk)
+            if progress:
+                progress(state)
+
+        self._arm()
+        self._sock.sendall(b"DONE" + struct.pack("<I", mtime))
+        response_id, length = self._read_header()
+        if response_id == b"FAIL":
+            self._raise_fail(length)
+        if response_id != b"OKAY":
+            raise AdbProtocolError(f"Unexpected sync response {response_id!r}")
+
+    def pull(
+        self,
+        remote_path: str,
+        progress: Optional[ProgressCallback] = None,
+        timeout: Optional[float] = None,
+    ) -> Iterator[bytes]:
+        """Yields the remote file's contents chunk by chunk.
+
+        The generator must be consumed fully before issuing another request
+        on this connection. timeout limits the whole transfer, in seconds.
+        """
+        self._start_deadline(timeout)
+        try:
+            total = self.stat(remote_path).size if progress else -1
+            self._send(b"RECV", remote_path.encode("utf-8"))
+            state = TransferProgress(self.serial, remote_path, 0, total)
+            while True:
+                response_id, length = self._read_header()
+                if response_id == b"DONE":
+                    return
+                if response_id == b"FAIL":
+                    self._raise_fail(length)
+                if response_id != b"DATA":
+                    raise AdbProtocolError(f"Unexpected sync response {response_id!r}")
+                chunk = self._read_exact(length)
+                state.transferred += length
+                if progress:
+                    progress(state)
+                yield chunk
+        finally:
+            self._deadline = None
+
+    def pull_to_file(
+        self,
+        remote_path: str,
+        local_path: str,
+        progress: Optional[ProgressCallback] = None,
+        timeout: Optional[float] = None,
+    ) -> int:
+        """Pulls remote_path into local_path; returns the number of bytes."""
+        size = 0
+        with open(local_path, "wb") as f:
+            for chunk in self.pull(remote_path, progress, timeout):
+                f.write(chunk)
+                size += len(chunk)
+        return size
@@ -0,0 +1,139 @@
+"""
+Live thumbnails for many devices without one scrcpy window each.
+
+Every device streams `screenrecord --output-format=h264` at thumbnail size
+and a low bitrate over an `exec:` transport. A worker process per device
+decodes the stream with PyAV, drops frames above max_fps and hands RGB
+frames to the UI process through a bounded queue. The device does the
+downscaling in its hardware encoder, so each worker only decodes a few
+hundred pixels a side.
+
+PyAV is optional; without it the wall is unavailable. The decoding
+processes run autoxium.core.wall_stream.
+"""
+
+import multiprocessing
+import queue
+import time
+from dataclasses import dataclass
+from typing import Dict, List, Optional, Tuple
+from autoxium.core.wall_stream import av, decode_stream, stream_worker
+from autoxium.utils.config import config
+from autoxium.utils.logger import logger
+
+
+@dataclass
+class Thumbnail:
+    serial: str
+    width: int
+    height: int
+    stride: int  # Bytes per row
+    data: bytes  # RGB888
+    timestamp: float
+
+
+def is_available() -> bool:
+    return av is not None
+
+
+def thumbnail_size(resolution: str, max_side: int) -> Tuple[int, int]:
+    """Scales a "WxH" resolution so its longest side is max_side.
+
+    Both sides are rounded down to multiples of 16, which every hardware
+    encoder accepts. Unknown resolutions assume a 9:20 portrait screen.
+    """
+    try:
+        width, height = (int(v) for v in resolution.split("x"))
+    except ValueError:
+        width, height = 9, 20
+    scale = max_side / max(width, height)
+    return (
+        max(16, int(width * scale) // 16 * 16),
+        max(16, int(height * scale) // 16 * 16),
+    )
+
+
+class VideoWall:
+    """Owns one decoding process per streamed device."""
+
+    def __init__(
+        self,
+        max_side: int = 320,
+        max_fps: float = 5.0,
+        bit_rate: int = 600_000,
+        queue_size: int = 64,
+    ):
+        self.max_side = max_side
+        self.max_fps = max_fps
+        self.bit_rate = bit_rate
+        self.queue_size = queue_size
+        # spawn works the same on Windows and POSIX and doesn't fork Qt
+        self._context = multiprocessing.get_context("spawn")
+        # Created by the first start(), so importing this module is free
+        self._frames: Optional[multiprocessing.Queue] = None
+        self._workers: Dict[str, Tuple[multiprocessing.Process, object]] = {}
+
+    def start(self, serial: str, resolution: str = ""):
+        if serial in self._workers:
+            return
+        if av is None:
+            raise RuntimeError("PyAV is not installed")
+        size = thumbnail_size(resolution, self.max_side)
+        if self._frames is None:
+            self._frames = self._context.Queue(self.queue_size)
+        stop = self._context.Event()
+        process = self._context.Process(
+            target=stream_worker,
+            args=(
+                serial,
+                size,
+                self.bit_rate,
+                self.max_fps,
+                config.adb_server_host,
+                config.adb_server_port,
+                self._frames,
+                stop,
+            ),
+            name=f"wall-{serial}",
+            daemon=True,
+        )
+        process.start()
+        self._workers[serial] = (process, stop)
+        logger.info(f"Wall streaming {serial} at {size[0]}x{size[1]}")
+
+    def stop(self, serial: str, timeout: float = 2.0):
+        worker = self._workers.pop(serial, None)
+        if worker is None:
+            return
+        process, stop = worker
+        stop.set()
+        process.join(timeout)
+        if process.is_alive():
+            process.terminate()
+            process.join()
+
+    def stop_all(self):
+        for serial in list(self._workers):
+            self.stop(serial)
+
+    def streaming(self) -> List[str]:
+        return list(self._workers)
+
+    def poll(self) -> Dict[str, Thumbnail]:
+        """Drains the queue, returning the newest frame per device."""
+        latest: Dict[str, Thumbnail] = {}
+        if self._frames is None:
+            return latest
+        while True:
+            try:
+                serial, width, height, stride, data = self._frames.get_nowait()
+            except queue.Empty:
+                break
+            if serial in self._workers:
+                latest[serial] = Thumbnail(
+                    serial, width, height, stride, data, time.monotonic()
+                )
+        return latest
+
+
+video_wall = VideoWall()
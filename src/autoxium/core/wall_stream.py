@@ -0,0 +1,101 @@
+"""
+Decoder side of the device wall: the code run in each worker process.
+
+Worker processes are spawned, so they import this module afresh. It must
+stay free of import-time side effects: no log listener, no queues, no
+singletons beyond the plain config.
+"""
+
+import logging
+import queue
+import socket
+import time
+from typing import Iterable, Iterator, Tuple
+from autoxium.core.adb_client import AdbClient
+
+try:
+    import av
+except ImportError:  # The wall needs PyAV
+    av = None
+
+# screenrecord stops after 3 minutes; the worker restarts it, backing off
+# while the device or adb server is unreachable
+RESTART_DELAY = 1.0
+MAX_RESTART_DELAY = 30.0
+
+# The UI process's "autoxium" logger isn't set up in a worker; warnings
+# reach stderr through logging's last-resort handler
+_log = logging.getLogger("autoxium.wall")
+
+
+def decode_stream(
+    chunks: Iterable[bytes], max_fps: float = 10.0
+) -> Iterator[Tuple[int, int, int, bytes]]:
+    """Decodes an H.264 Annex B byte stream into (width, height, stride, rgb).
+
+    Frames arriving less than 1/max_fps after the last one returned are
+    decoded (later frames depend on them) but not converted.
+    """
+    if av is None:
+        raise RuntimeError("PyAV is not installed")
+    codec = av.CodecContext.create("h264", "r")
+    # One decoder thread per device keeps a wall of many devices fair
+    codec.thread_count = 1
+    interval = 1.0 / max_fps if max_fps > 0 else 0.0
+    last = float("-inf")
+
+    def frames():
+        for chunk in chunks:
+            for packet in codec.parse(chunk):
+                yield from codec.decode(packet)
+        # End of stream: flush the parser and the decoder
+        for packet in codec.parse(b""):
+            yield from codec.decode(packet)
+        yield from codec.decode(None)
+
+    for frame in frames():
+        now = time.monotonic()
+        if now - last < interval:
+            continue
+        last = now
+        rgb = frame.reformat(format="rgb24")
+        plane = rgb.planes[0]
+        yield rgb.width, rgb.height, plane.line_size, bytes(plane)
+
+
+def _socket_chunks(sock: socket.socket, stop) -> Iterator[bytes]:
+    while not stop.is_set():
+        try:
+            data = sock.recv(65536)
+        except socket.timeout:
+            continue
+        if not data:
+            return
+        yield data
+
+
+def stream_worker(serial, size, bit_rate, max_fps, host, port, frames, stop):
+    """Process entry point: streams and decodes one device until stopped."""
+    client = AdbClient(host, port)
+    command = (
+        f"exec:screenrecord --output-format=h264 --size {size[0]}x{size[1]} "
+        f"--bit-rate {bit_rate} -"
+    )
+    delay = RESTART_DELAY
+    while not stop.is_set():
+        try:
+            sock = client.open_transport(serial, command)
+            with sock:
+                sock.settimeout(0.5)
+                for width, height, stride, data in decode_stream(
+                    _socket_chunks(sock, stop), max_fps
+                ):
+                    delay = RESTART_DELAY
+                    try:
+                        frames.put_nowait((serial, width, height, stride, data))
+                    except queue.Full:
+                        pass  # The UI is behind; drop the frame
+        except Exception as e:
+            _log.warning(f"Wall stream for {serial} interrupted: {e}")
+            delay = min(delay * 2, MAX_RESTART_DELAY)
+        stop.wait(delay)
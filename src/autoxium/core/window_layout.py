@@ -0,0 +1,160 @@
+"""
+Packs mirror windows of mixed aspect ratios onto one or more screens.
+
+Windows keep their order and are laid out in rows ("justified" layout):
+every window in a row has the same content height, so a row of portrait
+phones next to a landscape tablet lines up, and the height is the largest
+one at which all rows still fit the screen. Rows that end short are then
+grown to fill the screen width, sharing whatever height is left over.
+
+Everything is integer pixels and depends only on the inputs, so the same
+windows on the same screens always land in the same place.
+"""
+
+from typing import List, NamedTuple, Optional, Sequence
+
+DEFAULT_ASPECT = 9 / 20  # Used for windows that don't know their device yet
+
+
+class Rect(NamedTuple):
+    x: int
+    y: int
+    width: int
+    height: int
+
+
+class Tile(NamedTuple):
+    """A window to place: content aspect (width / height) plus fixed chrome."""
+
+    aspect: float
+    extra_width: int = 0  # e.g. the mirror sidebar, which doesn't scale
+
+
+def _rows(
+    tiles: Sequence[Tile], height: int, width: int, max_per_row: int, spacing: int
+) -> Optional[List[List[int]]]:
+    """Greedily breaks tiles into rows at a content height.
+
+    Returns None if a single tile is wider than the screen.
+    """
+    rows: List[List[int]] = []
+    row: List[int] = []
+    used = 0
+    for index, tile in enumerate(tiles):
+        tile_width = int(tile.aspect * height) + tile.extra_width
+        if tile_width > width:
+            return None
+        needed = tile_width if not row else used + spacing + tile_width
+        if row and (needed > width or len(row) >= max_per_row):
+            rows.append(row)
+            row, needed = [], tile_width
+        row.append(index)
+        used = needed
+    if row:
+        rows.append(row)
+    return rows
+
+
+def _pack_screen(
+    tiles: Sequence[Tile], screen: Rect, max_per_row: int, spacing: int
+) -> List[Rect]:
+    if not tiles:
+        return []
+
+    def fits(height: int) -> Optional[List[List[int]]]:
+        rows = _rows(tiles, height, screen.width, max_per_row, spacing)
+        if rows is None:
+            return None
+        if len(rows) * height + (len(rows) - 1) * spacing > screen.height:
+            return None
+        return rows
+
+    # A taller row never needs fewer rows, so the fit is monotonic in height
+    low, high = 1, max(1, screen.height)
+    rows = fits(low) or [[i] for i in range(len(tiles))]
+    while low < high:
+        middle = (low + high + 1) // 2
+        candidate = fits(middle)
+        if candidate is None:
+            high = middle - 1
+        else:
+            low, rows = middle, candidate
+    base = low
+
+    # Height at which each row exactly fills the screen width
+    targets = []
+    for row in rows:
+        aspect = sum(tiles[i].aspect for i in row)
+        fixed = sum(tiles[i].extra_width for i in row) + spacing * (len(row) - 1)
+        fill = int((screen.width - fixed) / aspect) if aspect > 0 else base
+        targets.append(max(base, fill))
+
+    # Grow rows towards their fill height, capped at a common height that
+    # keeps the whole layout on screen
+    available = screen.height - spacing * (len(rows) - 1)
+    low, high = base, max(targets)
+    while low < high:
+        middle = (low + high + 1) // 2
+        if sum(min(t, middle) for t in targets) <= available:
+            low = middle
+        else:
+            high = middle - 1
+    heights = [min(t, low) for t in targets]
+
+    placed: List[Rect] = [None] * len(tiles)
+    total_height = sum(heights) + spacing * (len(rows) - 1)
+    y = screen.y + (screen.height - total_height) // 2
+    for row, height in zip(rows, heights):
+        widths = [int(tiles[i].aspect * height) + tiles[i].extra_width for i in row]
+        row_width = sum(widths) + spacing * (len(row) - 1)
+        x = screen.x + (screen.width - row_width) // 2
+        for index, width in zip(row, widths):
+            placed[index] = Rect(x, y, width, height)
+            x += width + spacing
+        y += height + spacing
+    return placed
+
+
+def _split(count: int, screens: Sequence[Rect]) -> List[int]:
+    """Shares count windows between screens in proportion to their area."""
+    areas = [max(0, s.width) * max(0, s.height) for s in screens]
+    total = sum(areas) or 1
+    shares = [count * a / total for a in areas]
+    counts = [int(s) for s in shares]
+    # Largest remainder; ties go to the earlier screen
+    order = sorted(range(len(screens)), key=lambda i: (counts[i] - shares[i], i))
+    for i in order[: count - sum(counts)]:
+        counts[i] += 1
+    return counts
+
+
+def pack_windows(
+    tiles: Sequence[Tile],
+    screens: Sequence[Rect],
+    max_per_row: int = 0,
+    spacing: int = 0,
+) -> List[Rect]:
+    """Returns one window geometry per tile, in tile order.
+
+    Screens are filled left to right (then top to bottom), each taking a
+    share of the windows proportional to its area. max_per_row of 0 lets
+    the layout pick the number of windows per row.
+    """
+    if not tiles:
+        return []
+    if not screens:
+        raise ValueError("No screens to arrange windows on")
+    tiles = [
+        t if t.aspect > 0 else Tile(DEFAULT_ASPECT, t.extra_width) for t in tiles
+    ]
+    screens = sorted(screens, key=lambda s: (s.x, s.y))
+    limit = max_per_row if max_per_row > 0 else len(tiles)
+
+    placed: List[Rect] = []
+    start = 0
+    for screen, count in zip(screens, _split(len(tiles), screens)):
+        placed.extend(
+            _pack_screen(tiles[start : start + count], screen, limit, spacing)
+        )
+        start += count
+    return placed
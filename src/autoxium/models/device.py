@@ -1,4 +1,5 @@
-from dataclasses import dataclass
+from dataclasses import dataclass, field, fields
+from typing import Dict, List, Tuple
 
 
 @dataclass
@@ -10,3 +11,43 @@ class Device:
     device_name: str = ""
     android_version: str = ""
     resolution: str = ""
+    # True while properties are still being read in the background
+    enriching: bool = False
+
+
+@dataclass
+class DeviceChange:
+    device: Device  # The new state
+    fields: Tuple[str, ...]  # Names of the Device fields that changed
+
+
+@dataclass
+class DeviceChangeSet:
+    """Difference between two device snapshots."""
+
+    added: List[Device] = field(default_factory=list)
+    removed: List[str] = field(default_factory=list)  # Serials
+    changed: List[DeviceChange] = field(default_factory=list)
+
+    def __bool__(self):
+        return bool(self.added or self.removed or self.changed)
+
+    @classmethod
+    def between(
+        cls, previous: Dict[str, Device], current: Dict[str, Device]
+    ) -> "DeviceChangeSet":
+        """Diffs two {serial: Device} snapshots; added keeps current's order."""
+        changes = cls()
+        for serial, device in current.items():
+            old = previous.get(serial)
+            if old is None:
+                changes.added.append(device)
+            elif old != device:
+                changed_fields = tuple(
+                    f.name
+                    for f in fields(Device)
+                    if getattr(old, f.name) != getattr(device, f.name)
+                )
+                changes.changed.append(DeviceChange(device, changed_fields))
+        changes.removed = [serial for serial in previous if serial not in current]
+        return changes
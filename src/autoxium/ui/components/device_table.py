@@ -1,17 +1,230 @@
 from PyQt6.QtWidgets import (
-    QTableWidget,
-    QTableWidgetItem,
+    QTableView,
     QHeaderView,
     QAbstractItemView,
+    QStyledItemDelegate,
 )
-from PyQt6.QtCore import Qt, pyqtSignal
-from PyQt6.QtGui import QColor, QBrush
-from autoxium.models.device import Device
+from PyQt6.QtCore import (
+    Qt,
+    QAbstractTableModel,
+    QModelIndex,
+    QSortFilterProxyModel,
+    pyqtSignal,
+)
+from PyQt6.QtGui import QColor, QPalette
+from autoxium.models.device import Device, DeviceChangeSet
 from autoxium.ui.style import theme_manager
-from typing import List
+from typing import Dict, List, Optional
+
+# Columns: No, Serial Number, Product Name, Model Name, Android Version, Resolution, Status
+HEADERS = [
+    "No",
+    "Serial Number",
+    "Product Name",
+    "Model Name",
+    "Android Version",
+    "Resolution",
+    "Status",
+]
+STATUS_COLUMN = 6
+# Column 0 sorts by connection order, the rest case-insensitively
+SORT_ROLE = Qt.ItemDataRole.UserRole + 1
+
+ONLINE_COLOR = QColor("#4caf50")  # Green
+OFFLINE_COLOR = QColor("#f44336")  # Red
+
+
+def device_row(device: Device) -> tuple:
+    """Display values of a device for columns 1..6 ("No" is the view's row)."""
+    status_text = device.status
+    if device.enriching:
+        status_text += " (loading...)"
+    return (
+        device.serial,
+        device.product,  # Marketing name like "Galaxy A72", "Pixel 7"
+        device.model,  # Model number like "SM-A725F/DS"
+        device.android_version,
+        device.resolution,
+        status_text,
+    )
+
+
+def search_text(device: Device) -> str:
+    """Lowercase haystack matched by the filter box."""
+    return "\0".join(
+        (device.serial, device.product, device.model, device.android_version)
+    ).lower()
+
+
+class DeviceTableModel(QAbstractTableModel):
+    """Device rows keyed by serial.
+
+    apply_changes() turns a DeviceChangeSet into row removes/inserts and
+    per-cell dataChanged, so views keep their selection and only repaint
+    what changed. update_devices() diffs a full list into a change set.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.devices: List[Device] = []
+        self._rows: List[tuple] = []
+        # Precomputed search_text() per row, kept in step with devices
+        self.search_index: List[str] = []
+        self._row_of: Dict[str, int] = {}
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.devices)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (
+            orientation == Qt.Orientation.Horizontal
+            and role == Qt.ItemDataRole.DisplayRole
+        ):
+            return HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        row, column = index.row(), index.column()
+        if role == Qt.ItemDataRole.DisplayRole:
+            # "No" is numbered by DeviceFilterProxyModel in display order
+            return None if column == 0 else self._rows[row][column - 1]
+        if role == Qt.ItemDataRole.UserRole:
+            return self.devices[row]
+        if role == SORT_ROLE:
+            return row if column == 0 else self._rows[row][column - 1].lower()
+        return None
+
+    def device_at(self, row: int) -> Optional[Device]:
+        return self.devices[row] if 0 <= row < len(self.devices) else None
+
+    def update_devices(self, devices: List[Device]):
+        """Applies the difference between the current rows and devices."""
+        current = {device.serial: device for device in self.devices}
+        incoming = {device.serial: device for device in devices}
+        self.apply_changes(DeviceChangeSet.between(current, incoming))
+
+    def apply_changes(self, changes: DeviceChangeSet):
+        """Applies a change set with one row operation per change, or per
+        run of adjacent removed rows.
+
+        Existing rows keep their position, new devices are appended in the
+        order given. Removals shift the rows below them up.
+        """
+        if changes.removed:
+            self._remove(changes.removed)
+
+        for change in changes.changed:
+            row = self._row_of.get(change.device.serial)
+            if row is None:
+                continue
+            values = device_row(change.device)
+            changed = [
+                column
+                for column, (old, new) in enumerate(zip(self._rows[row], values), 1)
+                if old != new
+            ]
+            self.devices[row] = change.device
+            self._rows[row] = values
+            self.search_index[row] = search_text(change.device)
+            if changed:
+                self.dataChanged.emit(
+                    self.index(row, changed[0]),
+                    self.index(row, changed[-1]),
+                    [Qt.ItemDataRole.DisplayRole, Qt.ItemDataRole.UserRole],
+                )
+
+        added = [
+            device for device in changes.added if device.serial not in self._row_of
+        ]
+        if added:
+            first = len(self.devices)
+            self.beginInsertRows(QModelIndex(), first, first + len(added) - 1)
+            self.devices.extend(added)
+            self._rows.extend(device_row(device) for device in added)
+            self.search_index.extend(search_text(device) for device in added)
+            for row, device in enumerate(added, first):
+                self._row_of[device.serial] = row
+            self.endInsertRows()
+
+    def _remove(self, serials: List[str]):
+        rows = sorted(
+            self._row_of.pop(serial) for serial in serials if serial in self._row_of
+        )
+        if not rows:
+            return
+        # Adjacent rows go in one removal, bottom-up so row numbers stay valid
+        runs = []
+        for row in rows:
+            if runs and runs[-1][1] == row - 1:
+                runs[-1][1] = row
+            else:
+                runs.append([row, row])
+        for first, last in reversed(runs):
+            self.beginRemoveRows(QModelIndex(), first, last)
+            del self.devices[first : last + 1]
+            del self._rows[first : last + 1]
+            del self.search_index[first : last + 1]
+            self.endRemoveRows()
+        # Only rows below the first removal moved
+        for row in range(rows[0], len(self.devices)):
+            self._row_of[self.devices[row].serial] = row
 
 
-class DeviceTable(QTableWidget):
+class DeviceFilterProxyModel(QSortFilterProxyModel):
+    """Sorts the device model and filters it by a substring of serial,
+    product, model or Android version.
+
+    Matching uses the source model's precomputed lowercase search index, so
+    a keystroke costs one substring test per row and no data() calls. The
+    "No" column numbers the rows as shown, after sorting and filtering.
+    """
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self._needle = ""
+        self._index: List[str] = []
+        self.setSortRole(SORT_ROLE)
+        self.setDynamicSortFilter(True)
+
+    def set_filter_text(self, text: str):
+        needle = text.strip().lower()
+        if needle == self._needle:
+            return
+        self._needle = needle
+        self.invalidateRowsFilter()
+
+    def setSourceModel(self, model: DeviceTableModel):
+        # The list is updated in place, so one reference stays valid
+        self._index = model.search_index
+        super().setSourceModel(model)
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return not self._needle or self._needle in self._index[source_row]
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if index.column() == 0 and role == Qt.ItemDataRole.DisplayRole:
+            return str(index.row() + 1)
+        return super().data(index, role)
+
+
+class StatusDelegate(QStyledItemDelegate):
+    """Paints the Status column green when online and red otherwise."""
+
+    def initStyleOption(self, option, index):
+        super().initStyleOption(option, index)
+        device = index.data(Qt.ItemDataRole.UserRole)
+        if device is None:
+            return
+        color = ONLINE_COLOR if device.status == "Online" else OFFLINE_COLOR
+        option.palette.setColor(QPalette.ColorRole.Text, color)
+
+
+class DeviceTable(QTableView):
     # Signal emitted when a device is selected (single row)
     selection_changed = pyqtSignal(object)
     # Signal for context menu actions: (action_type, serial)
@@ -19,18 +232,11 @@ class DeviceTable(QTableWidget):
 
     def __init__(self):
         super().__init__()
-        # Columns: No, Serial Number, Product Name, Model Name, Android Version, Resolution, Status
-        headers = [
-            "No",
-            "Serial Number",
-            "Product Name",
-            "Model Name",
-            "Android Version",
-            "Resolution",
-            "Status",
-        ]
-        self.setColumnCount(len(headers))
-        self.setHorizontalHeaderLabels(headers)
+        self.device_model = DeviceTableModel(self)
+        self.proxy_model = DeviceFilterProxyModel(self)
+        self.proxy_model.setSourceModel(self.device_model)
+        self.setModel(self.proxy_model)
+        self.setItemDelegateForColumn(STATUS_COLUMN, StatusDelegate(self))
 
         # Configure Table Properties
         self.horizontalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Stretch)
@@ -38,6 +244,14 @@ class DeviceTable(QTableWidget):
         self.horizontalHeader().setSectionResizeMode(
             0, QHeaderView.ResizeMode.ResizeToContents
         )
+        # Size the "No" column from the visible rows, not all of them
+        self.horizontalHeader().setResizeContentsPrecision(0)
+        # Fixed row heights let the view lay out only the visible rows
+        self.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.setWordWrap(False)
+        # Start unsorted (connection order) until a header is clicked
+        self.horizontalHeader().setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
+        self.setSortingEnabled(True)
 
         self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
         self.setSelectionMode(QAbstractItemView.SelectionMode.SingleSelection)
@@ -49,24 +263,26 @@ class DeviceTable(QTableWidget):
 
         # Apply custom stylesheet
         self.update_styles()
-        
+
         # Connect to theme changes
         theme_manager.theme_changed.connect(self._on_theme_changed)
 
-        self.itemSelectionChanged.connect(self._on_selection_change)
+        self.selectionModel().selectionChanged.connect(self._on_selection_change)
 
-        self.devices: List[Device] = []
+    @property
+    def devices(self) -> List[Device]:
+        return self.device_model.devices
 
     def _on_theme_changed(self, _):
         """Handle theme change signal from theme manager"""
         self.update_styles()
-    
+
     def update_styles(self):
         """Update table styles based on current theme"""
         c = theme_manager.colors
-        
+
         self.setStyleSheet(f"""
-            QTableWidget {{
+            QTableView {{
                 background-color: {c["surface"]};
                 border: 1px solid {c["border"]};
                 gridline-color: {c["border"]};
@@ -75,24 +291,24 @@ class DeviceTable(QTableWidget):
                 border-radius: 4px;
                 outline: none;
             }}
-            
-            QTableWidget::item {{
+
+            QTableView::item {{
                 padding: 5px;
                 outline: none;
                 border: none;
             }}
-            
-            QTableWidget::item:selected {{
+
+            QTableView::item:selected {{
                 background-color: {c["primary"]};
                 color: white;
                 outline: none;
             }}
-            
-            QTableWidget::item:focus {{
+
+            QTableView::item:focus {{
                 outline: none;
                 border: none;
             }}
-            
+
             QHeaderView::section {{
                 background-color: {c["surface_hover"]};
                 padding: 6px;
@@ -102,8 +318,8 @@ class DeviceTable(QTableWidget):
                 color: {c["text"]};
                 outline: none;
             }}
-            
-            QTableWidget QTableCornerButton::section {{
+
+            QTableView QTableCornerButton::section {{
                 background-color: {c["surface_hover"]};
                 border: none;
                 outline: none;
@@ -111,63 +327,33 @@ class DeviceTable(QTableWidget):
         """)
 
     def update_devices(self, devices: List[Device]):
-        """Updates the table with a list of Device objects."""
-        # Preserve selection
-        current_serial = None
-        if self.selectedItems():
-            # Serial is now at index 1
-            current_serial = self.item(self.currentRow(), 1).text()
-
-        self.setRowCount(len(devices))
-        self.devices = devices
-
-        for row, device in enumerate(devices):
-            # No (1-based index)
-            self.setItem(row, 0, QTableWidgetItem(str(row + 1)))
-
-            # Serial Number
-            serial_item = QTableWidgetItem(device.serial)
-            # Store full device object in UserRole of serial item (or first item)
-            serial_item.setData(Qt.ItemDataRole.UserRole, device)
-            self.setItem(row, 1, serial_item)
-
-            # Product Name (marketing name like "Galaxy A72", "Pixel 7")
-            self.setItem(row, 2, QTableWidgetItem(device.product))
-
-            # Model Name (model number like "SM-A725F/DS")
-            self.setItem(row, 3, QTableWidgetItem(device.model))
-
-            # Android Version
-            self.setItem(row, 4, QTableWidgetItem(device.android_version))
-
-            # Resolution
-            self.setItem(row, 5, QTableWidgetItem(device.resolution))
-
-            # Status
-            status_item = QTableWidgetItem(device.status)
-            if device.status == "Online":
-                status_item.setForeground(QBrush(QColor("#4caf50")))  # Green
-            else:
-                status_item.setForeground(QBrush(QColor("#f44336")))  # Red
-            self.setItem(row, 6, status_item)
+        """Updates the table with a list of Device objects.
+
+        Only rows that changed are touched, and the selection follows the
+        selected serial through inserts and removals.
+        """
+        self.device_model.update_devices(devices)
+
+    def apply_changes(self, changes: DeviceChangeSet):
+        """Applies a change set from DeviceMonitorWorker.devices_changed."""
+        self.device_model.apply_changes(changes)
 
-        # Restore selection
-        if current_serial:
-            for row in range(self.rowCount()):
-                if self.item(row, 1) and self.item(row, 1).text() == current_serial:
-                    self.selectRow(row)
-                    break
+    def set_filter_text(self, text: str):
+        """Shows only devices whose serial, product, model or Android
+        version contains text (case-insensitive)."""
+        self.proxy_model.set_filter_text(text)
+
+    def visible_count(self) -> int:
+        return self.proxy_model.rowCount()
 
     def get_selected_device(self) -> Device | None:
-        idx = self.currentRow()
-        if idx >= 0:
-            # Data is stored in column 1 (Serial)
-            item = self.item(idx, 1)
-            if item:
-                return item.data(Qt.ItemDataRole.UserRole)
+        rows = self.selectionModel().selectedRows()
+        if rows:
+            source = self.proxy_model.mapToSource(rows[0])
+            return self.device_model.device_at(source.row())
         return None
 
-    def _on_selection_change(self):
+    def _on_selection_change(self, *_):
         device = self.get_selected_device()
         self.selection_changed.emit(device)
 
@@ -190,7 +376,11 @@ class DeviceTable(QTableWidget):
         )
         menu.addAction(
             "Install APK...",
-            lambda: self.action_triggered.emit("install", device.serial),
+            lambda: self.action_triggered.emit("install_apk", device.serial),
+        )
+        menu.addAction(
+            "Install APK on All Online Devices...",
+            lambda: self.action_triggered.emit("install_apk_all", device.serial),
         )
 
         menu.exec(event.globalPos())
@@ -1,30 +1,225 @@
-from PyQt6.QtWidgets import QTextEdit
-from PyQt6.QtCore import pyqtSlot
+from PyQt6.QtWidgets import QTableView, QHeaderView, QAbstractItemView
+from PyQt6.QtCore import (
+    Qt,
+    QAbstractTableModel,
+    QModelIndex,
+    QThread,
+    QTimer,
+    pyqtSignal,
+)
+from PyQt6.QtGui import QColor
+from array import array
+from bisect import bisect_left
+from datetime import datetime
 import logging
+from typing import Sequence
+from autoxium.utils.log_store import LogStore
+from autoxium.utils.logger import log_store
 
+HEADERS = ["Time", "Level", "Device", "Message"]
+MESSAGE_COLUMN = 3
 
-class QtLogHandler(logging.Handler):
-    """Custom logging handler that sends logs to a callback/signal."""
+LEVEL_COLORS = {
+    logging.DEBUG: QColor("#808080"),
+    logging.WARNING: QColor("#e0a030"),
+    logging.ERROR: QColor("#f44336"),
+    logging.CRITICAL: QColor("#f44336"),
+}
 
-    def __init__(self, callback):
+
+class LogTableModel(QAbstractTableModel):
+    """The log store's records that match a filter, one row per record.
+
+    Rows are the matching sequence numbers; a row's text is only looked up
+    when the view paints it. refresh() appends new matches and drops rows
+    the store has evicted, so the history is never re-read.
+    """
+
+    def __init__(self, store: LogStore = log_store, parent=None):
+        super().__init__(parent)
+        self.store = store
+        self.min_level = logging.NOTSET
+        self.serial = ""
+        self.text = ""
+        self._seqs, self._end = store.query()
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._seqs)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (
+            orientation == Qt.Orientation.Horizontal
+            and role == Qt.ItemDataRole.DisplayRole
+        ):
+            return HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid() or index.row() >= len(self._seqs):
+            return None
+        if role not in (
+            Qt.ItemDataRole.DisplayRole,
+            Qt.ItemDataRole.ForegroundRole,
+            Qt.ItemDataRole.ToolTipRole,
+        ):
+            return None
+        entry = self.store.entry(self._seqs[index.row()])
+        if entry is None:  # Evicted since the last refresh
+            return None
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return LEVEL_COLORS.get(entry.level)
+        column = index.column()
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return entry.message if column == MESSAGE_COLUMN else None
+        if column == 0:
+            return datetime.fromtimestamp(entry.timestamp).strftime("%H:%M:%S.%f")[:-3]
+        if column == 1:
+            return logging.getLevelName(entry.level)
+        if column == 2:
+            return entry.serial
+        # Tracebacks show in the tooltip
+        return entry.message.split("\n", 1)[0]
+
+    def log_filter(self) -> tuple:
+        """The current (min_level, serial, text)."""
+        return (self.min_level, self.serial, self.text)
+
+    def set_filter(self, min_level: int = None, serial: str = None, text: str = None):
+        """Queries the store on the calling thread and shows the result."""
+        log_filter = merge_filter(self.log_filter(), min_level, serial, text)
+        self.set_results(log_filter, *self.store.query(*log_filter))
+
+    def set_results(self, log_filter: tuple, seqs: Sequence[int], end: int):
+        """Shows the result of a store query run elsewhere for log_filter."""
+        self.beginResetModel()
+        self.min_level, self.serial, self.text = log_filter
+        self._seqs, self._end = seqs, end
+        self.endResetModel()
+
+    def refresh(self):
+        """Drops evicted rows and appends records logged since the last call."""
+        cut = bisect_left(self._seqs, self.store.first_seq)
+        if cut:
+            self.beginRemoveRows(QModelIndex(), 0, cut - 1)
+            self._seqs = self._seqs[cut:]
+            self.endRemoveRows()
+
+        new, self._end = self.store.query(
+            self.min_level, self.serial, self.text, start=self._end
+        )
+        if not new:
+            return
+        count = len(self._seqs)
+        self.beginInsertRows(QModelIndex(), count, count + len(new) - 1)
+        if isinstance(self._seqs, range) and isinstance(new, range):
+            # Unfiltered rows stay a range however many there are
+            self._seqs = range(self._seqs.start, new.stop)
+        else:
+            if not isinstance(self._seqs, array):
+                self._seqs = array("q", self._seqs)
+            self._seqs.extend(new)
+        self.endInsertRows()
+
+
+def merge_filter(
+    log_filter: tuple, min_level: int = None, serial: str = None, text: str = None
+) -> tuple:
+    """log_filter with the given parts replaced."""
+    old_level, old_serial, old_text = log_filter
+    return (
+        old_level if min_level is None else min_level,
+        old_serial if serial is None else serial,
+        old_text if text is None else text,
+    )
+
+
+class LogQueryWorker(QThread):
+    """Runs one LogStore query; a text search over a million records takes
+    a few hundred milliseconds, too long for the UI thread."""
+
+    def __init__(self, store: LogStore, log_filter: tuple):
         super().__init__()
-        self.callback = callback
+        self.store = store
+        self.log_filter = log_filter
+        self.result = None  # (seqs, end) once finished
+
+    def run(self):
+        self.result = self.store.query(*self.log_filter)
+
+
+class LogViewer(QTableView):
+    """Shows the log store through LogTableModel, refreshed every
+    flush_interval ms.
 
-    def emit(self, record):
-        msg = self.format(record)
-        self.callback(msg)
+    Only visible rows are painted, so filtering or scrolling a million
+    records costs the same as a hundred.
+    """
 
+    # Emitted once the rows for the last set_filter() are shown
+    filter_applied = pyqtSignal()
 
-class LogViewer(QTextEdit):
-    def __init__(self):
+    def __init__(self, store: LogStore = log_store, flush_interval: int = 50):
         super().__init__()
-        self.setReadOnly(True)
+        self.log_model = LogTableModel(store, self)
+        self.query_worker = None
+        self._wanted_filter = self.log_model.log_filter()
+        self.setModel(self.log_model)
         self.setStyleSheet(
             "font-family: Consolas, monospace; font-size: 12px; background-color: #1e1e1e; color: #cccccc;"
         )
+        self.setSelectionBehavior(QAbstractItemView.SelectionBehavior.SelectRows)
+        self.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.setShowGrid(False)
+        self.setWordWrap(False)
+        self.verticalHeader().setVisible(False)
+        # Fixed row heights and column widths: nothing is measured per row
+        self.verticalHeader().setSectionResizeMode(QHeaderView.ResizeMode.Fixed)
+        self.verticalHeader().setDefaultSectionSize(20)
+        header = self.horizontalHeader()
+        header.setSectionResizeMode(QHeaderView.ResizeMode.Interactive)
+        header.setStretchLastSection(True)
+        for column, width in enumerate((100, 80, 160)):
+            self.setColumnWidth(column, width)
+
+        self.flush_timer = QTimer(self)
+        self.flush_timer.timeout.connect(self.flush)
+        self.flush_timer.start(flush_interval)
+
+    def flush(self):
+        scrollbar = self.verticalScrollBar()
+        # Only follow new lines if the user hasn't scrolled up to read
+        at_bottom = scrollbar.value() >= scrollbar.maximum()
+        self.log_model.refresh()
+        if at_bottom:
+            self.scrollToBottom()
+
+    def set_filter(self, min_level: int = None, serial: str = None, text: str = None):
+        """Queries in the background; rows keep following the old filter
+        until the result is in."""
+        self._wanted_filter = merge_filter(self._wanted_filter, min_level, serial, text)
+        self._start_query()
+
+    def _start_query(self):
+        if self.query_worker is not None and self.query_worker.isRunning():
+            return  # Started again with the newest filter when it finishes
+        self.query_worker = LogQueryWorker(self.log_model.store, self._wanted_filter)
+        self.query_worker.finished.connect(self._on_query_finished)
+        self.query_worker.start()
+
+    def _on_query_finished(self):
+        worker = self.query_worker
+        if worker.log_filter != self._wanted_filter:
+            self._start_query()  # The filter changed while this one ran
+            return
+        self.log_model.set_results(worker.log_filter, *worker.result)
+        self.scrollToBottom()
+        self.filter_applied.emit()
+
+    def is_querying(self) -> bool:
+        return self.query_worker is not None and self.query_worker.isRunning()
 
-    @pyqtSlot(str)
-    def append_log(self, msg):
-        self.append(msg)
-        # Auto scroll to bottom
-        self.verticalScrollBar().setValue(self.verticalScrollBar().maximum())
+    def visible_count(self) -> int:
+        return self.log_model.rowCount()
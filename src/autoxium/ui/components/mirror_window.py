@@ -15,9 +15,12 @@ from PyQt6.QtWidgets import (
     QMessageBox,
 )
 from PyQt6.QtGui import QWindow, QIcon
-from PyQt6.QtCore import Qt, QTimer, QSize
+from PyQt6.QtCore import Qt, QTimer, QSize, pyqtSignal
 from autoxium.core.scrcpy_manager import scrcpy
 from autoxium.core.adb_wrapper import adb
+from autoxium.core.encoding_policy import EncodingProfile, encoding_policy
+from autoxium.core.input_broadcast import input_broadcaster
+from autoxium.core.macro import Macro, MacroRecorder, macro_player
 from autoxium.ui.style import COLORS
 from autoxium.utils.logger import logger
 
@@ -27,9 +30,17 @@ from autoxium.core.action_worker import ActionWorker
 
 
 class MirrorWindow(QMainWindow):
-    def __init__(self, device_serial, parent=None):
+    # Emitted from the replay thread with the error of a failed macro replay
+    macro_failed = pyqtSignal(str)
+
+    def __init__(self, device_serial, parent=None, devices=None):
         super().__init__(parent)
         self.device_serial = device_serial
+        # Returns the known devices (the device table's), without asking adb
+        self.devices = devices or (lambda: [])
+        # Each window records on its own, so windows don't stop each other
+        self.macro_recorder = MacroRecorder()
+        self.macro_failed.connect(self._on_macro_failed)
         self.setWindowTitle(f"Mirror: {device_serial}")
         self.resize(500, 800)  # Initial size, will likely resize to fit scrcpy
 
@@ -74,6 +85,19 @@ class MirrorWindow(QMainWindow):
         self.add_sidebar_button("screenshot", "Take Screenshot", self.take_screenshot)
         self.add_sidebar_button("apk", "Install APK", self.install_apk)
         self.add_sidebar_button("power", "Power", lambda: self.send_key(26))
+        self.sidebar_layout.addSpacing(10)
+        self.record_button = self.add_sidebar_button(
+            "record", "Record Macro", self.toggle_recording
+        )
+        self.record_button.setCheckable(True)
+        self.add_sidebar_button("play", "Play Macro", self.play_macro)
+        self.broadcast_button = self.add_sidebar_button(
+            "broadcast",
+            "Broadcast Keys to Devices...\n"
+            "Taps and swipes on the mirror only reach this device",
+            self.toggle_broadcast,
+        )
+        self.broadcast_button.setCheckable(True)
 
         # --- Aspect Ratio Logic ---
         self.aspect_ratio = 0.0
@@ -86,6 +110,9 @@ class MirrorWindow(QMainWindow):
         self.drag_position = None
 
         # Start Scrcpy and Embed
+        self.scrcpy_session = None
+        scrcpy.session_ready.connect(self._on_scrcpy_ready)
+        scrcpy.session_failed.connect(self._on_scrcpy_failed)
         self.scrcpy_window_title = (
             f"Autoxium_Scrcpy_{self.device_serial}_{int(time.time())}"
         )
@@ -135,9 +162,103 @@ class MirrorWindow(QMainWindow):
         btn = SidebarButton(icon_type, tooltip)
         btn.clicked.connect(callback)
         self.sidebar_layout.addWidget(btn)
+        return btn
 
     def send_key(self, keycode):
-        adb.input_keyevent(self.device_serial, keycode)
+        # Runs in the background, on the broadcast group too if one is set.
+        # Touches go from the embedded scrcpy window straight to the device,
+        # so only these sidebar keys can be broadcast from here.
+        input_broadcaster.send(self.device_serial, "key", (keycode,))
+
+    def toggle_broadcast(self):
+        if not self.broadcast_button.isChecked():
+            input_broadcaster.clear(self.device_serial)
+            return
+
+        serials = self._choose_broadcast_targets()
+        input_broadcaster.set_targets(self.device_serial, serials)
+        self.broadcast_button.setChecked(
+            input_broadcaster.is_broadcasting(self.device_serial)
+        )
+
+    def _choose_broadcast_targets(self):
+        """Asks which online devices should receive this window's input."""
+        from PyQt6.QtWidgets import (
+            QDialog,
+            QDialogButtonBox,
+            QListWidget,
+            QListWidgetItem,
+        )
+
+        dialog = QDialog(self)
+        dialog.setWindowTitle("Broadcast Input")
+        layout = QVBoxLayout(dialog)
+        layout.addWidget(QLabel(f"Send input from {self.device_serial} to:"))
+
+        device_list = QListWidget()
+        for device in self.devices():
+            if device.serial == self.device_serial or device.status != "Online":
+                continue
+            item = QListWidgetItem(f"{device.serial}  {device.product}".strip())
+            item.setData(Qt.ItemDataRole.UserRole, device.serial)
+            item.setFlags(item.flags() | Qt.ItemFlag.ItemIsUserCheckable)
+            item.setCheckState(Qt.CheckState.Checked)
+            device_list.addItem(item)
+        layout.addWidget(device_list)
+
+        buttons = QDialogButtonBox(
+            QDialogButtonBox.StandardButton.Ok | QDialogButtonBox.StandardButton.Cancel
+        )
+        buttons.accepted.connect(dialog.accept)
+        buttons.rejected.connect(dialog.reject)
+        layout.addWidget(buttons)
+
+        if dialog.exec() != QDialog.DialogCode.Accepted:
+            return []
+        return [
+            device_list.item(i).data(Qt.ItemDataRole.UserRole)
+            for i in range(device_list.count())
+            if device_list.item(i).checkState() == Qt.CheckState.Checked
+        ]
+
+    def toggle_recording(self):
+        if self.record_button.isChecked():
+            self.macro_recorder.start(self.device_serial)
+            return
+
+        macro = self.macro_recorder.stop()
+        if not macro.events:
+            QMessageBox.information(self, "Macro", "No input was recorded.")
+            return
+        filename = f"macro_{self.device_serial}_{int(time.time())}.json"
+        path, _ = QFileDialog.getSaveFileName(
+            self, "Save Macro", filename, "Autoxium macros (*.json)"
+        )
+        if path:
+            macro.save(path)
+            logger.info(f"Macro saved to {path}")
+
+    def play_macro(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Play Macro", "", "Autoxium macros (*.json)"
+        )
+        if not path:
+            return
+        try:
+            macro = Macro.load(path)
+        except (OSError, ValueError, KeyError) as e:
+            QMessageBox.warning(self, "Error", f"Could not load macro:\n{e}")
+            return
+        future = macro_player.play_async(macro, [self.device_serial])
+        future.add_done_callback(self._on_macro_done)
+
+    def _on_macro_done(self, future):
+        # Runs on the replay thread; the signal hands the error to the UI
+        if not future.cancelled() and future.exception() is not None:
+            self.macro_failed.emit(str(future.exception()))
+
+    def _on_macro_failed(self, message):
+        QMessageBox.warning(self, "Macro", f"Macro replay failed:\n{message}")
 
     def take_screenshot(self):
         # Ask where to save
@@ -177,7 +298,51 @@ class MirrorWindow(QMainWindow):
         out = adb.install_apk(self.device_serial, path)
         QMessageBox.information(self, "Install Result", f"Output:\n{out}")
 
-    def start_embedding_process(self):
+    def tile_size(self) -> int:
+        """Longest side of the video area in device pixels (0 if hidden)."""
+        if not self.isVisible():
+            return 0
+        size = self.scrcpy_container.size()
+        return int(max(size.width(), size.height()) * self.devicePixelRatioF())
+
+    def target_encoding_profile(
+        self, mirror_count: int = None, cpu_percent: float = None
+    ) -> EncodingProfile:
+        if mirror_count is None:
+            mirror_count = len(scrcpy.sessions())
+            if scrcpy.get_session(self.device_serial) is None:
+                mirror_count += 1
+        if cpu_percent is None:
+            cpu_percent = encoding_policy.cpu_percent()
+        return encoding_policy.choose(self.tile_size(), mirror_count, cpu_percent)
+
+    def apply_encoding_profile(
+        self, mirror_count: int = None, cpu_percent: float = None
+    ):
+        """Restarts scrcpy with new settings if the current ones are well off."""
+        session = scrcpy.get_session(self.device_serial)
+        if session is None:
+            return
+        current = EncodingProfile(*session.options)
+        target = self.target_encoding_profile(mirror_count, cpu_percent)
+        if not encoding_policy.needs_renegotiation(current, target, session.uptime):
+            return
+        logger.info(
+            f"Renegotiating scrcpy for {self.device_serial}: "
+            f"{current.max_size}px/{current.max_fps}fps -> "
+            f"{target.max_size}px/{target.max_fps}fps"
+        )
+        self.scrcpy_session = None
+        if getattr(self, "embedded_widget", None) is not None:
+            self.embedded_widget.setParent(None)
+            self.embedded_widget.deleteLater()
+            self.embedded_widget = None
+        self.scrcpy_window_title = (
+            f"Autoxium_Scrcpy_{self.device_serial}_{int(time.time())}"
+        )
+        self.start_embedding_process(target, restart=True)
+
+    def start_embedding_process(self, profile: EncodingProfile = None, restart=False):
         # 1. Start Scrcpy
         # We assume standard connection args.
         # --window-borderless removes title bar (perfect for embedding)
@@ -188,26 +353,60 @@ class MirrorWindow(QMainWindow):
         # NOTE: For this to work cleanly, we really should modify scrcpy manager to accept extra arbitrary args.
         # For now, we rely on standard window.
 
-        scrcpy.start_scrcpy(self.device_serial, window_title=self.scrcpy_window_title)
+        profile = profile or self.target_encoding_profile()
+        session = scrcpy.start_scrcpy(
+            self.device_serial,
+            window_title=self.scrcpy_window_title,
+            max_size=profile.max_size,
+            bit_rate=profile.bit_rate,
+            max_fps=profile.max_fps,
+            restart=restart,
+        )
+        if session is None:
+            QMessageBox.warning(
+                self,
+                "Mirror",
+                f"Could not start scrcpy for {self.device_serial}.\n"
+                f"At most {scrcpy.max_sessions} mirrors can run at once.",
+            )
+            return
+        # A reused session keeps the title it was started with
+        self.scrcpy_window_title = session.window_title
 
         # 2. Wait for Window and Embed
-        self.embed_timer = QTimer()
-        self.embed_timer.timeout.connect(self.check_and_embed)
-        self.embed_timer.start(500)  # Check every 500ms
+        # 2. Embed as soon as scrcpy reports its first frame
+        self.scrcpy_session = session
         self.retries = 0
+        if session.ready_at is not None:  # Reused session, already showing
+            self.check_and_embed()
 
-    def check_and_embed(self):
-        self.retries += 1
-        if self.retries > 20:  # 10 seconds timeout
-            logger.error("Could not find scrcpy window to embed.")
-            self.embed_timer.stop()
+    def _on_scrcpy_ready(self, session):
+        if session is self.scrcpy_session:
+            self.check_and_embed()
+
+    def _on_scrcpy_failed(self, session, message):
+        if session is not self.scrcpy_session:
             return
+        self.scrcpy_session = None
+        QMessageBox.warning(
+            self, "Mirror", f"scrcpy for {self.device_serial} failed:\n{message}"
+        )
 
+    def check_and_embed(self):
+        if self.scrcpy_session is None:
+            return
         hwnd = self.find_window_by_title(self.scrcpy_window_title)
         if hwnd:
             logger.info(f"Found scrcpy window HWND: {hwnd}")
-            self.embed_timer.stop()
             self.embed_window(hwnd)
+            return
+
+        # The window can be mapped a moment after the first frame is logged
+        self.retries += 1
+        if self.retries > 10:
+            logger.error("Could not find scrcpy window to embed.")
+            return
+        QTimer.singleShot(50, self.check_and_embed)
 
     def find_window_by_title(self, title):
         # Using ctypes to find window
@@ -228,9 +427,11 @@ class MirrorWindow(QMainWindow):
                 self.embedded_widget = QWidget.createWindowContainer(window)
                 self.embedded_widget.setParent(self.scrcpy_container)
 
-                # Add to layout of scrcpy_container
-                layout = QVBoxLayout(self.scrcpy_container)
-                layout.setContentsMargins(0, 0, 0, 0)
+                # Add to layout of scrcpy_container (kept across restarts)
+                layout = self.scrcpy_container.layout()
+                if layout is None:
+                    layout = QVBoxLayout(self.scrcpy_container)
+                    layout.setContentsMargins(0, 0, 0, 0)
                 layout.addWidget(self.embedded_widget)
 
                 # Optional: Force style updates?
@@ -264,7 +465,14 @@ class MirrorWindow(QMainWindow):
             event.accept()
 
     def closeEvent(self, event):
-        # We should probably kill the scrcpy process if we close this window
-        # But for now, scrcpy process is detached.
-        # Ideally we track the PID in ScrcpyManager.
+        if self.macro_recorder.recording:
+            self.macro_recorder.stop()
+        input_broadcaster.clear(self.device_serial)
+        self.scrcpy_session = None
+        try:
+            scrcpy.session_ready.disconnect(self._on_scrcpy_ready)
+            scrcpy.session_failed.disconnect(self._on_scrcpy_failed)
+        except TypeError:  # Already closed once
+            pass
+        scrcpy.stop_scrcpy(self.device_serial)
         super().closeEvent(event)
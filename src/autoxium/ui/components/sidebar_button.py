@@ -176,4 +176,33 @@ class SidebarButton(QPushButton):
                 int(center_x + 2), int(center_y), int(center_x), int(center_y + 2)
             )
 
+        elif self.icon_type == "record":
+            # Dot, filled red while recording
+            if self.isChecked():
+                painter.setBrush(QBrush(QColor("#f44336")))
+            painter.drawEllipse(QPointF(center_x, center_y), 4, 4)
+
+        elif self.icon_type == "broadcast":
+            # Dot with radio waves, highlighted while broadcasting
+            if self.isChecked():
+                painter.setPen(QPen(QColor("#0098ff"), 2))
+            painter.drawEllipse(QPointF(center_x, center_y), 1, 1)
+            for radius in (4, 7):
+                rect_f = QRectF(
+                    center_x - radius, center_y - radius, radius * 2, radius * 2
+                )
+                painter.drawArc(rect_f, -45 * 16, 90 * 16)
+                painter.drawArc(rect_f, 135 * 16, 90 * 16)
+
+        elif self.icon_type == "play":
+            # Triangle pointing right
+            path = QPolygonF(
+                [
+                    QPointF(center_x - 3, center_y - 4),
+                    QPointF(center_x + 4, center_y),
+                    QPointF(center_x - 3, center_y + 4),
+                ]
+            )
+            painter.drawPolygon(path)
+
         painter.end()
@@ -0,0 +1,127 @@
+from PyQt6.QtWidgets import QWidget
+from PyQt6.QtCore import Qt, QRect, pyqtSignal
+from PyQt6.QtGui import QColor, QImage, QPainter
+from autoxium.core.video_wall import Thumbnail
+from autoxium.ui.style import theme_manager
+from typing import Dict, List, Optional, Tuple
+
+
+class ThumbnailGrid(QWidget):
+    """Paints every device's latest frame into one widget.
+
+    A single widget with a grid of tiles avoids one child widget per
+    device; only the tiles inside the repainted area are drawn.
+    """
+
+    device_clicked = pyqtSignal(str)  # Emits serial
+
+    TILE_WIDTH = 160
+    TILE_HEIGHT = 340  # Video area, roughly a 9:19.5 phone
+    LABEL_HEIGHT = 20
+    SPACING = 10
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.serials: List[str] = []
+        # serial -> (image, buffer backing the image)
+        self._frames: Dict[str, Tuple[QImage, bytes]] = {}
+
+    def set_devices(self, serials: List[str]):
+        self.serials = list(serials)
+        for serial in list(self._frames):
+            if serial not in self.serials:
+                del self._frames[serial]
+        self._update_height()
+        self.update()
+
+    def update_frames(self, frames: Dict[str, Thumbnail]):
+        for serial, frame in frames.items():
+            image = QImage(
+                frame.data,
+                frame.width,
+                frame.height,
+                frame.stride,
+                QImage.Format.Format_RGB888,
+            )
+            # QImage doesn't own frame.data, so keep it alive alongside
+            self._frames[serial] = (image, frame.data)
+            index = self._index_of(serial)
+            if index is not None:
+                self.update(self._tile_rect(index))
+
+    def _index_of(self, serial: str) -> Optional[int]:
+        try:
+            return self.serials.index(serial)
+        except ValueError:
+            return None
+
+    def _columns(self) -> int:
+        tile = self.TILE_WIDTH + self.SPACING
+        return max(1, (self.width() + self.SPACING) // tile)
+
+    def _tile_rect(self, index: int) -> QRect:
+        columns = self._columns()
+        row, column = divmod(index, columns)
+        return QRect(
+            column * (self.TILE_WIDTH + self.SPACING),
+            row * (self.TILE_HEIGHT + self.LABEL_HEIGHT + self.SPACING),
+            self.TILE_WIDTH,
+            self.TILE_HEIGHT + self.LABEL_HEIGHT,
+        )
+
+    def _update_height(self):
+        rows = -(-len(self.serials) // self._columns())
+        self.setMinimumHeight(
+            rows * (self.TILE_HEIGHT + self.LABEL_HEIGHT + self.SPACING)
+        )
+
+    def resizeEvent(self, event):
+        self._update_height()
+        super().resizeEvent(event)
+
+    def paintEvent(self, event):
+        c = theme_manager.colors
+        painter = QPainter(self)
+        dirty = event.rect()
+        for index, serial in enumerate(self.serials):
+            tile = self._tile_rect(index)
+            if not tile.intersects(dirty):
+                continue
+            video = QRect(tile.x(), tile.y(), tile.width(), self.TILE_HEIGHT)
+            painter.fillRect(video, QColor("black"))
+
+            frame = self._frames.get(serial)
+            if frame is None:
+                painter.setPen(QColor(c["text"]))
+                painter.drawText(video, Qt.AlignmentFlag.AlignCenter, "No signal")
+            else:
+                image = frame[0]
+                # Fit inside the tile, keeping the aspect ratio
+                scale = min(
+                    video.width() / image.width(), video.height() / image.height()
+                )
+                width, height = int(image.width() * scale), int(image.height() * scale)
+                target = QRect(
+                    video.x() + (video.width() - width) // 2,
+                    video.y() + (video.height() - height) // 2,
+                    width,
+                    height,
+                )
+                painter.drawImage(target, image)
+
+            painter.setPen(QColor(c["text"]))
+            painter.drawText(
+                QRect(tile.x(), video.bottom() + 1, tile.width(), self.LABEL_HEIGHT),
+                Qt.AlignmentFlag.AlignCenter,
+                serial,
+            )
+        painter.end()
+
+    def mousePressEvent(self, event):
+        if event.button() != Qt.MouseButton.LeftButton:
+            return
+        pos = event.position().toPoint()
+        for index, serial in enumerate(self.serials):
+            if self._tile_rect(index).contains(pos):
+                self.device_clicked.emit(serial)
+                return
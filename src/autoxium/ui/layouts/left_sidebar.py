@@ -22,7 +22,9 @@ class Sidebar(QWidget):
         # Add menu buttons
         menu_items = [
             ("home", "🏠 Home"),
+            ("wall", "🧱 Wall"),
             ("logs", "📋 Logs"),
+            ("logcat", "🔎 Logcat"),
             ("settings", "⚙️ Settings"),
             ("profile", "👤 Profile"),
         ]
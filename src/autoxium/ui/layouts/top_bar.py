@@ -1,6 +1,8 @@
 import psutil
 from PyQt6.QtWidgets import QWidget, QHBoxLayout, QLabel, QPushButton
 from PyQt6.QtCore import QTimer, Qt
+from autoxium.core.encoding_policy import encoding_policy
+from autoxium.core.scrcpy_manager import scrcpy
 from autoxium.ui.style import theme_manager
 
 
@@ -87,8 +89,8 @@ class TopBar(QWidget):
         return label
 
     def update_metrics(self):
-        # CPU
-        cpu_percent = psutil.cpu_percent(interval=0.1)
+        # CPU, sampled centrally so the mirrors' load readings stay valid
+        cpu_percent = encoding_policy.cpu_percent()
 
         # RAM
         ram = psutil.virtual_memory()
@@ -102,9 +104,15 @@ class TopBar(QWidget):
         gpu_text = "N/A"
         
         # Combined metrics display
-        self.metrics_label.setText(
-            f"CPU/RAM/DISK/GPU: {cpu_percent:.0f}%/{ram_percent:.0f}%/{disk_percent:.0f}%/{gpu_text}"
-        )
+        text = f"CPU/RAM/DISK/GPU: {cpu_percent:.0f}%/{ram_percent:.0f}%/{disk_percent:.0f}%/{gpu_text}"
+
+        # scrcpy mirrors
+        sessions = scrcpy.sample()
+        if sessions:
+            mirror_cpu = sum(s.cpu_percent for s in sessions)
+            mirror_rss = sum(s.rss for s in sessions) / (1024 * 1024)
+            text += f"  |  Mirrors: {len(sessions)} ({mirror_cpu:.0f}% CPU, {mirror_rss:.0f} MB)"
+        self.metrics_label.setText(text)
         
         # Use the highest percentage for color coding
         max_percent = max(cpu_percent, ram_percent, disk_percent)
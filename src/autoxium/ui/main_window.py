@@ -1,3 +1,4 @@
+from PyQt6.QtCore import QTimer
 from PyQt6.QtWidgets import (
     QMainWindow,
     QWidget,
@@ -9,11 +10,24 @@ from PyQt6.QtWidgets import (
 )
 from autoxium.ui.layouts.top_bar import TopBar
 from autoxium.ui.layouts.left_sidebar import Sidebar
-from autoxium.ui.pages import HomePage, LogsPage, SettingsPage, ProfilePage
+from autoxium.ui.pages import (
+    HomePage,
+    LogsPage,
+    LogcatPage,
+    SettingsPage,
+    ProfilePage,
+    WallPage,
+)
 from autoxium.core.device_monitor import DeviceMonitorWorker
 from autoxium.core.action_worker import ActionWorker
 from autoxium.core.adb_wrapper import adb
+from autoxium.core.apk_installer import fleet_installer
+from autoxium.core.encoding_policy import encoding_policy
+from autoxium.core.logcat import logcat_collector
+from autoxium.core.scrcpy_manager import scrcpy
+from autoxium.core.video_wall import video_wall
 from autoxium.ui.style import COLORS, theme_manager
+from autoxium.utils.config import config
 from autoxium.utils.logger import logger
 
 
@@ -27,6 +41,17 @@ class MainWindow(QMainWindow):
         # Connect theme change signal
         theme_manager.theme_changed.connect(self.update_theme)
 
+        # The one place host CPU load is sampled; readers use the cached value
+        encoding_policy.sample_cpu()
+        self.cpu_timer = QTimer(self)
+        self.cpu_timer.timeout.connect(encoding_policy.sample_cpu)
+        self.cpu_timer.start(2000)
+
+        # Re-check mirror encoding settings as load and mirror count change
+        self.encoding_timer = QTimer(self)
+        self.encoding_timer.timeout.connect(self.rebalance_mirrors)
+        self.encoding_timer.start(15000)
+
     def update_theme(self, theme_name=None):
         self.setStyleSheet(theme_manager.get_stylesheet())
 
@@ -61,14 +86,18 @@ class MainWindow(QMainWindow):
 
         # Create pages
         self.home_page = HomePage()
+        self.wall_page = WallPage()
         self.logs_page = LogsPage()
+        self.logcat_page = LogcatPage()
         self.settings_page = SettingsPage()
         self.profile_page = ProfilePage()
 
         # Add pages to stacked widget
         self.pages = {
             "home": self.home_page,
+            "wall": self.wall_page,
             "logs": self.logs_page,
+            "logcat": self.logcat_page,
             "settings": self.settings_page,
             "profile": self.profile_page,
         }
@@ -78,11 +107,13 @@ class MainWindow(QMainWindow):
 
         # Connect signals
         self.home_page.action_requested.connect(self.handle_device_action)
+        self.wall_page.action_requested.connect(self.handle_device_action)
         self.settings_page.settings_changed.connect(self.apply_settings)
 
         # Device monitoring
         self.monitor_worker = DeviceMonitorWorker()
-        self.monitor_worker.devices_updated.connect(self.on_devices_updated)
+        self.monitor_worker.devices_changed.connect(self.on_devices_changed)
+        self.home_page.refresh_requested.connect(self.monitor_worker.request_refresh)
         self.monitor_worker.start()
 
         # Action workers tracking
@@ -96,8 +127,12 @@ class MainWindow(QMainWindow):
             self.stacked_widget.setCurrentWidget(self.pages[page_name])
             logger.info(f"Switched to {page_name} page")
 
-    def on_devices_updated(self, devices):
-        self.home_page.update_devices(devices)
+    def on_devices_changed(self, changes):
+        if config.logcat_enabled:
+            logcat_collector.apply_changes(changes)
+        self.home_page.apply_changes(changes)
+        self.wall_page.set_devices(self.home_page.device_table.devices)
+        self.logs_page.set_devices(self.home_page.device_table.devices)
 
     def handle_device_action(self, action, serial):
         logger.info(f"Action requested: {action} on {serial}")
@@ -109,7 +144,15 @@ class MainWindow(QMainWindow):
 
             from autoxium.ui.components.mirror_window import MirrorWindow
 
-            mirror_win = MirrorWindow(serial)
+            existing = self._mirror_windows.get(serial)
+            if existing is not None and existing.isVisible():
+                existing.raise_()
+                existing.activateWindow()
+                return
+
+            mirror_win = MirrorWindow(
+                serial, devices=lambda: self.home_page.device_table.devices
+            )
             mirror_win.show()
 
             # Store ref
@@ -128,6 +171,9 @@ class MainWindow(QMainWindow):
                     lambda: adb.reboot_device(serial), "Reboot", serial
                 )
 
+        elif action == "install_apk_all":
+            self.install_apk_on_fleet()
+
         elif action == "install_apk":
             file_path, _ = QFileDialog.getOpenFileName(
                 self, "Select APK", "", "APK files (*.apk)"
@@ -138,25 +184,31 @@ class MainWindow(QMainWindow):
                 )
 
     def run_async_action(self, action_func, action_name, device_serial):
-        worker = ActionWorker(action_func)
-        worker.finished.connect(
-            lambda result: self.on_action_complete(action_name, device_serial, result)
-        )
-        worker.error.connect(
-            lambda error: self.on_action_error(action_name, device_serial, error)
+        worker = ActionWorker(action_func, action_name)
+        worker.result_signal.connect(
+            lambda name, success, message: self.on_action_result(
+                name, device_serial, success, message
+            )
         )
+        worker.finished.connect(lambda: self.active_workers.remove(worker))
 
         self.active_workers.append(worker)
         worker.start()
 
         logger.info(f"Started async action: {action_name} for {device_serial}")
 
+    def on_action_result(self, action_name, device_serial, success, message):
+        if success:
+            self.on_action_complete(action_name, device_serial, message)
+        else:
+            self.on_action_error(action_name, device_serial, message)
+
     def on_action_complete(self, action_name, device_serial, result):
         logger.info(f"{action_name} completed for {device_serial}")
         QMessageBox.information(
             self,
             "Action Complete",
-            f"{action_name} completed successfully for {device_serial}",
+            f"{action_name} completed for {device_serial}\n{result}",
         )
 
     def on_action_error(self, action_name, device_serial, error):
@@ -165,6 +217,48 @@ class MainWindow(QMainWindow):
             self, "Action Failed", f"{action_name} failed for {device_serial}:\n{error}"
         )
 
+    def install_apk_on_fleet(self):
+        """Installs one app (single or split APKs) on every online device."""
+        serials = [
+            device.serial
+            for device in self.home_page.device_table.devices
+            if device.status == "Online"
+        ]
+        if not serials:
+            QMessageBox.information(self, "No Devices", "No online devices found.")
+            return
+
+        file_paths, _ = QFileDialog.getOpenFileNames(
+            self, "Select APK (or all split APKs)", "", "APK files (*.apk)"
+        )
+        if not file_paths:
+            return
+
+        def install():
+            results = fleet_installer.install(serials, file_paths)
+            counts = {}
+            for result in results:
+                counts[result.status] = counts.get(result.status, 0) + 1
+            summary = ", ".join(f"{count} {status}" for status, count in counts.items())
+            failed = [r.serial for r in results if r.status == "failed"]
+            if failed:
+                raise RuntimeError(f"{summary}\nFailed on: {', '.join(failed)}")
+            return summary
+
+        self.run_async_action(install, "Fleet APK install", f"{len(serials)} devices")
+
+    def rebalance_mirrors(self):
+        """Lets every open mirror renegotiate its scrcpy encoding profile."""
+        windows = [
+            w for w in getattr(self, "_mirror_windows", {}).values() if w.isVisible()
+        ]
+        if not windows:
+            return
+        cpu_percent = encoding_policy.cpu_percent()
+        mirror_count = len(scrcpy.sessions())
+        for window in windows:
+            window.apply_encoding_profile(mirror_count, cpu_percent)
+
     def apply_settings(self, settings):
         logger.info(f"Settings changed: {settings}")
 
@@ -179,10 +273,19 @@ class MainWindow(QMainWindow):
             self.monitor_worker.stop()
             self.monitor_worker.wait()
 
+        self.encoding_timer.stop()
+
         # Stop top bar timer
         if hasattr(self, "top_bar"):
             self.top_bar.timer.stop()
 
+        # Close mirrors and stop their scrcpy processes
+        for mirror_win in getattr(self, "_mirror_windows", {}).values():
+            mirror_win.close()
+        scrcpy.stop_all()
+        video_wall.stop_all()
+        logcat_collector.stop_all()
+
         logger.info("Application closed")
         event.accept()
 
@@ -1,6 +1,15 @@
 from .home_page import HomePage
 from .logs_page import LogsPage
+from .logcat_page import LogcatPage
 from .settings_page import SettingsPage
 from .profile_page import ProfilePage
+from .wall_page import WallPage
 
-__all__ = ["HomePage", "LogsPage", "SettingsPage", "ProfilePage"]
+__all__ = [
+    "HomePage",
+    "LogsPage",
+    "LogcatPage",
+    "SettingsPage",
+    "ProfilePage",
+    "WallPage",
+]
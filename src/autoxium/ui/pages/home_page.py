@@ -1,11 +1,20 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel, QPushButton, QHBoxLayout
-from PyQt6.QtCore import pyqtSignal
+from PyQt6.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QLabel,
+    QLineEdit,
+    QPushButton,
+    QHBoxLayout,
+)
+from PyQt6.QtCore import QRect, pyqtSignal
+from autoxium.core.window_layout import Rect, Tile, pack_windows
 from autoxium.ui.components.device_table import DeviceTable
 from autoxium.ui.style import COLORS
 
 
 class HomePage(QWidget):
     action_requested = pyqtSignal(str, str)  # action, serial
+    refresh_requested = pyqtSignal()  # Re-read every device's details
 
     def __init__(self, parent=None):
         super().__init__(parent)
@@ -30,6 +39,26 @@ class HomePage(QWidget):
 
         header_layout.addStretch()
 
+        # Filter box (serial, product, model or Android version)
+        self.filter_edit = QLineEdit()
+        self.filter_edit.setPlaceholderText("🔍 Filter devices...")
+        self.filter_edit.setClearButtonEnabled(True)
+        self.filter_edit.setMinimumWidth(260)
+        self.filter_edit.setStyleSheet(f"""
+            QLineEdit {{
+                background-color: {COLORS["surface"]};
+                color: {COLORS["text"]};
+                border: 2px solid {COLORS["border"]};
+                border-radius: 8px;
+                padding: 8px 12px;
+                font-size: 14px;
+            }}
+            QLineEdit:focus {{
+                border-color: {COLORS["primary"]};
+            }}
+        """)
+        header_layout.addWidget(self.filter_edit)
+
         # Refresh button
         refresh_btn = QPushButton("🔄 Refresh")
         refresh_btn.setStyleSheet(f"""
@@ -76,17 +105,17 @@ class HomePage(QWidget):
         self.device_table.action_triggered.connect(self.action_requested.emit)
         layout.addWidget(self.device_table)
 
+        self.filter_edit.textChanged.connect(self.device_table.set_filter_text)
+
     def refresh_devices(self):
-        """Manually trigger device list refresh"""
-        from autoxium.core.adb_wrapper import adb
+        """Asks the device monitor to re-read and re-publish every device."""
         from autoxium.utils.logger import logger
 
         logger.info("Manual device refresh triggered")
-        devices = adb.get_devices()
-        self.update_devices(devices)
+        self.refresh_requested.emit()
 
     def arrange_devices(self):
-        """Arrange all open mirror windows in a grid on screen"""
+        """Arrange all open mirror windows in rows across all screens"""
         from autoxium.utils.logger import logger
         from PyQt6.QtWidgets import QApplication
 
@@ -122,78 +151,48 @@ class HomePage(QWidget):
 
         logger.info(f"Arranging {len(mirror_windows)} mirror windows")
 
-        # Get devices_per_row from settings page
-        devices_per_row = 5  # Default
+        # 0 lets the layout choose how many windows go in a row
+        max_per_row = 0
         if hasattr(main_window, "settings_page"):
             settings = main_window.settings_page.get_settings()
-            devices_per_row = settings.get("devices_per_row", 5)
-
-        logger.info(f"Using {devices_per_row} devices per row from settings")
-
-        # Get screen geometry
-        screen = QApplication.primaryScreen()
-        screen_rect = screen.availableGeometry()  # This excludes taskbar area
-
-        # Calculate grid layout using EXACT setting value
-        num_windows = len(mirror_windows)
-
-        # Use settings value directly (not capped to num_windows)
-        # Each window gets 1/devices_per_row of screen width
-        cols = devices_per_row
-
-        # Calculate window width based on columns
-        window_width = screen_rect.width() // cols
-
-        # Position each window - calculate height based on aspect ratio
-        current_row = 0
-        current_col = 0
-        row_y = screen_rect.top()  # Start from top of available screen (below taskbar)
-
-        for i, window in enumerate(mirror_windows):
-            # Get sidebar width from window
-            sidebar_width = 27  # Default (updated to match new sidebar)
-            if hasattr(window, "sidebar_width"):
-                sidebar_width = window.sidebar_width
-
-            # Calculate content width (excluding sidebar)
-            content_width = window_width - sidebar_width
-
-            # Calculate height based on window's aspect ratio
-            # aspect_ratio = width/height, so height = width / aspect_ratio
-            if hasattr(window, "aspect_ratio") and window.aspect_ratio > 0:
-                window_height = int(content_width / window.aspect_ratio)
-                logger.info(
-                    f"Device {i + 1} ({window.device_serial}): aspect_ratio={window.aspect_ratio:.4f}, total_width={window_width}px (content={content_width}px + sidebar={sidebar_width}px), height={window_height}px"
-                )
-            else:
-                # Default to 16:9 if no aspect ratio available
-                window_height = int(content_width * 2.2)  # Approximate phone ratio
-                logger.info(
-                    f"Device {i + 1} ({window.device_serial}): NO aspect_ratio, using default total_width={window_width}px (content={content_width}px + sidebar={sidebar_width}px), height={window_height}px"
-                )
-
-            x = screen_rect.left() + (current_col * window_width)
-            y = row_y
-
-            # Disable aspect ratio lock before resizing
-            if hasattr(window, "lock_aspect_ratio"):
-                window.lock_aspect_ratio = False
+            max_per_row = settings.get("devices_per_row", 0)
 
-            window.setGeometry(x, y, window_width, window_height)
-            window.raise_()  # Bring to front
-            window.activateWindow()
-
-            # Move to next column
-            current_col += 1
-            if current_col >= cols:
-                current_col = 0
-                current_row += 1
-                row_y += window_height  # Move to next row
+        # Pack across every monitor, excluding taskbars
+        screens = [
+            Rect(g.x(), g.y(), g.width(), g.height())
+            for g in (s.availableGeometry() for s in QApplication.screens())
+        ]
+        tiles = [
+            Tile(getattr(w, "aspect_ratio", 0.0), getattr(w, "sidebar_width", 0))
+            for w in mirror_windows
+        ]
+        geometries = pack_windows(tiles, screens, max_per_row)
+
+        # Apply in one pass with painting held off, so each window repaints
+        # once at its final size instead of after every neighbour moves
+        for window in mirror_windows:
+            window.setUpdatesEnabled(False)
+        try:
+            for window, rect in zip(mirror_windows, geometries):
+                # Disable aspect ratio lock before resizing
+                window.lock_aspect_ratio = False
+                target = QRect(rect.x, rect.y, rect.width, rect.height)
+                if window.geometry() != target:
+                    window.setGeometry(target)
+                window.raise_()
+        finally:
+            for window in mirror_windows:
+                window.setUpdatesEnabled(True)
 
-        rows = current_row + (1 if current_col > 0 else 0)
         logger.info(
-            f"Arranged {num_windows} windows in {rows} rows x {cols} columns (width: {window_width}px each)"
+            f"Arranged {len(mirror_windows)} windows on {len(screens)} screen(s)"
         )
 
-    def update_devices(self, devices):
-        self.device_table.update_devices(devices)
+        # Re-encode at the new tile sizes once the layouts have settled
+        if hasattr(main_window, "rebalance_mirrors"):
+            from PyQt6.QtCore import QTimer
+
+            QTimer.singleShot(500, main_window.rebalance_mirrors)
+
+    def apply_changes(self, changes):
+        self.device_table.apply_changes(changes)
@@ -0,0 +1,253 @@
+from PyQt6.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QComboBox,
+    QPushButton,
+    QDateTimeEdit,
+    QTableView,
+    QHeaderView,
+    QAbstractItemView,
+)
+from PyQt6.QtCore import (
+    Qt,
+    QAbstractTableModel,
+    QDateTime,
+    QModelIndex,
+    QThread,
+    pyqtSignal,
+)
+from PyQt6.QtGui import QColor
+from datetime import datetime
+import time
+from typing import List
+from autoxium.core.logcat_search import LogcatMatch, LogcatQuery, logcat_search
+from autoxium.ui.style import COLORS
+from autoxium.utils.logger import logger
+
+HEADERS = ["Time", "Device", "Level", "Tag", "PID", "Message"]
+PRIORITIES = [
+    ("Verbose", 2),
+    ("Debug", 3),
+    ("Info", 4),
+    ("Warning", 5),
+    ("Error", 6),
+    ("Fatal", 7),
+]
+PRIORITY_COLORS = {
+    5: QColor("#e0a030"),
+    6: QColor("#f44336"),
+    7: QColor("#f44336"),
+}
+RESULT_LIMIT = 100_000  # Matches shown per search
+
+
+def split_list(text: str) -> tuple:
+    return tuple(part.strip() for part in text.split(",") if part.strip())
+
+
+class LogcatResultsModel(QAbstractTableModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.matches: List[LogcatMatch] = []
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self.matches)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if (
+            orientation == Qt.Orientation.Horizontal
+            and role == Qt.ItemDataRole.DisplayRole
+        ):
+            return HEADERS[section]
+        return None
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        serial, entry = self.matches[index.row()]
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return PRIORITY_COLORS.get(entry.priority)
+        if role == Qt.ItemDataRole.ToolTipRole and index.column() == 5:
+            return entry.message
+        if role != Qt.ItemDataRole.DisplayRole:
+            return None
+        column = index.column()
+        if column == 0:
+            return datetime.fromtimestamp(entry.timestamp).strftime(
+                "%m-%d %H:%M:%S.%f"
+            )[:-3]
+        if column == 1:
+            return serial
+        if column == 2:
+            return entry.level
+        if column == 3:
+            return entry.tag
+        if column == 4:
+            return str(entry.pid)
+        return entry.message.split("\n", 1)[0]
+
+    def set_matches(self, matches: List[LogcatMatch]):
+        self.beginResetModel()
+        self.matches = matches
+        self.endResetModel()
+
+
+class LogcatSearchWorker(QThread):
+    # Signal: matches, seconds taken, error message ("" on success)
+    search_finished = pyqtSignal(list, float, str)
+
+    def __init__(self, query: LogcatQuery):
+        super().__init__()
+        self.query = query
+
+    def run(self):
+        started = time.monotonic()
+        try:
+            matches = list(logcat_search.search(self.query, limit=RESULT_LIMIT))
+            self.search_finished.emit(matches, time.monotonic() - started, "")
+        except Exception as e:
+            logger.error(f"Logcat search failed: {e}")
+            self.search_finished.emit([], time.monotonic() - started, str(e))
+
+
+class LogcatPage(QWidget):
+    """Searches captured logcat by device, tag, level, text and time."""
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.worker = None
+
+        # Layout
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(15)
+
+        # Header
+        title = QLabel("Logcat Search")
+        title.setStyleSheet(f"""
+            font-size: 24px;
+            font-weight: bold;
+            color: {COLORS["text"]};
+        """)
+        layout.addWidget(title)
+
+        # Query
+        query_row = QWidget()
+        query_layout = QHBoxLayout(query_row)
+        query_layout.setContentsMargins(0, 0, 0, 0)
+
+        self.devices_edit = QLineEdit()
+        self.devices_edit.setPlaceholderText("All devices (serials, comma separated)")
+        query_layout.addWidget(self.devices_edit, 2)
+
+        self.tags_edit = QLineEdit()
+        self.tags_edit.setPlaceholderText("All tags")
+        query_layout.addWidget(self.tags_edit, 1)
+
+        self.priority_combo = QComboBox()
+        for label, priority in PRIORITIES:
+            self.priority_combo.addItem(f"{label}+", priority)
+        query_layout.addWidget(self.priority_combo)
+
+        self.text_edit = QLineEdit()
+        self.text_edit.setPlaceholderText("Message contains...")
+        query_layout.addWidget(self.text_edit, 2)
+        layout.addWidget(query_row)
+
+        time_row = QWidget()
+        time_layout = QHBoxLayout(time_row)
+        time_layout.setContentsMargins(0, 0, 0, 0)
+
+        now = QDateTime.currentDateTime()
+        self.from_edit = QDateTimeEdit(now.addSecs(-600))
+        self.to_edit = QDateTimeEdit(now)
+        for label, edit in (("From", self.from_edit), ("To", self.to_edit)):
+            edit.setDisplayFormat("yyyy-MM-dd HH:mm:ss")
+            edit.setCalendarPopup(True)
+            time_layout.addWidget(QLabel(label))
+            time_layout.addWidget(edit)
+
+        self.search_button = QPushButton("🔎 Search")
+        self.search_button.setStyleSheet(f"""
+            QPushButton {{
+                background-color: {COLORS["primary"]};
+                color: white;
+                border: none;
+                border-radius: 8px;
+                padding: 8px 20px;
+                font-size: 14px;
+                font-weight: 600;
+            }}
+            QPushButton:hover {{
+                background-color: {COLORS["primary_hover"]};
+            }}
+        """)
+        self.search_button.clicked.connect(self.run_search)
+        time_layout.addWidget(self.search_button)
+
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet(f"color: {COLORS['text']};")
+        time_layout.addWidget(self.status_label)
+        time_layout.addStretch()
+        layout.addWidget(time_row)
+
+        # Results
+        self.results_model = LogcatResultsModel(self)
+        self.results_view = QTableView()
+        self.results_view.setModel(self.results_model)
+        self.results_view.setSelectionBehavior(
+            QAbstractItemView.SelectionBehavior.SelectRows
+        )
+        self.results_view.setEditTriggers(QAbstractItemView.EditTrigger.NoEditTriggers)
+        self.results_view.setWordWrap(False)
+        self.results_view.verticalHeader().setVisible(False)
+        self.results_view.verticalHeader().setSectionResizeMode(
+            QHeaderView.ResizeMode.Fixed
+        )
+        self.results_view.verticalHeader().setDefaultSectionSize(20)
+        self.results_view.horizontalHeader().setStretchLastSection(True)
+        for column, width in enumerate((150, 140, 50, 160, 60)):
+            self.results_view.setColumnWidth(column, width)
+        self.results_view.setStyleSheet(
+            "font-family: Consolas, monospace; font-size: 12px;"
+        )
+        layout.addWidget(self.results_view)
+
+        for edit in (self.devices_edit, self.tags_edit, self.text_edit):
+            edit.returnPressed.connect(self.run_search)
+
+    def current_query(self) -> LogcatQuery:
+        return LogcatQuery(
+            serials=split_list(self.devices_edit.text()),
+            start_ns=self.from_edit.dateTime().toMSecsSinceEpoch() * 1_000_000,
+            end_ns=self.to_edit.dateTime().toMSecsSinceEpoch() * 1_000_000,
+            tags=split_list(self.tags_edit.text()),
+            min_priority=self.priority_combo.currentData(),
+            text=self.text_edit.text(),
+        )
+
+    def run_search(self):
+        if self.worker is not None and self.worker.isRunning():
+            return
+        query = self.current_query()
+        logger.info(f"Searching logcat: {query}")
+        self.search_button.setEnabled(False)
+        self.status_label.setText("Searching...")
+        self.worker = LogcatSearchWorker(query)
+        self.worker.search_finished.connect(self._on_search_finished)
+        self.worker.start()
+
+    def _on_search_finished(self, matches, seconds, error):
+        self.search_button.setEnabled(True)
+        self.results_model.set_matches(matches)
+        if error:
+            self.status_label.setText(f"Search failed: {error}")
+            return
+        more = "+" if len(matches) >= RESULT_LIMIT else ""
+        self.status_label.setText(f"{len(matches):,}{more} matches in {seconds:.2f}s")
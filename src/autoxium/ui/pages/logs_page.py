@@ -1,6 +1,24 @@
-from PyQt6.QtWidgets import QWidget, QVBoxLayout, QLabel
+from PyQt6.QtWidgets import (
+    QWidget,
+    QVBoxLayout,
+    QHBoxLayout,
+    QLabel,
+    QLineEdit,
+    QComboBox,
+)
+from PyQt6.QtCore import QTimer
+import logging
 from autoxium.ui.components.log_viewer import LogViewer
 from autoxium.ui.style import COLORS
+from autoxium.utils.logger import log_store
+
+LEVELS = [
+    ("All levels", logging.NOTSET),
+    ("Info+", logging.INFO),
+    ("Warnings+", logging.WARNING),
+    ("Errors", logging.ERROR),
+]
+SEARCH_DELAY_MS = 250
 
 
 class LogsPage(QWidget):
@@ -13,14 +31,72 @@ class LogsPage(QWidget):
         layout.setSpacing(15)
 
         # Header
+        header = QWidget()
+        header_layout = QHBoxLayout(header)
+        header_layout.setContentsMargins(0, 0, 0, 0)
+
         title = QLabel("Application Logs")
         title.setStyleSheet(f"""
             font-size: 24px;
             font-weight: bold;
             color: {COLORS["text"]};
         """)
-        layout.addWidget(title)
+        header_layout.addWidget(title)
+        header_layout.addStretch()
+
+        # Filters
+        self.level_combo = QComboBox()
+        for label, level in LEVELS:
+            self.level_combo.addItem(label, level)
+        header_layout.addWidget(self.level_combo)
+
+        self.serial_combo = QComboBox()
+        self.serial_combo.addItem("All devices", "")
+        self.serial_combo.setMinimumWidth(160)
+        header_layout.addWidget(self.serial_combo)
+
+        self.search_edit = QLineEdit()
+        self.search_edit.setPlaceholderText("Search logs...")
+        self.search_edit.setClearButtonEnabled(True)
+        self.search_edit.setFixedWidth(240)
+        header_layout.addWidget(self.search_edit)
+
+        self.count_label = QLabel()
+        self.count_label.setStyleSheet(f"color: {COLORS['text']};")
+        header_layout.addWidget(self.count_label)
+        layout.addWidget(header)
 
         # Log Viewer
         self.log_viewer = LogViewer()
         layout.addWidget(self.log_viewer)
+
+        self.level_combo.currentIndexChanged.connect(
+            lambda: self._apply_filter(min_level=self.level_combo.currentData())
+        )
+        self.serial_combo.currentIndexChanged.connect(
+            lambda: self._apply_filter(serial=self.serial_combo.currentData() or "")
+        )
+        # Search once typing pauses rather than on every keystroke
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(SEARCH_DELAY_MS)
+        self.search_timer.timeout.connect(
+            lambda: self._apply_filter(text=self.search_edit.text())
+        )
+        self.search_edit.textChanged.connect(self.search_timer.start)
+        self.log_viewer.filter_applied.connect(self._show_count)
+
+    def _apply_filter(self, **kwargs):
+        self.log_viewer.set_filter(**kwargs)
+        self.count_label.setText("Searching...")
+
+    def _show_count(self):
+        self.count_label.setText(f"{self.log_viewer.visible_count():,} records")
+
+    def set_devices(self, devices):
+        """Makes devices' serials filterable and recognised in messages."""
+        serials = [d.serial for d in devices]
+        log_store.add_serials(serials)
+        known = {self.serial_combo.itemData(i) for i in range(self.serial_combo.count())}
+        for serial in sorted(set(serials) - known):
+            self.serial_combo.addItem(serial, serial)
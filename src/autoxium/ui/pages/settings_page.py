@@ -33,14 +33,15 @@ class SettingsPage(QWidget):
         display_layout = QFormLayout(self.display_group)
         display_layout.setSpacing(15)
 
-        # Devices per row setting
+        # Devices per row setting (0 = fit as many as the screen allows)
         self.devices_per_row_spin = QSpinBox()
-        self.devices_per_row_spin.setMinimum(1)
+        self.devices_per_row_spin.setMinimum(0)
         self.devices_per_row_spin.setMaximum(10)
-        self.devices_per_row_spin.setValue(5)
+        self.devices_per_row_spin.setSpecialValueText("Auto")
+        self.devices_per_row_spin.setValue(0)
         self.devices_per_row_spin.valueChanged.connect(self._on_settings_changed)
 
-        display_layout.addRow("Devices per row:", self.devices_per_row_spin)
+        display_layout.addRow("Max devices per row:", self.devices_per_row_spin)
 
         layout.addWidget(self.display_group)
 
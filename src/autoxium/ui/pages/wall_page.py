@@ -0,0 +1,94 @@
+from PyQt6.QtWidgets import QWidget, QVBoxLayout, QHBoxLayout, QLabel, QScrollArea
+from PyQt6.QtCore import QTimer, pyqtSignal
+from autoxium.core import video_wall as wall
+from autoxium.ui.components.thumbnail_grid import ThumbnailGrid
+from autoxium.ui.style import COLORS
+from autoxium.utils.logger import logger
+
+
+class WallPage(QWidget):
+    """Live thumbnails of every online device; click one to mirror it.
+
+    Streams only run while the page is shown.
+    """
+
+    action_requested = pyqtSignal(str, str)  # action, serial
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.devices = {}  # serial -> Device, online only
+
+        # Layout
+        layout = QVBoxLayout(self)
+        layout.setContentsMargins(20, 20, 20, 20)
+        layout.setSpacing(15)
+
+        # Header
+        header = QWidget()
+        header_layout = QHBoxLayout(header)
+        header_layout.setContentsMargins(0, 0, 0, 0)
+
+        title = QLabel("Device Wall")
+        title.setStyleSheet(f"""
+            font-size: 24px;
+            font-weight: bold;
+            color: {COLORS["text"]};
+        """)
+        header_layout.addWidget(title)
+        header_layout.addStretch()
+
+        self.status_label = QLabel()
+        self.status_label.setStyleSheet(f"color: {COLORS['text']};")
+        header_layout.addWidget(self.status_label)
+        layout.addWidget(header)
+
+        # Thumbnails
+        self.grid = ThumbnailGrid()
+        self.grid.device_clicked.connect(
+            lambda serial: self.action_requested.emit("mirror", serial)
+        )
+        scroll = QScrollArea()
+        scroll.setWidgetResizable(True)
+        scroll.setWidget(self.grid)
+        layout.addWidget(scroll)
+
+        # Frames are collected from the decoder processes at ~10 Hz
+        self.frame_timer = QTimer(self)
+        self.frame_timer.timeout.connect(self._collect_frames)
+
+        if not wall.is_available():
+            self.status_label.setText("Install PyAV (pip install av) to use the wall")
+
+    def set_devices(self, devices):
+        self.devices = {d.serial: d for d in devices if d.status == "Online"}
+        self.grid.set_devices(list(self.devices))
+        if self.isVisible():
+            self._sync_streams()
+
+    def _sync_streams(self):
+        if not wall.is_available():
+            return
+        streaming = set(wall.video_wall.streaming())
+        for serial in streaming - self.devices.keys():
+            wall.video_wall.stop(serial)
+        for serial, device in self.devices.items():
+            if serial not in streaming:
+                wall.video_wall.start(serial, device.resolution)
+        self.status_label.setText(f"{len(self.devices)} device(s)")
+
+    def _collect_frames(self):
+        frames = wall.video_wall.poll()
+        if frames:
+            self.grid.update_frames(frames)
+
+    def showEvent(self, event):
+        super().showEvent(event)
+        if wall.is_available():
+            logger.info("Starting device wall streams")
+            self._sync_streams()
+            self.frame_timer.start(100)
+
+    def hideEvent(self, event):
+        super().hideEvent(event)
+        self.frame_timer.stop()
+        wall.video_wall.stop_all()
@@ -0,0 +1,133 @@
+"""
+Minimal reader for the binary AndroidManifest.xml inside an APK.
+
+Only extracts what installs need: package name, version code/name and the
+split name of split APKs.
+"""
+
+import struct
+import zipfile
+from dataclasses import dataclass
+from typing import Dict, List, Optional
+
+# Chunk types (frameworks/base/libs/androidfw/ResourceTypes.h)
+RES_STRING_POOL_TYPE = 0x0001
+RES_XML_TYPE = 0x0003
+RES_XML_START_ELEMENT_TYPE = 0x0102
+RES_XML_RESOURCE_MAP_TYPE = 0x0180
+
+UTF8_FLAG = 0x100
+TYPE_STRING = 0x03
+
+# android:* attribute resource ids, used when attribute names are stripped
+ATTR_IDS = {
+    0x0101021B: "versionCode",
+    0x0101021C: "versionName",
+    0x01010573: "versionCodeMajor",
+}
+
+
+@dataclass
+class ApkInfo:
+    path: str
+    package: str
+    version_code: int
+    version_name: str = ""
+    split: str = ""
+
+
+def _read_string_pool(data: bytes, offset: int) -> List[str]:
+    (_, header_size, _, count, _, flags, strings_start, _) = struct.unpack_from(
+        "<HHIIIIII", data, offset
+    )
+    offsets = struct.unpack_from(f"<{count}I", data, offset + header_size)
+    base = offset + strings_start
+    strings = []
+    for string_offset in offsets:
+        pos = base + string_offset
+        if flags & UTF8_FLAG:
+            # Character count, then byte count; each 1 or 2 bytes long
+            if data[pos] & 0x80:
+                pos += 2
+            else:
+                pos += 1
+            length = data[pos]
+            if length & 0x80:
+                length = ((length & 0x7F) << 8) | data[pos + 1]
+                pos += 2
+            else:
+                pos += 1
+            strings.append(data[pos : pos + length].decode("utf-8", "replace"))
+        else:
+            length = struct.unpack_from("<H", data, pos)[0]
+            pos += 2
+            if length & 0x8000:
+                length = ((length & 0x7FFF) << 16) | struct.unpack_from("<H", data, pos)[0]
+                pos += 2
+            strings.append(data[pos : pos + length * 2].decode("utf-16-le", "replace"))
+    return strings
+
+
+def parse_manifest_attributes(data: bytes) -> Dict[str, object]:
+    """Returns the attributes of the root <manifest> element of a binary XML."""
+    chunk_type, header_size, _ = struct.unpack_from("<HHI", data, 0)
+    if chunk_type != RES_XML_TYPE:
+        raise ValueError("Not a binary XML document")
+
+    strings: List[str] = []
+    resource_ids: List[int] = []
+    offset = header_size
+    while offset + 8 <= len(data):
+        chunk_type, chunk_header, chunk_size = struct.unpack_from("<HHI", data, offset)
+        if chunk_type == RES_STRING_POOL_TYPE:
+            strings = _read_string_pool(data, offset)
+        elif chunk_type == RES_XML_RESOURCE_MAP_TYPE:
+            count = (chunk_size - chunk_header) // 4
+            resource_ids = list(struct.unpack_from(f"<{count}I", data, offset + chunk_header))
+        elif chunk_type == RES_XML_START_ELEMENT_TYPE:
+            ext = offset + chunk_header
+            _, name, attr_start, attr_size, attr_count = struct.unpack_from("<IIHHH", data, ext)
+            if strings[name] != "manifest":
+                raise ValueError("Root element is not <manifest>")
+            attributes = {}
+            for i in range(attr_count):
+                pos = ext + attr_start + i * attr_size
+                _, attr_name, raw_value, _, _, data_type, value = struct.unpack_from(
+                    "<IIIHBBI", data, pos
+                )
+                key = strings[attr_name] if attr_name < len(strings) else ""
+                if attr_name < len(resource_ids) and resource_ids[attr_name] in ATTR_IDS:
+                    key = ATTR_IDS[resource_ids[attr_name]]
+                if raw_value != 0xFFFFFFFF:
+                    attributes[key] = strings[raw_value]
+                elif data_type == TYPE_STRING:
+                    attributes[key] = strings[value]
+                else:
+                    attributes[key] = value
+            return attributes
+        if chunk_size <= 0:
+            break
+        offset += chunk_size
+    raise ValueError("No <manifest> element found")
+
+
+def read_apk_info(path: str) -> ApkInfo:
+    """Reads package name and version from an APK's manifest."""
+    with zipfile.ZipFile(path) as apk:
+        attributes = parse_manifest_attributes(apk.read("AndroidManifest.xml"))
+
+    version_code = int(attributes.get("versionCode", 0) or 0)
+    major = int(attributes.get("versionCodeMajor", 0) or 0)
+    return ApkInfo(
+        path=path,
+        package=str(attributes.get("package", "")),
+        # Long version code as reported by the package manager
+        version_code=(major << 32) | version_code,
+        version_name=str(attributes.get("versionName", "")),
+        split=str(attributes.get("split", "")),
+    )
+
+
+def base_apk(infos: List[ApkInfo]) -> Optional[ApkInfo]:
+    """Returns the base APK of a split set (the one without a split name)."""
+    return next((info for info in infos if not info.split), None)
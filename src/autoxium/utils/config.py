@@ -11,6 +11,41 @@ class Config:
         self.adb_path = self.bin_dir / "adb.exe"
         self.scrcpy_path = self.bin_dir / "scrcpy.exe"
 
+        # Local adb server used by the native protocol client
+        self.adb_server_host = "127.0.0.1"
+        self.adb_server_port = int(os.environ.get("ANDROID_ADB_SERVER_PORT", 5037))
+
+        # Device enrichment: worker threads and how long a refresh waits
+        # for a device before listing it with partial data
+        self.enrich_workers = 16
+        self.enrich_timeout = 3.0
+
+        # Deadlines (seconds) for ADB calls, and for installs/file transfers
+        self.command_timeout = 15.0
+        self.transfer_timeout = 600.0
+
+        # Parallel installs when rolling an APK out to many devices
+        self.install_concurrency = 8
+
+        # Most scrcpy mirrors allowed to run at once
+        self.scrcpy_max_sessions = 16
+
+        # Log records kept in memory for the Logs page; older ones are dropped
+        self.log_store_records = 1_000_000
+
+        # Where captured data (logcat segments) is written
+        self.data_dir = Path(
+            os.environ.get("AUTOXIUM_DATA_DIR", Path.home() / ".autoxium")
+        )
+        self.logcat_dir = self.data_dir / "logcat"
+
+        # Logcat capture: on for every online device, read by this many
+        # threads; entries kept in memory and bytes on disk per device
+        self.logcat_enabled = True
+        self.logcat_readers = 4
+        self.logcat_ring_entries = 20_000
+        self.logcat_max_bytes = 256 * 1024 * 1024
+
         # Ensure bin dir exists or provide instructions if missing?
         # For now, we assume the structure is there.
 
@@ -0,0 +1,375 @@
+"""
+Bounded, indexed, in-memory store of log records for the Logs page.
+
+Records are kept column by column in fixed-size blocks: timestamps, levels,
+logger and serial ids in typed arrays, messages as one joined string per
+full block. Every record gets a sequence number; the oldest block is
+dropped whole once the store is at capacity.
+
+Sequence numbers are also indexed by level, by serial and by the pair,
+so filtering a million records is a merge of a few sorted arrays. Text
+search runs str.find over each full block's lowercased text and only
+looks at individual messages where there is a hit.
+"""
+
+import logging
+import re
+from array import array
+from bisect import bisect_left, bisect_right
+from itertools import compress, repeat
+from operator import and_, contains, eq, ge
+from typing import Dict, Iterable, List, NamedTuple, Optional, Sequence, Tuple
+
+BLOCK_SIZE = 4096
+SEPARATOR = "\0"  # Between messages in a block's text; never searched for
+NO_SERIAL = 0
+
+
+class LogEntry(NamedTuple):
+    timestamp: float
+    level: int
+    logger: str
+    serial: str  # "" when the record isn't about a device
+    message: str
+
+
+class _Block:
+    """Up to BLOCK_SIZE consecutive records, sealed into strings when full."""
+
+    __slots__ = (
+        "first_seq",
+        "timestamps",
+        "levels",
+        "loggers",
+        "serials",
+        "messages",
+        "text",
+        "offsets",
+        "lower",
+        "lower_offsets",
+    )
+
+    def __init__(self, first_seq: int):
+        self.first_seq = first_seq
+        self.timestamps = array("d")
+        self.levels = array("H")
+        self.loggers = array("H")
+        self.serials = array("H")
+        self.messages: Optional[List[str]] = []
+        # Set by seal(); offsets has one extra entry past the end
+        self.text = self.lower = ""
+        self.offsets = self.lower_offsets = None
+
+    def __len__(self):
+        return len(self.timestamps)
+
+    def seal(self):
+        self.text, self.offsets = self._join(self.messages)
+        lowered = [m.lower() for m in self.messages]
+        self.lower, self.lower_offsets = self._join(lowered)
+        if self.lower_offsets == self.offsets:
+            self.lower_offsets = self.offsets
+        self.messages = None
+
+    @staticmethod
+    def _join(messages: Sequence[str]) -> Tuple[str, array]:
+        offsets = array("I", [0])
+        position = 0
+        for message in messages:
+            position += len(message) + 1
+            offsets.append(position)
+        return SEPARATOR.join(messages), offsets
+
+    def message(self, i: int) -> str:
+        if self.messages is not None:
+            return self.messages[i]
+        return self.text[self.offsets[i] : self.offsets[i + 1] - 1]
+
+    def matches(self, needle: str) -> Optional[Iterable[int]]:
+        """Per message, whether it contains needle (already lowercase).
+
+        None if no message does.
+        """
+        if self.messages is not None:
+            return map(contains, map(str.lower, self.messages), repeat(needle))
+        text, offsets = self.lower, self.lower_offsets
+        position = text.find(needle)
+        if position == -1:
+            return None
+        found = bytearray(len(self))
+        dense = len(found) // 16
+        while position != -1:
+            i = bisect_right(offsets, position) - 1
+            found[i] = 1
+            dense -= 1
+            if dense < 0:
+                # Common words: testing every message (all in C) beats a
+                # find per hit
+                return map(contains, text.split(SEPARATOR), repeat(needle))
+            position = text.find(needle, offsets[i + 1])
+        return found
+
+
+class LogStore(logging.Handler):
+    """Keeps the newest `capacity` records, indexed by level and serial.
+
+    Runs as a handler on the log listener thread. Records name a device
+    through extra={"serial": ...} or by mentioning a serial registered
+    with add_serials() in their message.
+    """
+
+    def __init__(self, capacity: int = 1_000_000, block_size: int = BLOCK_SIZE):
+        super().__init__()
+        self.block_size = block_size
+        self.max_blocks = max(2, -(-capacity // block_size))
+        self._blocks: List[_Block] = [_Block(0)]
+        self._next_seq = 0
+
+        self._logger_names: List[str] = []
+        self._logger_ids: Dict[str, int] = {}
+        self._serial_names: List[str] = [""]  # Id 0 is NO_SERIAL
+        self._serial_ids: Dict[str, int] = {"": NO_SERIAL}
+        self._serial_pattern = None
+
+        self._by_level: Dict[int, array] = {}
+        self._by_serial: Dict[int, array] = {}
+        self._by_serial_level: Dict[Tuple[int, int], array] = {}
+
+        self._formatter = logging.Formatter()
+
+    # --- Writing -----------------------------------------------------------
+
+    def add_serials(self, serials: Iterable[str]):
+        """Registers device serials to recognise in messages."""
+        with self.lock:
+            new = [s for s in serials if s and s not in self._serial_ids]
+            if not new:
+                return
+            for serial in new:
+                self._serial_ids[serial] = len(self._serial_names)
+                self._serial_names.append(serial)
+            # Longest first, so "emulator-55541" wins over "emulator-5554"
+            names = sorted(self._serial_names[1:], key=len, reverse=True)
+            self._serial_pattern = re.compile("|".join(map(re.escape, names)))
+
+    def _intern_serial(self, serial: str) -> int:
+        serial_id = self._serial_ids.get(serial)
+        if serial_id is None:
+            serial_id = self._serial_ids[serial] = len(self._serial_names)
+            self._serial_names.append(serial)
+        return serial_id
+
+    def emit(self, record):
+        # handle() already holds self.lock
+        try:
+            message = record.getMessage()
+            if record.exc_info:
+                message += "\n" + self._formatter.formatException(record.exc_info)
+        except Exception:
+            self.handleError(record)
+            return
+
+        serial = getattr(record, "serial", None)
+        if serial is not None:
+            serial_id = self._intern_serial(str(serial))
+        elif self._serial_pattern is not None:
+            match = self._serial_pattern.search(message)
+            serial_id = self._serial_ids[match.group()] if match else NO_SERIAL
+        else:
+            serial_id = NO_SERIAL
+
+        logger_id = self._logger_ids.get(record.name)
+        if logger_id is None:
+            logger_id = self._logger_ids[record.name] = len(self._logger_names)
+            self._logger_names.append(record.name)
+
+        block = self._blocks[-1]
+        if len(block) == self.block_size:
+            block.seal()
+            block = _Block(self._next_seq)
+            self._blocks.append(block)
+            if len(self._blocks) > self.max_blocks:
+                self._evict()
+
+        seq = self._next_seq
+        self._next_seq += 1
+        level = record.levelno
+        block.timestamps.append(record.created)
+        block.levels.append(level)
+        block.loggers.append(logger_id)
+        block.serials.append(serial_id)
+        block.messages.append(message)
+
+        self._index(self._by_level, level, seq)
+        if serial_id != NO_SERIAL:
+            self._index(self._by_serial, serial_id, seq)
+            self._index(self._by_serial_level, (serial_id, level), seq)
+
+    @staticmethod
+    def _index(index: dict, key, seq: int):
+        seqs = index.get(key)
+        if seqs is None:
+            seqs = index[key] = array("q")
+        seqs.append(seq)
+
+    def _evict(self):
+        del self._blocks[0]
+        first = self._blocks[0].first_seq
+        for index in (self._by_level, self._by_serial, self._by_serial_level):
+            for key in list(index):
+                seqs = index[key]
+                del seqs[: bisect_left(seqs, first)]
+                if not seqs:
+                    del index[key]
+
+    # --- Reading -----------------------------------------------------------
+
+    @property
+    def first_seq(self) -> int:
+        return self._blocks[0].first_seq
+
+    @property
+    def next_seq(self) -> int:
+        return self._next_seq
+
+    def __len__(self):
+        return self._next_seq - self.first_seq
+
+    def serials(self) -> List[str]:
+        """Serials that have at least one stored record."""
+        with self.lock:
+            return sorted(self._serial_names[i] for i in self._by_serial)
+
+    def entry(self, seq: int) -> Optional[LogEntry]:
+        """The record with sequence number seq, or None once evicted."""
+        with self.lock:
+            first = self._blocks[0].first_seq
+            if not first <= seq < self._next_seq:
+                return None
+            block = self._blocks[(seq - first) // self.block_size]
+            i = seq - block.first_seq
+            return LogEntry(
+                block.timestamps[i],
+                block.levels[i],
+                self._logger_names[block.loggers[i]],
+                self._serial_names[block.serials[i]],
+                block.message(i),
+            )
+
+    def query(
+        self,
+        min_level: int = logging.NOTSET,
+        serial: str = "",
+        text: str = "",
+        start: int = 0,
+    ) -> Tuple[Sequence[int], int]:
+        """Sequence numbers of matching records at or after start, ascending.
+
+        Returns (seqs, end); pass end as start next time to get only the
+        records added since. Unfiltered queries return a range.
+
+        Text is searched in the sealed blocks without holding the lock, so
+        a slow search doesn't stall logging or painting; only the block
+        still being written is read under it.
+        """
+        with self.lock:
+            start = max(start, self._blocks[0].first_seq)
+            end = self._next_seq
+            # Blocks stay intact once sealed, even after being evicted
+            blocks = list(self._blocks)
+
+            if serial:
+                serial_id = self._serial_ids.get(serial)
+                if serial_id is None:
+                    return array("q"), end
+                if min_level > logging.NOTSET:
+                    candidates = self._merge(
+                        (
+                            seqs
+                            for (s, level), seqs in self._by_serial_level.items()
+                            if s == serial_id and level >= min_level
+                        ),
+                        start,
+                    )
+                else:
+                    candidates = self._merge(
+                        [self._by_serial.get(serial_id, array("q"))], start
+                    )
+            else:
+                serial_id = NO_SERIAL
+                if min_level > logging.NOTSET:
+                    candidates = self._merge(
+                        (
+                            seqs
+                            for level, seqs in self._by_level.items()
+                            if level >= min_level
+                        ),
+                        start,
+                    )
+                else:
+                    candidates = range(start, end)
+
+        needle = text.lower()
+        if not needle:
+            return candidates, end
+        sealed, open_block = blocks[:-1], blocks[-1]
+        split = bisect_left(candidates, open_block.first_seq)
+        # Check the few candidates directly, or search all the text and
+        # filter the hits on the level and serial columns
+        if len(candidates) * 8 < end - start:
+            hits = self._check(needle, blocks, candidates[:split])
+            with self.lock:
+                hits.extend(self._check(needle, blocks, candidates[split:]))
+            return hits, end
+        hits = self._search(needle, sealed, start, end, min_level, serial_id)
+        with self.lock:
+            hits.extend(
+                self._search(needle, [open_block], start, end, min_level, serial_id)
+            )
+        return hits, end
+
+    @staticmethod
+    def _merge(arrays: Iterable[array], start: int) -> array:
+        """The sorted union of index arrays, from start on (always a copy)."""
+        merged = array("q")
+        count = 0
+        for seqs in arrays:
+            merged.extend(seqs[bisect_left(seqs, start) :])
+            count += 1
+        # Each input is sorted, which sorted() merges in about linear time
+        return merged if count < 2 else array("q", sorted(merged))
+
+    def _check(self, needle: str, blocks: List[_Block], seqs: Sequence[int]) -> array:
+        """The seqs whose message contains needle."""
+        first = blocks[0].first_seq
+        hits = array("q")
+        for seq in seqs:
+            block = blocks[(seq - first) // self.block_size]
+            if needle in block.message(seq - block.first_seq).lower():
+                hits.append(seq)
+        return hits
+
+    @staticmethod
+    def _search(
+        needle: str,
+        blocks: List[_Block],
+        start: int,
+        end: int,
+        min_level: int,
+        serial_id: int,
+    ) -> array:
+        hits = array("q")
+        for block in blocks:
+            if block.first_seq + len(block) <= start:
+                continue
+            mask = block.matches(needle)
+            if mask is None:
+                continue
+            if min_level > logging.NOTSET:
+                mask = map(and_, mask, map(ge, block.levels, repeat(min_level)))
+            if serial_id != NO_SERIAL:
+                mask = map(and_, mask, map(eq, block.serials, repeat(serial_id)))
+            # Stop at end: the open block may have grown since the snapshot
+            seqs = range(block.first_seq, min(block.first_seq + len(block), end))
+            hits.extend(compress(seqs, mask))
+        return hits[bisect_left(hits, start) :]
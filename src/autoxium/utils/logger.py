@@ -1,21 +1,65 @@
+import atexit
 import logging
+import logging.handlers
+import queue
 import sys
+from autoxium.utils.config import config
+from autoxium.utils.log_store import LogStore
+
+LOG_FORMAT = "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+
+_listeners = {}  # logger name -> QueueListener
+
+
+class _DeferredQueueHandler(logging.handlers.QueueHandler):
+    """Queues records as they are, leaving all formatting to the listener.
+
+    The stock QueueHandler formats each message in the logging thread;
+    handing the record over untouched keeps ADB workers down to a put().
+    """
+
+    def prepare(self, record):
+        return record
 
 
 def setup_logger(name="autoxium"):
+    """Logs go through a queue; handlers run on one listener thread."""
     logger = logging.getLogger(name)
     logger.setLevel(logging.DEBUG)
 
     if not logger.handlers:
         console_handler = logging.StreamHandler(sys.stdout)
         console_handler.setLevel(logging.DEBUG)
-        formatter = logging.Formatter(
-            "%(asctime)s - %(name)s - %(levelname)s - %(message)s"
+        console_handler.setFormatter(logging.Formatter(LOG_FORMAT))
+
+        records = queue.SimpleQueue()
+        listener = logging.handlers.QueueListener(
+            records, console_handler, respect_handler_level=True
         )
-        console_handler.setFormatter(formatter)
-        logger.addHandler(console_handler)
+        listener.start()
+        # Flush what's still queued when the app exits
+        atexit.register(listener.stop)
+        logger.addHandler(_DeferredQueueHandler(records))
+        _listeners[name] = listener
 
     return logger
 
 
+def add_log_sink(handler: logging.Handler, name="autoxium"):
+    """Also sends records to handler, called on the listener thread."""
+    listener = _listeners[name]
+    if handler not in listener.handlers:
+        # Swapping the tuple is atomic, so the listener never sees it half-built
+        listener.handlers = listener.handlers + (handler,)
+
+
+def remove_log_sink(handler: logging.Handler, name="autoxium"):
+    listener = _listeners[name]
+    listener.handlers = tuple(h for h in listener.handlers if h is not handler)
+
+
 logger = setup_logger()
+
+# Every record, kept structured and indexed for the Logs page
+log_store = LogStore(config.log_store_records)
+add_log_sink(log_store)
@@ -1,5 +1,26 @@
+import os
+import tempfile
+import threading
+import time
 import unittest
-from autoxium.core.adb_wrapper import adb
+from unittest import mock
+from autoxium.core.adb_client import AdbRequestSentError
+from autoxium.core.device_cache import DeviceInfo, DeviceInfoCache
+from autoxium.core.device_health import DeviceHealthTracker
+from autoxium.core.adb_wrapper import (
+    PHYSICAL_SIZE_PROP,
+    ADBWrapper,
+    adb,
+    parse_device_listing,
+    parse_getprop_output,
+)
+
+GETPROP_OUTPUT = """[ro.build.version.release]: [13]
+[ro.product.manufacturer]: [samsung]
+[ro.product.model]: [SM-A725F]
+[ro.product.name]: [a72qnsxx]
+Physical size: 1080x2400
+"""
 
 
 class TestADB(unittest.TestCase):
@@ -7,6 +28,210 @@ class TestADB(unittest.TestCase):
         # This test just checks if the wrapper initiates without crash
         self.assertIsNotNone(adb.adb_path)
 
+    def test_parse_getprop_output(self):
+        props = parse_getprop_output(GETPROP_OUTPUT)
+        self.assertEqual(props["ro.product.model"], "SM-A725F")
+        self.assertEqual(props["ro.build.version.release"], "13")
+        self.assertNotIn("Physical size", props)
+
+    def test_parse_device_listing(self):
+        output = (
+            "List of devices attached\n"
+            "R58N123ABC     device usb:1-1 product:a72q model:SM_A725F device:a72q transport_id:3\n"
+            "emulator-5554  offline transport_id:4\n"
+        )
+        entries = parse_device_listing(output)
+        self.assertEqual([e[0] for e in entries], ["R58N123ABC", "emulator-5554"])
+        self.assertEqual(entries[0][1], "device")
+        self.assertEqual(entries[0][2]["model"], "SM_A725F")
+
+    def test_names_read_from_property_map(self):
+        props = parse_getprop_output(GETPROP_OUTPUT)
+        props[PHYSICAL_SIZE_PROP] = "1080x2400"
+        self.assertEqual(adb.get_product_name("x", props), "Galaxy A72")
+        self.assertEqual(adb.get_model_name("x", props), "SM-A725F")
+        self.assertEqual(adb.get_android_version("x", props), "13")
+        self.assertEqual(adb.get_screen_resolution("x", props), "1080x2400")
+
+
+LISTING = (
+    "List of devices attached\n"
+    "R58N123ABC     device usb:1-1 product:a72qnsxx model:SM_A725F device:a72q transport_id:3\n"
+)
+
+
+class SlowGetprop:
+    """Stands in for shell_command; blocks until released."""
+
+    def __init__(self):
+        self.calls = []
+        self.release = threading.Event()
+
+    def __call__(self, serial, command, timeout=None):
+        self.calls.append(serial)
+        self.release.wait(5)
+        return GETPROP_OUTPUT
+
+
+class TestDeviceEnrichment(unittest.TestCase):
+    def setUp(self):
+        self.wrapper = ADBWrapper()
+        self.getprop = SlowGetprop()
+        self.wrapper.shell_command = self.getprop
+        patcher = mock.patch("autoxium.core.adb_wrapper.config.enrich_timeout", 0.05)
+        patcher.start()
+        self.addCleanup(patcher.stop)
+        self.addCleanup(self.getprop.release.set)
+
+    def test_deadline_uses_listing_until_enriched(self):
+        (device,) = self.wrapper.devices_from_listing(LISTING)
+        self.assertTrue(device.enriching)
+        self.assertEqual((device.status, device.model), ("Online", "SM_A725F"))
+
+        # The enrichment in flight is reused; a refresh queues behind it
+        self.wrapper.devices_from_listing(LISTING)
+        self.wrapper.devices_from_listing(LISTING, refresh=True)
+        self.wrapper.devices_from_listing(LISTING, refresh=True)
+        self.assertEqual(self.getprop.calls, ["R58N123ABC"])
+
+        self.getprop.release.set()
+        deadline = time.monotonic() + 3
+        while self.wrapper.is_enriching("R58N123ABC") and time.monotonic() < deadline:
+            time.sleep(0.01)
+        self.assertEqual(self.getprop.calls, ["R58N123ABC"] * 2)
+        (device,) = self.wrapper.devices_from_listing(LISTING)
+        self.assertFalse(device.enriching)
+        self.assertEqual((device.model, device.product), ("SM-A725F", "Galaxy A72"))
+
+    def test_open_circuit_reports_unresponsive(self):
+        self.wrapper.health.record_failure("R58N123ABC")
+        self.wrapper.health.record_failure("R58N123ABC")
+        (device,) = self.wrapper.devices_from_listing(LISTING)
+        self.assertEqual((device.status, device.model), ("Unresponsive", "SM_A725F"))
+        self.assertFalse(device.enriching)
+        self.assertEqual(self.getprop.calls, [])
+
+
+class TestCommandFallback(unittest.TestCase):
+    def setUp(self):
+        self.wrapper = ADBWrapper()
+        self.binary = mock.patch("autoxium.core.adb_wrapper.subprocess.run").start()
+        self.binary.return_value.stdout = "ok"
+        self.addCleanup(mock.patch.stopall)
+
+    def shell_fails_with(self, error):
+        mock.patch(
+            "autoxium.core.adb_wrapper.shell_sessions.run", side_effect=error
+        ).start()
+        mock.patch.object(self.wrapper, "_run_native", side_effect=error).start()
+        return self.wrapper.shell_command("R58N123ABC", "input tap 1 2")
+
+    def test_unreachable_server_falls_back_to_binary(self):
+        self.assertEqual(self.shell_fails_with(ConnectionRefusedError()), "ok")
+        self.binary.assert_called_once()
+
+    def test_command_is_not_sent_twice(self):
+        self.assertEqual(self.shell_fails_with(AdbRequestSentError("reset")), "")
+        self.wrapper._run_native.assert_not_called()
+        self.binary.assert_not_called()
+
+    def test_interrupted_pull_is_not_repeated(self):
+        class BrokenSync:
+            def __init__(self, serial):
+                pass
+
+            def __enter__(self):
+                return self
+
+            def __exit__(self, *exc):
+                pass
+
+            def pull_to_file(self, remote_path, local_path, progress=None, timeout=None):
+                with open(local_path, "wb") as f:
+                    f.write(b"partial")
+                raise ConnectionResetError("reset mid-transfer")
+
+        mock.patch("autoxium.core.adb_wrapper.SyncConnection", BrokenSync).start()
+        with tempfile.TemporaryDirectory() as tmp:
+            local = os.path.join(tmp, "log.txt")
+            self.assertEqual(self.wrapper.pull_file("R58N123ABC", "/sdcard/log.txt", local), "")
+            self.assertFalse(os.path.exists(local))
+        self.binary.assert_not_called()
+
+    def test_pull_timeout_counts_against_device(self):
+        sync = mock.patch("autoxium.core.adb_wrapper.SyncConnection").start()
+        sync.return_value.__enter__.return_value.pull_to_file.side_effect = TimeoutError()
+        for _ in range(2):
+            self.assertEqual(self.wrapper.pull_file("R58N123ABC", "/sdcard/a", "a"), "")
+        self.assertFalse(self.wrapper.health.allow("R58N123ABC"))
+        self.assertEqual(self.wrapper.pull_file("R58N123ABC", "/sdcard/a", "a"), "")
+        self.assertEqual(sync.call_count, 2)
+        self.binary.assert_not_called()
+
+    def test_pull_without_sync_service_uses_binary(self):
+        mock.patch(
+            "autoxium.core.adb_wrapper.SyncConnection",
+            side_effect=ConnectionRefusedError(),
+        ).start()
+        mock.patch.object(self.wrapper, "_run_native", return_value=None).start()
+        self.assertEqual(self.wrapper.pull_file("R58N123ABC", "/sdcard/a", "a"), "ok")
+        self.binary.assert_called_once()
+
+
+class TestDeviceInfoCache(unittest.TestCase):
+    def test_reconnect_invalidates_entry(self):
+        cache = DeviceInfoCache()
+        cache.put("R58N123ABC", "3", DeviceInfo(model="SM-A725F"))
+        self.assertEqual(cache.get("R58N123ABC", "3").model, "SM-A725F")
+        # New transport id after a reconnect
+        self.assertIsNone(cache.get("R58N123ABC", "7"))
+        self.assertIsNone(cache.get("R58N123ABC", "3"))
+
+    def test_retain_drops_disconnected(self):
+        cache = DeviceInfoCache()
+        cache.put("a", "1", DeviceInfo())
+        cache.put("b", "2", DeviceInfo())
+        cache.retain(["b"])
+        self.assertIsNone(cache.get("a", "1"))
+        self.assertIsNotNone(cache.get("b", "2"))
+
+
+class TestDeviceHealthTracker(unittest.TestCase):
+    def test_opens_after_threshold_and_backs_off(self):
+        health = DeviceHealthTracker(failure_threshold=2, base_backoff=0.0)
+        self.assertFalse(health.record_failure("a"))
+        self.assertTrue(health.record_failure("a"))
+        # A failed probe reopens the circuit at once
+        self.assertTrue(health.record_failure("a"))
+        health.record_success("a")
+        self.assertFalse(health.record_failure("a"))
+
+    def test_open_circuit_blocks_calls(self):
+        health = DeviceHealthTracker(failure_threshold=1, base_backoff=60.0)
+        health.record_failure("a")
+        self.assertTrue(health.is_open("a"))
+        self.assertTrue(health.allow("b"))
+        health.retain(["b"])
+        self.assertTrue(health.allow("a"))
+
+    def test_half_open_lets_one_probe_through(self):
+        health = DeviceHealthTracker(failure_threshold=1, base_backoff=0.0)
+        health.record_failure("a")
+        self.assertTrue(health.allow("a"))  # This thread claims the probe
+        self.assertTrue(health.allow("a"))  # and keeps it for nested calls
+
+        others = []
+        thread = threading.Thread(target=lambda: others.append(health.allow("a")))
+        thread.start()
+        thread.join()
+        self.assertEqual(others, [False])
+
+        health.record_success("a")
+        thread = threading.Thread(target=lambda: others.append(health.allow("a")))
+        thread.start()
+        thread.join()
+        self.assertEqual(others, [False, True])
+
 
 if __name__ == "__main__":
     unittest.main()
@@ -0,0 +1,274 @@
+import asyncio
+import os
+import re
+import socketserver
+import struct
+import tempfile
+import threading
+import time
+import unittest
+from autoxium.core.adb_client import AdbClient, AdbProtocolError, AdbRequestSentError
+from autoxium.core.async_adb_client import AsyncAdbClient
+from autoxium.core.shell_session import ShellSessionPool
+from autoxium.core.sync_protocol import SYNC_DATA_MAX, SyncConnection
+
+
+DEVICES = {
+    "R58N123ABC": {"getprop ro.product.model": b"SM-A725F\r\n"},
+}
+
+
+class FakeAdbHandler(socketserver.BaseRequestHandler):
+    """Speaks just enough of the adb host protocol for the client tests."""
+
+    shell_sessions = 0
+    files = {}
+    max_chunk = 0
+
+    def _read_request(self):
+        size = int(self._recv_exact(4), 16)
+        return self._recv_exact(size).decode()
+
+    def _recv_exact(self, size):
+        buf = b""
+        while len(buf) < size:
+            chunk = self.request.recv(size - len(buf))
+            if not chunk:
+                raise ConnectionError
+            buf += chunk
+        return buf
+
+    def _reply(self, data: bytes):
+        self.request.sendall(b"OKAY" + b"%04x" % len(data) + data)
+
+    def _fail(self, message: str):
+        self.request.sendall(b"FAIL" + b"%04x" % len(message) + message.encode())
+
+    def _serve_shell(self, outputs):
+        """Answers framed commands written by ShellSession until hangup."""
+        FakeAdbHandler.shell_sessions += 1
+        buffer = b""
+        while True:
+            chunk = self.request.recv(4096)
+            if not chunk:
+                return
+            buffer += chunk
+            while True:
+                match = re.search(rb"\{ (.*)\n\} .*? (__AXM_\w+__) \$\?\n", buffer)
+                if not match:
+                    break
+                buffer = buffer[match.end():]
+                output = outputs.get(match.group(1).decode(), b"")
+                exit_code = b"0" if output else b"127"
+                self.request.sendall(output + b"\n" + match.group(2) + b" " + exit_code + b"\n")
+
+    def _serve_sync(self):
+        """In-memory file store answering STAT/SEND/RECV."""
+        files = FakeAdbHandler.files
+        while True:
+            request_id = self._recv_exact(4)
+            length = struct.unpack("<I", self._recv_exact(4))[0]
+            if request_id == b"QUIT":
+                return
+            argument = self._recv_exact(length).decode()
+            if request_id == b"STAT":
+                data = files.get(argument)
+                mode = 0o100644 if data is not None else 0
+                self.request.sendall(b"STAT" + struct.pack("<III", mode, len(data or b""), 0))
+            elif request_id == b"SEND":
+                path = argument.rsplit(",", 1)[0]
+                data = b""
+                while True:
+                    chunk_id = self._recv_exact(4)
+                    size = struct.unpack("<I", self._recv_exact(4))[0]
+                    if chunk_id == b"DONE":
+                        break
+                    FakeAdbHandler.max_chunk = max(FakeAdbHandler.max_chunk, size)
+                    data += self._recv_exact(size)
+                files[path] = data
+                self.request.sendall(b"OKAY" + struct.pack("<I", 0))
+            elif request_id == b"RECV":
+                data = files.get(argument)
+                if data is None:
+                    message = b"No such file or directory"
+                    self.request.sendall(b"FAIL" + struct.pack("<I", len(message)) + message)
+                    continue
+                for offset in range(0, len(data), SYNC_DATA_MAX):
+                    chunk = data[offset : offset + SYNC_DATA_MAX]
+                    self.request.sendall(b"DATA" + struct.pack("<I", len(chunk)) + chunk)
+                self.request.sendall(b"DONE" + struct.pack("<I", 0))
+
+    def handle(self):
+        request = self._read_request()
+        if request == "host:version":
+            self._reply(b"0029")
+        elif request == "host:devices-l":
+            self._reply(b"R58N123ABC     device product:a72q model:SM_A725F device:a72q transport_id:1\n")
+        elif request == "host:track-devices-l":
+            self.request.sendall(b"OKAY")
+            for listing in (b"", b"R58N123ABC\tunauthorized transport_id:1\n"):
+                self.request.sendall(b"%04x" % len(listing) + listing)
+        elif request.startswith("host:transport:"):
+            serial = request.split(":", 2)[2]
+            if serial not in DEVICES:
+                self._fail(f"device '{serial}' not found")
+                return
+            self.request.sendall(b"OKAY")
+            service = self._read_request()
+            if service == "shell:hangup":
+                return
+            self.request.sendall(b"OKAY")
+            kind, _, command = service.partition(":")
+            if service == "exec:sh":
+                self._serve_shell(DEVICES[serial])
+                return
+            if service == "sync:":
+                self._serve_sync()
+                return
+            self.request.sendall(DEVICES[serial].get(command, b""))
+        else:
+            self._fail("unknown host service")
+
+
+class TestAdbClient(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), FakeAdbHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.client = AdbClient(port=cls.server.server_address[1], timeout=2.0)
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_is_available(self):
+        self.assertTrue(self.client.is_available())
+
+    def test_devices_listing(self):
+        self.assertIn("model:SM_A725F", self.client.devices())
+
+    def test_shell_normalizes_line_endings(self):
+        out = self.client.shell("R58N123ABC", "getprop ro.product.model")
+        self.assertEqual(out, "SM-A725F")
+
+    def test_track_devices_stream(self):
+        tracker = self.client.track_devices()
+        try:
+            self.assertEqual(tracker.poll(2.0), "")
+            self.assertIn("unauthorized", tracker.poll(2.0))
+            # Server hangs up after the scripted updates
+            with self.assertRaises(ConnectionError):
+                tracker.poll(2.0)
+        finally:
+            tracker.close()
+
+    def test_unknown_device_raises(self):
+        with self.assertRaises(AdbProtocolError):
+            self.client.shell("missing", "getprop")
+
+    def test_hangup_after_request_is_reported(self):
+        with self.assertRaises(AdbRequestSentError):
+            self.client.shell("R58N123ABC", "hangup")
+
+    def test_shell_session_pool_reuses_session(self):
+        pool = ShellSessionPool(client=self.client)
+        before = FakeAdbHandler.shell_sessions
+        try:
+            for _ in range(3):
+                self.assertEqual(
+                    pool.run("R58N123ABC", "getprop ro.product.model"), (0, "SM-A725F")
+                )
+            self.assertEqual(pool.run("R58N123ABC", "nosuchcmd")[0], 127)
+            self.assertEqual(FakeAdbHandler.shell_sessions - before, 1)
+        finally:
+            pool.close()
+
+    def test_sync_push_and_pull(self):
+        payload = bytes(range(256)) * 1000  # spans several DATA chunks
+        updates = []
+        with SyncConnection("R58N123ABC", self.client) as sync:
+            sync.push(payload, "/sdcard/blob.bin", progress=lambda p: updates.append(p.transferred))
+            self.assertEqual(sync.stat("/sdcard/blob.bin").size, len(payload))
+            chunks = list(sync.pull("/sdcard/blob.bin"))
+            with self.assertRaises(AdbProtocolError):
+                list(sync.pull("/sdcard/missing.bin"))
+        self.assertEqual(b"".join(chunks), payload)
+        self.assertLessEqual(FakeAdbHandler.max_chunk, SYNC_DATA_MAX)
+        self.assertEqual(updates[-1], len(payload))
+
+    def test_sync_transfer_deadline(self):
+        FakeAdbHandler.files["/sdcard/big.bin"] = bytes(SYNC_DATA_MAX * 4)
+        received = []
+
+        def stall(progress):
+            received.append(progress.transferred)
+            time.sleep(0.1)
+
+        with SyncConnection("R58N123ABC", self.client) as sync:
+            with self.assertRaises(TimeoutError):
+                for _ in sync.pull("/sdcard/big.bin", stall, timeout=0.15):
+                    pass
+        self.assertLess(len(received), 4)
+
+    def test_unreachable_server(self):
+        client = AdbClient(port=1, timeout=0.5)
+        self.assertFalse(client.is_available())
+
+
+class TestAsyncAdbClient(unittest.TestCase):
+    @classmethod
+    def setUpClass(cls):
+        cls.server = socketserver.ThreadingTCPServer(("127.0.0.1", 0), FakeAdbHandler)
+        cls.server.daemon_threads = True
+        threading.Thread(target=cls.server.serve_forever, daemon=True).start()
+        cls.port = cls.server.server_address[1]
+
+    @classmethod
+    def tearDownClass(cls):
+        cls.server.shutdown()
+        cls.server.server_close()
+
+    def test_concurrent_shell_calls(self):
+        client = AsyncAdbClient(port=self.port, per_device_concurrency=2)
+
+        async def main():
+            return await asyncio.gather(
+                *(client.shell("R58N123ABC", "getprop ro.product.model") for _ in range(10))
+            )
+
+        self.assertEqual(asyncio.run(main()), ["SM-A725F"] * 10)
+
+    def test_devices(self):
+        client = AsyncAdbClient(port=self.port)
+        devices = asyncio.run(client.devices())
+        self.assertEqual(devices[0][:2], ("R58N123ABC", "device"))
+
+    def test_unknown_device_raises(self):
+        client = AsyncAdbClient(port=self.port)
+        with self.assertRaises(AdbProtocolError):
+            asyncio.run(client.shell("missing", "getprop"))
+
+    def test_push_and_pull_over_sync(self):
+        client = AsyncAdbClient(port=self.port)
+        payload = bytes(range(256)) * 1000  # spans several DATA chunks
+        with tempfile.TemporaryDirectory() as tmp:
+            source = os.path.join(tmp, "blob.bin")
+            with open(source, "wb") as f:
+                f.write(payload)
+            target = os.path.join(tmp, "copy.bin")
+
+            async def main():
+                await client.push("R58N123ABC", source, "/sdcard/async.bin")
+                return await client.pull("R58N123ABC", "/sdcard/async.bin", target)
+
+            self.assertIn(f"({len(payload)} bytes)", asyncio.run(main()))
+            with open(target, "rb") as f:
+                self.assertEqual(f.read(), payload)
+            with self.assertRaises(AdbProtocolError):
+                asyncio.run(client.pull("R58N123ABC", "/sdcard/missing.bin", target))
+
+
+if __name__ == "__main__":
+    unittest.main()
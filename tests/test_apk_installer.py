@@ -0,0 +1,113 @@
+import os
+import struct
+import tempfile
+import unittest
+import zipfile
+from autoxium.core.apk_installer import FleetInstaller, parse_installed_version
+from autoxium.utils.apk_manifest import parse_manifest_attributes, read_apk_info
+
+DUMPSYS = """Packages:
+  Package [com.example.app] (5d3c0f1):
+    versionCode=300 minSdk=24 targetSdk=34
+Hidden system packages:
+  Package [com.example.app] (9a1b2c3):
+    versionCode=100 minSdk=24 targetSdk=34
+"""
+
+NO_VALUE = 0xFFFFFFFF
+TYPE_INT_DEC = 0x10
+
+
+def build_manifest(package: str, version_code: int, version_name: str) -> bytes:
+    """Encodes a minimal binary AndroidManifest.xml (UTF-16 string pool)."""
+    strings = ["versionCode", "versionName", "package", "manifest", package, version_name]
+    encoded = b"".join(
+        struct.pack("<H", len(s)) + s.encode("utf-16-le") + b"\0\0" for s in strings
+    )
+    offsets, pos = [], 0
+    for s in strings:
+        offsets.append(pos)
+        pos += 2 + len(s) * 2 + 2
+    encoded += b"\0" * (-len(encoded) % 4)
+    pool_header = 28 + 4 * len(strings)
+    pool = struct.pack(
+        "<HHIIIIII", 0x0001, 28, pool_header + len(encoded), len(strings), 0, 0, pool_header, 0
+    ) + struct.pack(f"<{len(strings)}I", *offsets) + encoded
+
+    resource_map = struct.pack("<HHI", 0x0180, 8, 16) + struct.pack("<II", 0x0101021B, 0x0101021C)
+
+    attributes = [
+        (0, NO_VALUE, TYPE_INT_DEC, version_code),  # versionCode
+        (1, 5, 0x03, 5),  # versionName
+        (2, 4, 0x03, 4),  # package
+    ]
+    # line number, comment, then namespace, name and the attribute layout
+    body = struct.pack("<II", 1, NO_VALUE) + struct.pack(
+        "<IIHHHHHH", NO_VALUE, 3, 20, 20, len(attributes), 0, 0, 0
+    )
+    for name, raw, data_type, value in attributes:
+        body += struct.pack("<IIIHBBI", NO_VALUE, name, raw, 8, 0, data_type, value)
+    element = struct.pack("<HHI", 0x0102, 16, 8 + len(body)) + body
+
+    chunks = pool + resource_map + element
+    return struct.pack("<HHI", 0x0003, 8, 8 + len(chunks)) + chunks
+
+
+class FakeWrapper:
+    def __init__(self, installed):
+        self.installed = installed
+        self.commands = []
+
+    def shell_command(self, serial, command):
+        version = self.installed.get(serial)
+        if version is None:
+            return ""
+        return (
+            "Packages:\n  Package [com.example.app] (1f2e3d4):\n"
+            f"    versionCode={version} minSdk=24 targetSdk=34\n"
+        )
+
+    def run_command(self, args, timeout=None):
+        self.commands.append(args)
+        return "Performing Streamed Install\nSuccess"
+
+
+class TestApkInstaller(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.apk = os.path.join(self.tmp.name, "app.apk")
+        with zipfile.ZipFile(self.apk, "w") as apk:
+            apk.writestr("AndroidManifest.xml", build_manifest("com.example.app", 42, "1.2.3"))
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def test_parse_manifest(self):
+        attributes = parse_manifest_attributes(build_manifest("com.example.app", 7, "0.7"))
+        self.assertEqual(attributes["package"], "com.example.app")
+        self.assertEqual(attributes["versionCode"], 7)
+
+    def test_read_apk_info(self):
+        info = read_apk_info(self.apk)
+        self.assertEqual((info.package, info.version_code, info.version_name), ("com.example.app", 42, "1.2.3"))
+
+    def test_skips_devices_already_current(self):
+        wrapper = FakeWrapper({"a": 42, "b": 41, "d": 43})
+        results = FleetInstaller(wrapper, max_concurrency=2).install(
+            ["a", "b", "c", "d"], [self.apk]
+        )
+        self.assertEqual(
+            [r.status for r in results], ["skipped", "installed", "installed", "skipped"]
+        )
+        self.assertEqual(results[3].message, "Newer version 43 installed")
+        self.assertEqual(sorted(args[1] for args in wrapper.commands), ["b", "c"])
+
+    def test_version_from_the_package_block(self):
+        self.assertEqual(parse_installed_version(DUMPSYS, "com.example.app"), 300)
+        hidden_only = DUMPSYS[DUMPSYS.index("Hidden"):]
+        self.assertIsNone(parse_installed_version(hidden_only, "com.example.app"))
+        self.assertIsNone(parse_installed_version(DUMPSYS, "com.example"))
+
+
+if __name__ == "__main__":
+    unittest.main()
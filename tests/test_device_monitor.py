@@ -0,0 +1,71 @@
+import unittest
+from unittest import mock
+from autoxium.core.adb_client import adb_client
+from autoxium.core.adb_wrapper import adb
+from autoxium.core.device_monitor import DeviceMonitorWorker
+from autoxium.models.device import Device, DeviceChangeSet
+
+
+class TestDeviceChangeSet(unittest.TestCase):
+    def test_between(self):
+        previous = {"a": Device("a", "Online"), "b": Device("b", "Online")}
+        current = {
+            "b": Device("b", "Offline", model="Pixel 7"),
+            "c": Device("c", "Online"),
+        }
+        changes = DeviceChangeSet.between(previous, current)
+        self.assertEqual([d.serial for d in changes.added], ["c"])
+        self.assertEqual(changes.removed, ["a"])
+        self.assertEqual(len(changes.changed), 1)
+        self.assertEqual(changes.changed[0].fields, ("status", "model"))
+        self.assertFalse(DeviceChangeSet.between(current, dict(current)))
+
+
+class TestDeviceMonitorWorker(unittest.TestCase):
+    def test_publishes_only_changes(self):
+        worker = DeviceMonitorWorker()
+        emitted, states = [], []
+        worker.devices_changed.connect(emitted.append)
+        worker.device_state_changed.connect(lambda d: states.append(d.serial))
+
+        worker._publish([Device("a", "Online")])
+        worker._publish([Device("a", "Online")])
+        self.assertEqual(len(emitted), 1)
+
+        worker._publish([Device("a", "Unauthorized")])
+        self.assertEqual(len(emitted), 2)
+        self.assertEqual(emitted[-1].changed[0].fields, ("status",))
+        self.assertEqual(states, ["a"])
+
+    def test_refresh_is_published_from_the_monitor(self):
+        worker = DeviceMonitorWorker()
+        emitted = []
+        worker.devices_changed.connect(emitted.append)
+        worker._listing = "a\tdevice\n"
+        worker._publish([Device("a", "Online")])
+
+        calls = []
+
+        def devices_from_listing(listing, refresh=False):
+            calls.append((listing, refresh))
+            return [Device("a", "Online", model="Pixel 7")]
+
+        class Tracker:
+            def poll(self, timeout):
+                worker.running = False
+                return None
+
+            def close(self):
+                pass
+
+        worker.request_refresh()
+        with mock.patch.object(adb, "devices_from_listing", devices_from_listing), \
+                mock.patch.object(adb_client, "track_devices", Tracker):
+            worker._track()
+        self.assertEqual(calls, [("a\tdevice\n", True)])
+        self.assertEqual(emitted[-1].changed[0].fields, ("model",))
+        self.assertFalse(worker._take_refresh())
+
+
+if __name__ == "__main__":
+    unittest.main()
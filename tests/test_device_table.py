@@ -0,0 +1,98 @@
+import unittest
+from autoxium.models.device import Device
+from autoxium.ui.components.device_table import (
+    DeviceFilterProxyModel,
+    DeviceTableModel,
+)
+
+
+class TestDeviceTableModel(unittest.TestCase):
+    def setUp(self):
+        self.model = DeviceTableModel()
+        self.events = []
+        self.model.rowsInserted.connect(
+            lambda _, first, last: self.events.append(("insert", first, last))
+        )
+        self.model.rowsRemoved.connect(
+            lambda _, first, last: self.events.append(("remove", first, last))
+        )
+        self.model.dataChanged.connect(
+            lambda top, bottom, _: self.events.append(
+                ("changed", top.row(), top.column(), bottom.column())
+            )
+        )
+
+    def test_unchanged_update_emits_nothing(self):
+        devices = [Device("a", "Online"), Device("b", "Online")]
+        self.model.update_devices(devices)
+        self.events.clear()
+        self.model.update_devices([Device("a", "Online"), Device("b", "Online")])
+        self.assertEqual(self.events, [])
+
+    def test_diff_updates(self):
+        self.model.update_devices([Device("a", "Online"), Device("b", "Online")])
+        self.events.clear()
+        self.model.update_devices([Device("b", "Offline"), Device("c", "Online")])
+        self.assertEqual(
+            self.events,
+            [
+                ("remove", 0, 0),
+                ("changed", 0, 6, 6),  # Status only
+                ("insert", 1, 1),
+            ],
+        )
+        self.assertEqual([d.serial for d in self.model.devices], ["b", "c"])
+        self.assertEqual(self.model.data(self.model.index(0, 6)), "Offline")
+
+    def test_adjacent_removals_are_grouped(self):
+        self.model.update_devices([Device(s, "Online") for s in "abcdef"])
+        self.events.clear()
+        self.model.update_devices([Device(s, "Online") for s in "adf"])
+        self.assertEqual(self.events, [("remove", 4, 4), ("remove", 1, 2)])
+        self.assertEqual(self.model._row_of, {"a": 0, "d": 1, "f": 2})
+
+
+class TestDeviceFilterProxyModel(unittest.TestCase):
+    def test_filters_by_search_index(self):
+        model = DeviceTableModel()
+        proxy = DeviceFilterProxyModel()
+        proxy.setSourceModel(model)
+        model.update_devices(
+            [
+                Device("R58M1", "Online", model="SM-A725F", product="Galaxy A72"),
+                Device("emulator-5554", "Online", model="sdk_gphone64", android_version="14"),
+            ]
+        )
+        proxy.set_filter_text("GALAXY")
+        self.assertEqual(proxy.rowCount(), 1)
+        # Rows added later are filtered too
+        model.update_devices(model.devices + [Device("R58M2", "Online", product="Galaxy S21")])
+        self.assertEqual(proxy.rowCount(), 2)
+        proxy.set_filter_text("14")
+        self.assertEqual(proxy.rowCount(), 1)
+        proxy.set_filter_text("")
+        self.assertEqual(proxy.rowCount(), 3)
+
+    def test_numbers_rows_in_display_order(self):
+        model = DeviceTableModel()
+        proxy = DeviceFilterProxyModel()
+        proxy.setSourceModel(model)
+        model.update_devices(
+            [Device("c", "Online"), Device("a", "Online"), Device("b", "Online")]
+        )
+        proxy.sort(1)
+        proxy.set_filter_text("b")
+
+        def numbered():
+            return [
+                (proxy.data(proxy.index(row, 0)), proxy.data(proxy.index(row, 1)))
+                for row in range(proxy.rowCount())
+            ]
+
+        self.assertEqual(numbered(), [("1", "b")])
+        proxy.set_filter_text("")
+        self.assertEqual(numbered(), [("1", "a"), ("2", "b"), ("3", "c")])
+
+
+if __name__ == "__main__":
+    unittest.main()
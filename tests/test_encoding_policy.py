@@ -0,0 +1,40 @@
+import unittest
+from autoxium.core.encoding_policy import EncodingPolicy, EncodingProfile
+
+
+class TestEncodingPolicy(unittest.TestCase):
+    def setUp(self):
+        self.policy = EncodingPolicy()
+
+    def test_single_mirror(self):
+        profile = self.policy.choose(tile_size=797, mirror_count=1, cpu_percent=10)
+        self.assertEqual((profile.max_size, profile.max_fps), (800, 60))
+
+    def test_wall_of_small_tiles_under_load(self):
+        profile = self.policy.choose(tile_size=350, mirror_count=20, cpu_percent=90)
+        self.assertEqual(profile.max_size, 352)
+        self.assertEqual(profile.max_fps, 15)
+        self.assertEqual(profile.bit_rate, 500_000)
+
+    def test_cpu_is_read_from_the_last_sample(self):
+        self.assertEqual(self.policy.cpu_percent(), 0.0)
+        sampled = self.policy.sample_cpu()
+        self.assertEqual(self.policy.cpu_percent(), sampled)
+        self.assertEqual(self.policy.cpu_percent(), sampled)
+
+    def test_renegotiation_threshold(self):
+        current = EncodingProfile(800, 2_000_000, 60)
+        self.assertFalse(
+            self.policy.needs_renegotiation(current, EncodingProfile(720, 1_500_000, 60), 60)
+        )
+        self.assertTrue(
+            self.policy.needs_renegotiation(current, EncodingProfile(352, 500_000, 20), 60)
+        )
+        # Freshly started sessions are left alone
+        self.assertFalse(
+            self.policy.needs_renegotiation(current, EncodingProfile(352, 500_000, 20), 5)
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,55 @@
+import threading
+import time
+import unittest
+from concurrent.futures import wait
+from autoxium.core.input_broadcast import InputBroadcaster
+
+
+class FakeWrapper:
+    def __init__(self):
+        self.sent = []
+        self.lock = threading.Lock()
+
+    def shell_command(self, serial, command, timeout=None):
+        return ""
+
+    def send_input(self, serial, kind, args):
+        if kind == "tap":
+            time.sleep(0.05)  # Slow first event must still run first
+        with self.lock:
+            self.sent.append((serial, kind, args))
+
+
+class TestInputBroadcaster(unittest.TestCase):
+    def test_fans_out_to_group(self):
+        wrapper = FakeWrapper()
+        broadcaster = InputBroadcaster(wrapper)
+        broadcaster.set_targets("a", ["a", "b", "c"])
+        self.assertEqual(broadcaster.targets("a"), {"b", "c"})
+
+        wait(broadcaster.send("a", "key", (4,)))
+        self.assertEqual(
+            sorted(wrapper.sent), [(s, "key", (4,)) for s in ("a", "b", "c")]
+        )
+
+        broadcaster.clear("a")
+        wrapper.sent.clear()
+        wait(broadcaster.send("a", "tap", (1, 2)))
+        self.assertEqual(wrapper.sent, [("a", "tap", (1, 2))])
+        self.assertFalse(broadcaster.is_broadcasting("a"))
+
+    def test_keeps_order_per_device(self):
+        wrapper = FakeWrapper()
+        broadcaster = InputBroadcaster(wrapper)
+        broadcaster.set_targets("a", ["b"])
+        futures = broadcaster.send("a", "tap", (1, 2))
+        futures += broadcaster.send("a", "swipe", (1, 2, 3, 4, 100))
+        wait(futures)
+        for serial in ("a", "b"):
+            self.assertEqual(
+                [kind for s, kind, _ in wrapper.sent if s == serial], ["tap", "swipe"]
+            )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,92 @@
+import logging
+import threading
+import unittest
+from unittest import mock
+from autoxium.utils.log_store import LogStore, _Block
+
+
+def record(msg, level=logging.INFO, **extra):
+    return logging.makeLogRecord({"msg": msg, "levelno": level, **extra})
+
+
+class TestLogStore(unittest.TestCase):
+    def setUp(self):
+        self.store = LogStore(capacity=64, block_size=8)
+        self.store.add_serials(["emulator-5554", "R58M123"])
+        levels = [logging.DEBUG, logging.INFO, logging.WARNING, logging.ERROR]
+        serials = ["emulator-5554", "R58M123", "nobody"]
+        for i in range(40):
+            self.store.handle(record(f"Step {i} on {serials[i % 3]}", levels[i % 4]))
+
+    def messages(self, seqs):
+        return [self.store.entry(s).message for s in seqs]
+
+    def test_filters_by_level_and_serial(self):
+        seqs, end = self.store.query(min_level=logging.WARNING)
+        self.assertEqual(end, 40)
+        self.assertEqual(len(seqs), 20)
+        self.assertEqual(list(seqs), sorted(seqs))
+
+        seqs, _ = self.store.query(serial="R58M123", min_level=logging.ERROR)
+        self.assertEqual(
+            self.messages(seqs),
+            [f"Step {i} on R58M123" for i in range(40) if i % 3 == 1 and i % 4 == 3],
+        )
+        self.assertEqual(self.store.entry(seqs[0]).serial, "R58M123")
+
+    def test_text_search_is_case_insensitive(self):
+        # Sealed blocks and the open one are both searched
+        seqs, _ = self.store.query(text="STEP 3")
+        self.assertEqual(list(seqs), [3] + list(range(30, 40)))
+
+        seqs, _ = self.store.query(
+            text="step", serial="emulator-5554", min_level=logging.ERROR
+        )
+        self.assertEqual(
+            self.messages(seqs),
+            [f"Step {i} on emulator-5554" for i in (3, 15, 27, 39)],
+        )
+
+    def test_sealed_blocks_are_searched_without_the_lock(self):
+        locked = []
+        matches = _Block.matches
+
+        def probe(block, needle):
+            # Whether another thread (the log listener) could log right now
+            free = []
+
+            def try_lock():
+                free.append(self.store.lock.acquire(timeout=0.2))
+                if free[0]:
+                    self.store.lock.release()
+
+            thread = threading.Thread(target=try_lock)
+            thread.start()
+            thread.join()
+            locked.append(not free[0])
+            return matches(block, needle)
+
+        with mock.patch.object(_Block, "matches", probe):
+            seqs, _ = self.store.query(text="step")
+        self.assertEqual(len(seqs), 40)
+        self.assertEqual(locked, [False] * 4 + [True])
+
+    def test_incremental_query(self):
+        _, end = self.store.query(serial="R58M123")
+        self.store.handle(record("late", logging.ERROR, serial="R58M123"))
+        seqs, _ = self.store.query(serial="R58M123", start=end)
+        self.assertEqual(self.messages(seqs), ["late"])
+
+    def test_oldest_block_is_evicted(self):
+        for i in range(40, 80):
+            self.store.handle(record(f"Step {i} on R58M123"))
+        self.assertEqual(len(self.store), 64)
+        self.assertIsNone(self.store.entry(0))
+        seqs, _ = self.store.query(serial="R58M123")
+        self.assertGreaterEqual(seqs[0], self.store.first_seq)
+        seqs, _ = self.store.query(text="step 1 ")
+        self.assertEqual(list(seqs), [])
+
+
+if __name__ == "__main__":
+    unittest.main()
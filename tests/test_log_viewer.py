@@ -0,0 +1,70 @@
+import logging
+import threading
+import unittest
+from autoxium.ui.components.log_viewer import LogQueryWorker, LogTableModel
+from autoxium.utils.log_store import LogStore
+from autoxium.utils.logger import add_log_sink, logger, remove_log_sink
+
+
+class TestLogPipeline(unittest.TestCase):
+    def log_lines(self, store, numbers):
+        # Odd lines are errors
+        for i in numbers:
+            level = logging.ERROR if i % 2 else logging.INFO
+            store.handle(logging.makeLogRecord({"msg": f"dev1 line {i}", "levelno": level}))
+
+    def test_model_follows_store(self):
+        store = LogStore(capacity=8, block_size=4)
+        store.add_serials(["dev1"])
+        model = LogTableModel(store)
+        model.set_filter(min_level=logging.WARNING)
+        self.log_lines(store, range(6))
+        model.refresh()
+        self.assertEqual(model.rowCount(), 3)
+        self.assertEqual(model.data(model.index(0, 3)), "dev1 line 1")
+        self.assertEqual(model.data(model.index(0, 2)), "dev1")
+
+        # Rows of evicted blocks are removed, new ones appended
+        self.log_lines(store, range(6, 12))
+        model.refresh()
+        rows = [model.data(model.index(r, 3)) for r in range(model.rowCount())]
+        self.assertEqual(rows, [f"dev1 line {i}" for i in (5, 7, 9, 11)])
+
+    def test_background_query_results(self):
+        store = LogStore(capacity=8, block_size=4)
+        self.log_lines(store, range(6))
+        model = LogTableModel(store)
+        worker = LogQueryWorker(store, (logging.ERROR, "", "line 3"))
+        worker.run()
+        model.set_results(worker.log_filter, *worker.result)
+        self.assertEqual(model.log_filter(), (logging.ERROR, "", "line 3"))
+        self.assertEqual(model.rowCount(), 1)
+
+        # Later records are matched against the new filter
+        self.log_lines(store, [13])
+        store.handle(logging.makeLogRecord({"msg": "line 3 again", "levelno": logging.ERROR}))
+        model.refresh()
+        self.assertEqual(model.data(model.index(1, 3)), "line 3 again")
+
+    def test_sink_receives_records_on_listener_thread(self):
+        threads = []
+        done = threading.Event()
+
+        class Sink(logging.Handler):
+            def emit(self, record):
+                threads.append(threading.current_thread())
+                if record.getMessage() == "sink test":
+                    done.set()
+
+        sink = Sink()
+        add_log_sink(sink)
+        try:
+            logger.info("sink test")
+            self.assertTrue(done.wait(2))
+        finally:
+            remove_log_sink(sink)
+        self.assertNotIn(threading.current_thread(), threads)
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,169 @@
+import socket
+import struct
+import tempfile
+import threading
+import time
+import unittest
+from pathlib import Path
+from unittest import mock
+from autoxium.core.logcat import (
+    LogcatCollector,
+    LogcatParser,
+    LogcatSpool,
+    decode_entry,
+    read_segment,
+)
+from autoxium.models.device import Device, DeviceChange, DeviceChangeSet
+
+
+def entry_bytes(sec, msg, tag="Test", priority=4, header_size=28):
+    payload = bytes([priority]) + tag.encode() + b"\0" + msg.encode() + b"\0"
+    header = struct.pack("<HHiIII", len(payload), header_size, 100, 101, sec, 500)
+    return header + b"\0" * (max(header_size, 20) - 20) + payload
+
+
+class FakeClient:
+    """Hands out one end of a socket pair per logcat command."""
+
+    def __init__(self):
+        self.commands = []
+        self.devices = []
+        self.connected = threading.Event()
+        self.failures = 0  # Connections to refuse first
+
+    def open_transport(self, serial, service, timeout=None):
+        if self.failures:
+            self.failures -= 1
+            raise ConnectionResetError("device offline")
+        ours, theirs = socket.socketpair()
+        self.commands.append(service)
+        self.devices.append(theirs)
+        self.connected.set()
+        return ours
+
+
+def wait_for(condition, timeout=3.0):
+    deadline = time.monotonic() + timeout
+    while not condition():
+        if time.monotonic() > deadline:
+            return False
+        time.sleep(0.02)
+    return True
+
+
+class TestLogcatParsing(unittest.TestCase):
+    def test_split_across_chunks_and_header_versions(self):
+        data = entry_bytes(1, "first") + entry_bytes(2, "second", header_size=0)
+        parser = LogcatParser()
+        raw = []
+        for i in range(0, len(data), 7):
+            raw.extend(parser.feed(data[i : i + 7]))
+        entries = [decode_entry(r) for r in raw]
+        self.assertEqual([e.message for e in entries], ["first", "second"])
+        self.assertEqual(entries[0].time_ns, 1_000_000_500)
+        self.assertEqual((entries[0].tag, entries[0].level), ("Test", "I"))
+
+    def test_spool_round_trip(self):
+        with tempfile.TemporaryDirectory() as tmp:
+            spool = LogcatSpool(Path(tmp), max_bytes=1 << 20)
+            for sec in range(1, 4):
+                raw = entry_bytes(sec, f"line {sec}")
+                spool.write(raw, decode_entry(raw))
+            spool.close()
+            (segment,) = spool.segments()
+            self.assertEqual(
+                [e.message for e in read_segment(segment)], ["line 1", "line 2", "line 3"]
+            )
+            self.assertEqual(LogcatSpool(Path(tmp), 0).last_time_ns(), 3_000_000_500)
+
+
+class TestLogcatCollector(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.client = FakeClient()
+        self.collector = LogcatCollector(
+            self.client, Path(self.tmp.name), readers=2, ring_size=100, max_bytes=1 << 20
+        )
+
+    def tearDown(self):
+        self.collector.stop_all()
+        for sock in self.client.devices:
+            sock.close()
+        self.tmp.cleanup()
+
+    def test_capture_and_resume_after_reconnect(self):
+        online = Device("dev1", "Online")
+        self.collector.apply_changes(DeviceChangeSet(added=[online]))
+        self.assertTrue(self.client.connected.wait(2))
+        self.assertEqual(self.client.commands, ["exec:logcat -B"])
+
+        self.client.devices[0].sendall(entry_bytes(10, "before") + entry_bytes(11, "a"))
+        self.assertTrue(wait_for(lambda: len(self.collector.recent("dev1")) == 2))
+
+        # Disconnect and come back: the stream resumes after the last entry
+        offline = Device("dev1", "offline")
+        self.collector.apply_changes(
+            DeviceChangeSet(changed=[DeviceChange(offline, ("status",))])
+        )
+        self.assertTrue(wait_for(lambda: not self.collector.streaming()))
+        self.client.connected.clear()
+        self.collector.apply_changes(
+            DeviceChangeSet(changed=[DeviceChange(online, ("status",))])
+        )
+        self.assertTrue(self.client.connected.wait(2))
+        self.assertEqual(self.client.commands[1], "exec:logcat -B -T 11.000000500")
+
+        # logcat -T repeats the entry at the resume point
+        self.client.devices[1].sendall(entry_bytes(11, "a") + entry_bytes(12, "after"))
+        self.assertTrue(wait_for(lambda: len(self.collector.recent("dev1")) == 3))
+        self.assertEqual(
+            [e.message for e in self.collector.recent("dev1")], ["before", "a", "after"]
+        )
+
+        messages = [
+            e.message
+            for segment in self.collector.segments("dev1")
+            for e in read_segment(segment)
+        ]
+        self.assertEqual(messages, ["before", "a", "after"])
+
+    def test_keeps_out_of_order_entries(self):
+        self.collector.apply_changes(DeviceChangeSet(added=[Device("dev1", "Online")]))
+        self.assertTrue(self.client.connected.wait(2))
+
+        # Buffers interleave out of order, and the clock can step back
+        self.client.devices[0].sendall(
+            entry_bytes(20, "main")
+            + entry_bytes(19, "system")
+            + entry_bytes(21, "crash")
+            + entry_bytes(5, "clock stepped back")
+        )
+        self.assertTrue(wait_for(lambda: len(self.collector.recent("dev1")) == 4))
+        self.assertEqual(
+            [e.message for e in self.collector.recent("dev1")],
+            ["main", "system", "crash", "clock stepped back"],
+        )
+
+    @mock.patch("autoxium.core.logcat.RESTART_DELAY", 0.2)
+    def test_flapping_device_gets_one_stream(self):
+        self.client.failures = 1
+        self.collector.start("dev1")
+        self.assertTrue(wait_for(lambda: self.collector._logs["dev1"].retry))
+
+        # Back before the retry fires: the retry must not open a second stream
+        self.collector.stop("dev1")
+        self.collector.start("dev1")
+        self.assertTrue(self.client.connected.wait(2))
+        time.sleep(0.5)
+        self.assertEqual(len(self.client.devices), 1)
+        (reader,) = self.collector._readers
+        self.assertEqual(len(reader.selector.get_map()), 1)
+
+        self.client.devices[0].sendall(entry_bytes(10, "once"))
+        self.assertTrue(wait_for(lambda: len(self.collector.recent("dev1")) == 1))
+        time.sleep(0.1)
+        self.assertEqual([e.message for e in self.collector.recent("dev1")], ["once"])
+
+
+if __name__ == "__main__":
+    unittest.main()
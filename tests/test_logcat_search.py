@@ -0,0 +1,96 @@
+import struct
+import tempfile
+import unittest
+from pathlib import Path
+from autoxium.core.logcat import LogcatSpool, decode_entry
+from autoxium.core.logcat_index import index_path, read_index
+from autoxium.core.logcat_search import LogcatQuery, LogcatSearch, build_index
+
+SECOND = 1_000_000_000
+
+
+def entry_bytes(sec, msg, tag, priority):
+    payload = bytes([priority]) + tag.encode() + b"\0" + msg.encode() + b"\0"
+    return struct.pack("<HHiIII", len(payload), 20, 1, 2, sec, 0) + payload
+
+
+def describe(index):
+    """Blocks with tag names instead of the segment-specific ids."""
+    return [(b[:6], {index.tags[i] for i in b.tag_ids}) for b in index.blocks]
+
+
+class TestLogcatSearch(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.root = Path(self.tmp.name)
+        # Two devices, three blocks each: 100-109s, 200-209s, 300-309s
+        for offset, serial in enumerate(["dev-a", "192.168.1.5:5555"]):
+            spool = LogcatSpool(self.root / f"d{offset}", 1 << 20, serial)
+            for start in (100, 200, 300):
+                for sec in range(start, start + 10):
+                    tag = "Crash" if sec % 5 == 0 else "Chatty"
+                    priority = 6 if tag == "Crash" else 4
+                    raw = entry_bytes(sec + offset, f"{serial} at {sec}", tag, priority)
+                    spool.write(raw, decode_entry(raw))
+                spool.flush()
+            spool.close()
+        self.search = LogcatSearch(self.root)
+
+    def tearDown(self):
+        self.tmp.cleanup()
+
+    def segment(self, device=0):
+        (segment,) = sorted((self.root / f"d{device}").glob("segment-*.lcz"))
+        return segment
+
+    def test_index_describes_blocks(self):
+        index = read_index(index_path(self.segment()))
+        self.assertEqual(sorted(index.tags), ["Chatty", "Crash"])
+        self.assertEqual(
+            [(b.min_ns // SECOND, b.max_ns // SECOND) for b in index.blocks],
+            [(100, 109), (200, 209), (300, 309)],
+        )
+        self.assertEqual(index.blocks[0].priorities, (1 << 4) | (1 << 6))
+
+    def test_query_merges_devices_in_time_order(self):
+        query = LogcatQuery(
+            start_ns=195 * SECOND, end_ns=304 * SECOND, tags=("Crash",), min_priority=6
+        )
+        matches = list(self.search.search(query))
+        self.assertEqual(
+            [(m.serial, m.entry.time_ns // SECOND) for m in matches],
+            [
+                ("dev-a", 200),
+                ("192.168.1.5:5555", 201),
+                ("dev-a", 205),
+                ("192.168.1.5:5555", 206),
+                ("dev-a", 300),
+                ("192.168.1.5:5555", 301),
+            ],
+        )
+
+    def test_device_text_and_limit(self):
+        query = LogcatQuery(serials=("192.168.1.5:5555",), text="at 2")
+        matches = list(self.search.search(query, limit=3))
+        self.assertEqual(
+            [m.entry.message for m in matches],
+            [f"192.168.1.5:5555 at {sec}" for sec in (200, 201, 202)],
+        )
+
+    def test_missing_or_short_index(self):
+        full = read_index(index_path(self.segment()))
+
+        # Blocks the sidecar doesn't list yet are read from the segment
+        sidecar = index_path(self.segment())
+        data = sidecar.read_bytes()
+        sidecar.write_bytes(data[: len(data) // 2])
+        self.assertEqual(self.search.index(self.segment()).blocks, full.blocks)
+
+        # Segments from before indexes existed get one built
+        sidecar.unlink()
+        build_index(self.segment())
+        self.assertEqual(describe(read_index(sidecar)), describe(full))
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,100 @@
+import json
+import os
+import tempfile
+import unittest
+from autoxium.core.adb_wrapper import input_command
+from autoxium.core.macro import (
+    InputEvent,
+    Macro,
+    MacroPlayer,
+    MacroRecorder,
+    compile_macro,
+)
+
+
+class FakeWrapper:
+    def __init__(self):
+        self.listeners = []
+        self.commands = []
+
+    def add_input_listener(self, listener):
+        self.listeners.append(listener)
+
+    def remove_input_listener(self, listener):
+        self.listeners.remove(listener)
+
+    def send(self, serial, kind, args):
+        for listener in list(self.listeners):
+            listener(serial, kind, args)
+
+    def shell_command(self, serial, command, timeout=None):
+        self.commands.append((serial, command))
+        return ""
+
+
+class TestMacro(unittest.TestCase):
+    def test_compile_batches_close_events(self):
+        macro = Macro(
+            [
+                InputEvent(0.0, "key", (4,)),
+                InputEvent(0.1, "key", (3,)),
+                InputEvent(0.2, "tap", (100, 200)),
+                InputEvent(0.25, "key", (187,)),
+                InputEvent(2.0, "swipe", (1, 2, 3, 4, 300)),
+            ]
+        )
+        batches = compile_macro(macro, batch_window=0.3)
+        self.assertEqual(
+            [(b.time, b.command) for b in batches],
+            [
+                (0.0, "input keyevent 4 3; input tap 100 200; input keyevent 187"),
+                (2.0, "input swipe 1 2 3 4 300"),
+            ],
+        )
+
+    def test_save_and_load(self):
+        macro = Macro([InputEvent(0.0, "key", (4,)), InputEvent(1.5, "tap", (5, 6))], "qa")
+        with tempfile.TemporaryDirectory() as tmp:
+            path = os.path.join(tmp, "macro.json")
+            macro.save(path)
+            self.assertEqual(Macro.load(path), macro)
+
+    def test_load_rejects_unsafe_events(self):
+        for event in (
+            [0, "text", "hello"],
+            [0, "tap", "1; rm -rf /sdcard", 2],
+            [0, "key", "home"],
+            [0, "key", True],
+            [0, "swipe"],
+        ):
+            with self.subTest(event=event):
+                data = json.dumps({"version": 1, "events": [event]})
+                with self.assertRaises(ValueError):
+                    Macro.from_json(data)
+        macro = Macro.from_json('{"version":1,"events":[[0,"key","KEYCODE_HOME"]]}')
+        self.assertEqual(macro.events[0].command(), "input keyevent KEYCODE_HOME")
+
+    def test_input_command_quotes_args(self):
+        self.assertEqual(input_command("tap", ("1;", 2)), "input tap '1;' 2")
+
+    def test_record_and_replay(self):
+        wrapper = FakeWrapper()
+        recorder = MacroRecorder(wrapper)
+        recorder.start("a")
+        wrapper.send("a", "key", (4,))
+        wrapper.send("b", "key", (3,))  # Other device, ignored
+        wrapper.send("a", "tap", (10, 20))
+        macro = recorder.stop()
+        self.assertEqual([(e.kind, e.args) for e in macro.events], [("key", (4,)), ("tap", (10, 20))])
+        self.assertEqual(wrapper.listeners, [])
+
+        results = MacroPlayer(wrapper).play(macro, ["x", "y"])
+        self.assertEqual(results, {"x": True, "y": True})
+        self.assertEqual(
+            sorted(wrapper.commands),
+            [("x", "input keyevent 4; input tap 10 20"), ("y", "input keyevent 4; input tap 10 20")],
+        )
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,77 @@
+import os
+import stat
+import sys
+import tempfile
+import threading
+import unittest
+from PyQt6.QtCore import Qt
+from autoxium.core.scrcpy_manager import ScrcpyManager
+
+
+@unittest.skipIf(sys.platform == "win32", "uses a shell script as a stand-in for scrcpy")
+class TestScrcpyManager(unittest.TestCase):
+    def setUp(self):
+        self.tmp = tempfile.TemporaryDirectory()
+        self.manager = ScrcpyManager()
+        self.manager.scrcpy_path = self._fake_scrcpy("exec sleep 30")
+        self.manager.max_sessions = 2
+
+    def _fake_scrcpy(self, script):
+        fake = os.path.join(self.tmp.name, "scrcpy")
+        with open(fake, "w") as f:
+            f.write(f"#!/bin/sh\n{script}\n")
+        os.chmod(fake, os.stat(fake).st_mode | stat.S_IEXEC)
+        return fake
+
+    def tearDown(self):
+        self.manager.stop_all()
+        self.tmp.cleanup()
+
+    def test_reuse_restart_and_cap(self):
+        first = self.manager.start_scrcpy("a", window_title="A")
+        self.assertIs(self.manager.start_scrcpy("a", window_title="A2"), first)
+
+        restarted = self.manager.start_scrcpy("a", bit_rate=2000000)
+        self.assertIsNot(restarted, first)
+        self.assertFalse(first.is_running())
+
+        self.assertIsNotNone(self.manager.start_scrcpy("b"))
+        self.assertIsNone(self.manager.start_scrcpy("c"))  # Cap reached
+
+        self.manager.stop_scrcpy("a")
+        self.assertFalse(restarted.is_running())
+        self.assertEqual([s.serial for s in self.manager.sessions()], ["b"])
+
+    def test_sample(self):
+        self.manager.start_scrcpy("a")
+        (session,) = self.manager.sample()
+        self.assertGreater(session.rss, 0)
+
+    def test_ready_and_failed_signals(self):
+        ready, failed = threading.Event(), []
+        done = threading.Event()
+        # No event loop here, so deliver on the reader thread
+        direct = Qt.ConnectionType.DirectConnection
+        self.manager.session_ready.connect(lambda session: ready.set(), direct)
+        self.manager.session_failed.connect(
+            lambda session, message: (failed.append(message), done.set()), direct
+        )
+
+        self.manager.scrcpy_path = self._fake_scrcpy(
+            "echo 'INFO: Texture: 1080x2400'; exec sleep 30"
+        )
+        session = self.manager.start_scrcpy("a")
+        self.assertTrue(ready.wait(5))
+        self.assertIsNotNone(session.time_to_first_frame)
+        self.manager.stop_scrcpy("a")
+
+        self.manager.scrcpy_path = self._fake_scrcpy(
+            "echo 'ERROR: Device not found'; exit 1"
+        )
+        self.manager.start_scrcpy("b")
+        self.assertTrue(done.wait(5))
+        self.assertEqual(failed, ["ERROR: Device not found"])
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,68 @@
+import struct
+import unittest
+from PyQt6.QtGui import QColor, QImage
+from autoxium.core import screen_capture
+from autoxium.core.screen_capture import (
+    encode_image,
+    frame_to_numpy,
+    frame_to_qimage,
+    parse_raw_screencap,
+)
+
+
+def screencap(width, height, pixel_format, pixels, color_space=True):
+    header = struct.pack("<III", width, height, pixel_format)
+    if color_space:  # Android 9+
+        header += struct.pack("<I", 1)
+    return header + pixels
+
+
+class TestRawScreencap(unittest.TestCase):
+    def test_parses_both_header_sizes(self):
+        pixels = bytes(range(2 * 2 * 4))
+        for color_space, header in ((False, 12), (True, 16)):
+            frame = parse_raw_screencap(screencap(2, 2, 1, pixels, color_space))
+            self.assertEqual((frame.width, frame.height, frame.pixel_format), (2, 2, 1))
+            self.assertEqual(frame.pixels.tobytes(), pixels)
+
+    def test_rejects_bad_output(self):
+        with self.assertRaises(ValueError):
+            parse_raw_screencap(b"\0" * 8)
+        with self.assertRaises(ValueError):
+            parse_raw_screencap(screencap(2, 2, 99, b"\0" * 16))
+        with self.assertRaises(ValueError):
+            parse_raw_screencap(screencap(2, 2, 1, b"\0" * 15))
+
+    def test_pixel_formats(self):
+        red = {
+            1: b"\xff\x00\x00\xff",  # RGBA_8888
+            2: b"\xff\x00\x00\x00",  # RGBX_8888
+            3: b"\xff\x00\x00",  # RGB_888
+            4: struct.pack("<H", 0xF800),  # RGB_565
+            5: b"\x00\x00\xff\xff",  # BGRA_8888
+        }
+        for pixel_format, pixel in red.items():
+            with self.subTest(pixel_format=pixel_format):
+                frame = parse_raw_screencap(screencap(2, 1, pixel_format, pixel * 2))
+                image = frame_to_qimage(frame)
+                self.assertEqual((image.width(), image.height()), (2, 1))
+                self.assertEqual(image.pixelColor(1, 0).getRgb()[:3], (255, 0, 0))
+
+    @unittest.skipUnless(screen_capture.np is not None, "NumPy is not installed")
+    def test_numpy_channels_are_rgb_order(self):
+        frame = parse_raw_screencap(screencap(2, 1, 5, b"\x00\x00\xff\x80" * 2))
+        array = frame_to_numpy(frame)
+        self.assertEqual(array.shape, (1, 2, 4))
+        self.assertEqual(list(array[0, 0]), [255, 0, 0, 128])
+
+    def test_encode_png(self):
+        image = QImage(4, 4, QImage.Format.Format_RGB888)
+        image.fill(QColor("blue"))
+        data = encode_image(image, "png")
+        self.assertTrue(data.startswith(b"\x89PNG"))
+        with self.assertRaises(ValueError):
+            encode_image(image, "bmp2")
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,67 @@
+import os
+import subprocess
+import sys
+import unittest
+from autoxium.core import video_wall
+from autoxium.core.video_wall import decode_stream, thumbnail_size
+
+
+def encode_sample(frames: int = 10, width: int = 64, height: int = 128) -> bytes:
+    """Encodes a synthetic clip into an H.264 Annex B stream."""
+    import av
+
+    encoder = av.CodecContext.create("libx264", "w")
+    encoder.width, encoder.height = width, height
+    encoder.pix_fmt = "yuv420p"
+    encoder.framerate = 30
+    stream = b""
+    for i in range(frames):
+        frame = av.VideoFrame(width, height, "yuv420p")
+        for plane in frame.planes:
+            plane.update(bytes([i * 20 % 256]) * plane.buffer_size)
+        stream += b"".join(bytes(p) for p in encoder.encode(frame))
+    stream += b"".join(bytes(p) for p in encoder.encode(None))
+    return stream
+
+
+class TestVideoWall(unittest.TestCase):
+    def test_thumbnail_size(self):
+        self.assertEqual(thumbnail_size("1080x2400", 320), (144, 320))
+        self.assertEqual(thumbnail_size("", 320), (144, 320))
+
+    @unittest.skipUnless(video_wall.is_available(), "PyAV is not installed")
+    def test_decode_recorded_stream(self):
+        data = encode_sample()
+        chunks = [data[i : i + 1000] for i in range(0, len(data), 1000)]
+        frames = list(decode_stream(chunks, max_fps=0))
+        self.assertEqual(len(frames), 10)
+        width, height, stride, rgb = frames[0]
+        self.assertEqual((width, height), (64, 128))
+        self.assertGreaterEqual(stride, width * 3)
+        self.assertEqual(len(rgb), stride * height)
+
+    @unittest.skipUnless(video_wall.is_available(), "PyAV is not installed")
+    def test_decode_drops_frames_above_max_fps(self):
+        frames = list(decode_stream([encode_sample()], max_fps=0.001))
+        self.assertEqual(len(frames), 1)
+
+    def test_worker_module_has_no_import_side_effects(self):
+        # Every spawned decoder re-imports it; the log listener must stay out
+        code = (
+            "import sys, autoxium.core.wall_stream; "
+            "print('autoxium.utils.logger' in sys.modules)"
+        )
+        env = dict(os.environ, PYTHONPATH=os.pathsep.join(sys.path))
+        output = subprocess.check_output(
+            [sys.executable, "-c", code], env=env, text=True
+        )
+        self.assertEqual(output.strip(), "False")
+
+    def test_queue_is_created_on_first_start(self):
+        wall = video_wall.VideoWall()
+        self.assertIsNone(wall._frames)
+        self.assertEqual(wall.poll(), {})
+
+
+if __name__ == "__main__":
+    unittest.main()
@@ -0,0 +1,76 @@
+import time
+import unittest
+from autoxium.core.window_layout import Rect, Tile, pack_windows
+
+
+def overlaps(a: Rect, b: Rect) -> bool:
+    return (
+        a.x < b.x + b.width
+        and b.x < a.x + a.width
+        and a.y < b.y + b.height
+        and b.y < a.y + a.height
+    )
+
+
+def inside(rect: Rect, screen: Rect) -> bool:
+    return (
+        rect.x >= screen.x
+        and rect.y >= screen.y
+        and rect.x + rect.width <= screen.x + screen.width
+        and rect.y + rect.height <= screen.y + screen.height
+    )
+
+
+class TestWindowLayout(unittest.TestCase):
+    SCREENS = [Rect(0, 0, 1920, 1040), Rect(1920, -200, 2560, 1400)]
+
+    def mixed_tiles(self, count):
+        # Mostly phones, every fifth a landscape tablet
+        return [Tile(1.6 if i % 5 == 0 else 0.45, 27) for i in range(count)]
+
+    def test_single_row_of_phones_fills_height(self):
+        rects = pack_windows([Tile(0.5, 20)] * 3, [Rect(0, 0, 1920, 1000)])
+        self.assertEqual(len({r.y for r in rects}), 1)
+        self.assertEqual(rects[0].height, 1000)
+        self.assertEqual(rects[0].width, 520)
+
+    def test_no_overlap_and_on_screen(self):
+        rects = pack_windows(self.mixed_tiles(37), self.SCREENS)
+        self.assertEqual(len(rects), 37)
+        for i, rect in enumerate(rects):
+            self.assertTrue(any(inside(rect, s) for s in self.SCREENS), rect)
+            for other in rects[i + 1 :]:
+                self.assertFalse(overlaps(rect, other), (rect, other))
+
+    def test_content_keeps_aspect_ratio(self):
+        tiles = self.mixed_tiles(12)
+        for tile, rect in zip(tiles, pack_windows(tiles, self.SCREENS)):
+            content = rect.width - tile.extra_width
+            self.assertAlmostEqual(content / rect.height, tile.aspect, delta=0.01)
+
+    def test_larger_screen_gets_more_windows(self):
+        rects = pack_windows(self.mixed_tiles(20), self.SCREENS)
+        second = sum(1 for r in rects if inside(r, self.SCREENS[1]))
+        self.assertGreater(second, 10)
+
+    def test_max_per_row(self):
+        rects = pack_windows([Tile(0.45)] * 6, [Rect(0, 0, 1920, 1080)], 2)
+        self.assertEqual(len({r.y for r in rects}), 3)
+
+    def test_deterministic_and_fast(self):
+        tiles = self.mixed_tiles(100)
+        first = pack_windows(tiles, self.SCREENS)
+        start = time.perf_counter()
+        second = pack_windows(tiles, list(reversed(self.SCREENS)))
+        elapsed = time.perf_counter() - start
+        self.assertEqual(first, second)
+        self.assertLess(elapsed, 0.05)
+
+    def test_unknown_aspect_and_no_screens(self):
+        self.assertEqual(len(pack_windows([Tile(0.0)], [Rect(0, 0, 800, 600)])), 1)
+        with self.assertRaises(ValueError):
+            pack_windows([Tile(0.5)], [])
+
+
+if __name__ == "__main__":
+    unittest.main()